@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+"""
+Wrapper call demonstrated:       ai_device.a_in_list()
+
+Purpose:                         Compares reading a list of A/D channels with
+                                 one a_in_list() call against one a_in() call
+                                 per channel
+
+Demonstration:                   Reads the specified channels of the first
+                                 device found the specified number of times
+                                 with each method, and displays the average
+                                 time per snapshot of all channels
+
+Steps:
+1. Call get_daq_device_inventory() to get the list of available DAQ devices
+2. Create a DaqDevice object and call daq_device.connect()
+3. Call daq_device.get_ai_device() to get the ai_device object for the AI
+   subsystem
+4. Call ai_device.a_in() for each channel, repeatedly
+5. Call ai_device.a_in_list() for all channels, repeatedly
+6. Display the average time per snapshot for each case
+7. Call daq_device.disconnect() and daq_device.release() before exiting the
+   process
+"""
+from __future__ import print_function
+from timeit import default_timer
+
+from uldaq import (get_daq_device_inventory, DaqDevice, InterfaceType,
+                   AiInputMode, AInFlag)
+
+
+def main():
+    """Multi-channel single-point read benchmark."""
+    daq_device = None
+
+    interface_type = InterfaceType.ANY
+    channels = list(range(8))
+    number_of_snapshots = 200
+
+    try:
+        # Get descriptors for all of the available DAQ devices.
+        devices = get_daq_device_inventory(interface_type)
+        if not devices:
+            raise RuntimeError('Error: No DAQ devices found')
+
+        daq_device = DaqDevice(devices[0])
+        ai_device = daq_device.get_ai_device()
+        if ai_device is None:
+            raise RuntimeError('Error: The DAQ device does not support '
+                               'analog input')
+        daq_device.connect(connection_code=0)
+
+        ai_info = ai_device.get_info()
+        input_mode = AiInputMode.SINGLE_ENDED
+        if ai_info.get_num_chans_by_mode(input_mode) <= 0:
+            input_mode = AiInputMode.DIFFERENTIAL
+        analog_range = ai_info.get_ranges(input_mode)[0]
+        channels = channels[:ai_info.get_num_chans_by_mode(input_mode)]
+
+        print('Reading', len(channels), 'channels of',
+              devices[0].product_name, '(', devices[0].unique_id, ')',
+              number_of_snapshots, 'times\n')
+
+        def read_each():
+            return [ai_device.a_in(channel, input_mode, analog_range,
+                                   AInFlag.DEFAULT) for channel in channels]
+
+        def read_list():
+            return ai_device.a_in_list(channels, input_mode, analog_range)
+
+        for name, function in (('a_in() per channel', read_each),
+                               ('a_in_list()', read_list)):
+            # Run once so the setup is not included in the measurement.
+            function()
+            start = default_timer()
+            for _ in range(number_of_snapshots):
+                function()
+            seconds = default_timer() - start
+            print('{:24s} {:10.1f} us/snapshot'.format(
+                name, seconds / number_of_snapshots * 1e6))
+
+    except RuntimeError as error:
+        print('\n', error)
+
+    finally:
+        if daq_device:
+            if daq_device.is_connected():
+                daq_device.disconnect()
+            daq_device.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+"""
+Wrapper call demonstrated:       SegmentedScan.average_segments()
+
+Purpose:                         Averages the response to a repeated trigger
+                                 with a RETRIGGER scan, keeping only the
+                                 average in memory
+
+Demonstration:                   Acquires the specified number of samples per
+                                 channel on each trigger of a CONTINUOUS
+                                 RETRIGGER scan of the first device found,
+                                 averages the specified number of segments and
+                                 displays the first scans of the average
+
+Steps:
+1. Call get_daq_device_inventory() to get the list of available DAQ devices
+2. Create a DaqDevice object and call daq_device.connect()
+3. Call daq_device.get_ai_device() to get the ai_device object for the AI
+   subsystem
+4. Call ai_device.set_trigger() with the number of samples per trigger
+5. Call ai_device.a_in_scan() with the RETRIGGER and CONTINUOUS options
+6. Create a SegmentedScan object and call its average_segments() method
+7. Call ai_device.scan_stop() to stop the background operation
+8. Call daq_device.disconnect() and daq_device.release() before exiting the
+   process
+"""
+from __future__ import print_function
+
+from uldaq import (get_daq_device_inventory, DaqDevice, InterfaceType,
+                   AiInputMode, AInScanFlag, ScanOption, SegmentedScan,
+                   create_float_ndarray_buffer)
+
+
+def main():
+    """Analog input retrigger averaging example."""
+    daq_device = None
+    ai_device = None
+
+    interface_type = InterfaceType.ANY
+    low_channel = 0
+    high_channel = 1
+    rate = 10000
+    samples_per_trigger = 500
+    buffer_segments = 20
+    number_of_segments = 100
+    timeout = 10.0
+
+    try:
+        # Get descriptors for all of the available DAQ devices.
+        devices = get_daq_device_inventory(interface_type)
+        if not devices:
+            raise RuntimeError('Error: No DAQ devices found')
+
+        daq_device = DaqDevice(devices[0])
+        ai_device = daq_device.get_ai_device()
+        if ai_device is None:
+            raise RuntimeError('Error: The DAQ device does not support '
+                               'analog input')
+        daq_device.connect(connection_code=0)
+
+        ai_info = ai_device.get_info()
+        input_mode = AiInputMode.SINGLE_ENDED
+        if ai_info.get_num_chans_by_mode(input_mode) <= 0:
+            input_mode = AiInputMode.DIFFERENTIAL
+        analog_range = ai_info.get_ranges(input_mode)[0]
+        trigger_types = ai_info.get_trigger_types()
+        if not trigger_types:
+            raise RuntimeError('Error: The DAQ device does not support '
+                               'an external trigger')
+
+        number_of_channels = high_channel - low_channel + 1
+        data = create_float_ndarray_buffer(
+            number_of_channels, samples_per_trigger * buffer_segments)
+
+        ai_device.set_trigger(trigger_types[0], 0, 0.0, 0.0,
+                              samples_per_trigger)
+        ai_device.a_in_scan(low_channel, high_channel, input_mode,
+                            analog_range, len(data.by_channel), rate,
+                            ScanOption.CONTINUOUS | ScanOption.RETRIGGER,
+                            AInScanFlag.DEFAULT, data)
+
+        print('Averaging', number_of_segments, 'triggers of',
+              samples_per_trigger, 'samples per channel on',
+              devices[0].product_name, '(', devices[0].unique_id, ')\n')
+
+        segments = SegmentedScan(data, ai_device.get_scan_status,
+                                 samples_per_trigger, timeout=timeout)
+        average = segments.average_segments(number_of_segments)
+        ai_device.scan_stop()
+
+        print('Segments averaged:', segments.average_count)
+        for index in range(5):
+            print('{:5d}'.format(index),
+                  ' '.join('{:+10.6f}'.format(value)
+                           for value in average[index]))
+
+    except RuntimeError as error:
+        print('\n', error)
+
+    finally:
+        if daq_device:
+            if ai_device:
+                ai_device.scan_stop()
+            if daq_device.is_connected():
+                daq_device.disconnect()
+            daq_device.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+"""
+Wrapper call demonstrated:       SoftwareTrigger.captures()
+
+Purpose:                         Captures windows of a CONTINUOUS scan around
+                                 analog level crossings detected in software,
+                                 for devices whose hardware trigger only
+                                 supports digital conditions
+
+Demonstration:                   Streams the specified channels of the first
+                                 device found and displays the trigger index
+                                 and the trigger channel's values around the
+                                 trigger of each capture, then the time spent
+                                 evaluating the trigger per second of data
+
+Steps:
+1. Call get_daq_device_inventory() to get the list of available DAQ devices
+2. Create a DaqDevice object and call daq_device.connect()
+3. Call daq_device.get_ai_device() to get the ai_device object for the AI
+   subsystem
+4. Call ai_device.stream() to start a CONTINUOUS scan
+5. Create a SoftwareTrigger object and call its captures() method with the
+   stream to get each capture as soon as it is complete
+6. Close the stream to stop the scan
+7. Call daq_device.disconnect() and daq_device.release() before exiting the
+   process
+"""
+from __future__ import print_function
+from timeit import default_timer
+
+from uldaq import (get_daq_device_inventory, DaqDevice, InterfaceType,
+                   AiInputMode, SoftwareTrigger, TriggerType)
+
+
+def main():
+    """Software analog trigger example."""
+    daq_device = None
+    stream = None
+
+    interface_type = InterfaceType.ANY
+    low_channel = 0
+    high_channel = 3
+    rate = 10000
+    block_size = 1000
+    trigger_channel = 1
+    trigger_level = 0.0
+    hysteresis = 0.1
+    pre_trigger_samples = 200
+    post_trigger_samples = 800
+    number_of_captures = 5
+
+    try:
+        # Get descriptors for all of the available DAQ devices.
+        devices = get_daq_device_inventory(interface_type)
+        if not devices:
+            raise RuntimeError('Error: No DAQ devices found')
+
+        daq_device = DaqDevice(devices[0])
+        ai_device = daq_device.get_ai_device()
+        if ai_device is None:
+            raise RuntimeError('Error: The DAQ device does not support '
+                               'analog input')
+        daq_device.connect(connection_code=0)
+
+        ai_info = ai_device.get_info()
+        input_mode = AiInputMode.SINGLE_ENDED
+        if ai_info.get_num_chans_by_mode(input_mode) <= 0:
+            input_mode = AiInputMode.DIFFERENTIAL
+        analog_range = ai_info.get_ranges(input_mode)[0]
+        number_of_channels = high_channel - low_channel + 1
+
+        print('Capturing', number_of_captures, 'rising edges through',
+              trigger_level, 'V on channel', low_channel + trigger_channel,
+              'of', devices[0].product_name, '(', devices[0].unique_id,
+              ')\n')
+
+        stream = ai_device.stream(low_channel, high_channel, input_mode,
+                                  analog_range, rate, block_size)
+        trigger = SoftwareTrigger(number_of_channels, trigger_channel,
+                                  TriggerType.RISING, trigger_level,
+                                  pre_trigger_samples, post_trigger_samples,
+                                  hysteresis=hysteresis)
+
+        blocks = 0
+        processing_time = 0.0
+        captures = 0
+        for block_index, data, first_sample_index in stream:
+            start = default_timer()
+            completed = trigger.process(data, first_sample_index)
+            processing_time += default_timer() - start
+            blocks = block_index + 1
+            for capture in completed:
+                around = capture.data[pre_trigger_samples - 1:
+                                      pre_trigger_samples + 2,
+                                      trigger_channel]
+                print('Trigger {:3d} at scan {:8d}:'.format(
+                    capture.trigger_number, capture.trigger_index),
+                      ' '.join('{:+.4f}'.format(value) for value in around))
+                captures += 1
+            if captures >= number_of_captures:
+                break
+
+        seconds = blocks * block_size / stream.rate
+        print('\nTrigger evaluation: {:.3f} ms per second of data'.format(
+            processing_time / seconds * 1e3))
+
+    except RuntimeError as error:
+        print('\n', error)
+
+    finally:
+        if stream:
+            stream.close()
+        if daq_device:
+            if daq_device.is_connected():
+                daq_device.disconnect()
+            daq_device.release()
+
+
+if __name__ == '__main__':
+    main()
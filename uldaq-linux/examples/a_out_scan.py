@@ -26,13 +26,14 @@ Steps:
     process
 """
 from __future__ import print_function
-from math import pi, sin
 from time import sleep
 from sys import stdout
 from os import system
 
 from uldaq import get_daq_device_inventory, DaqDevice, create_float_buffer
 from uldaq import InterfaceType, AOutScanFlag, ScanOption, ScanStatus
+from uldaq import WaveformGenerator
+from uldaq.waveforms import sine
 
 # Constants
 CURSOR_UP = '\x1b[1A'
@@ -118,9 +119,11 @@ def main():
         amplitude = 1.0  # Volts
         # Set an offset if the range is unipolar
         offset = amplitude if voltage_range > 1000 else 0.0
-        samples_per_cycle = int(sample_rate / 10.0)  # 10 Hz sine wave
-        create_output_data(num_channels, samples_per_channel, samples_per_cycle,
-                           amplitude, offset, out_buffer)
+        frequency = 10.0  # Hz
+        generator = WaveformGenerator(
+            [sine(frequency, amplitude, offset)] * num_channels, sample_rate,
+            voltage_range, ao_info)
+        generator.fill(out_buffer)
 
         print('\n', descriptor.dev_string, 'ready')
         print('    Function demonstrated: AoDevice.a_out_scan')
@@ -182,20 +185,6 @@ def main():
             daq_device.release()
 
 
-def create_output_data(number_of_channels, samples_per_channel,
-                       samples_per_cycle, amplitude, offset, data_buffer):
-    """Populate the buffer with sine wave data for the specified number of
-       channels."""
-    cycles_per_buffer = int(samples_per_channel / samples_per_cycle)
-    i = 0
-    for _cycle in range(cycles_per_buffer):
-        for sample in range(samples_per_cycle):
-            for _chan in range(number_of_channels):
-                data_buffer[i] = amplitude * sin(2 * pi * sample
-                                                 / samples_per_cycle) + offset
-                i += 1
-
-
 def display_scan_options(bit_mask):
     """Create a displays string for all scan options."""
     options = []
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+"""
+Wrapper call demonstrated:       DaqDevice()
+
+Purpose:                         Measures the time and memory needed to create
+                                 and release DaqDevice objects
+
+Demonstration:                   Creates and releases a DaqDevice for the
+                                 first device found the specified number of
+                                 times, first without using it, then while
+                                 getting its AI subsystem, and displays the
+                                 average time and the memory used per device
+
+Steps:
+1. Call get_daq_device_inventory() to get the list of available DAQ devices
+2. Create a DaqDevice object and call daq_device.release(), repeatedly
+3. Create a DaqDevice object, call daq_device.get_ai_device() and call
+   daq_device.release(), repeatedly
+4. Display the average time per device for each case, and the memory
+   allocated for one device
+"""
+from __future__ import print_function
+from timeit import default_timer
+
+from uldaq import get_daq_device_inventory, DaqDevice, InterfaceType
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def main():
+    """DaqDevice construction benchmark."""
+    interface_type = InterfaceType.ANY
+    number_of_devices = 1000
+
+    try:
+        # Get descriptors for all of the available DAQ devices.
+        devices = get_daq_device_inventory(interface_type)
+        if not devices:
+            raise RuntimeError('Error: No DAQ devices found')
+        descriptor = devices[0]
+
+        print('Creating', number_of_devices, 'DaqDevice objects for',
+              descriptor.product_name, '(', descriptor.unique_id, ')\n')
+
+        def create(descriptor):
+            return DaqDevice(descriptor)
+
+        def create_and_get_ai_device(descriptor):
+            daq_device = DaqDevice(descriptor)
+            daq_device.get_ai_device()
+            return daq_device
+
+        for name, function in (('DaqDevice()', create),
+                               ('DaqDevice() + get_ai_device()',
+                                create_and_get_ai_device)):
+            # Run once so imports are not included in the measurement.
+            function(descriptor).release()
+            seconds = measure_time(function, descriptor, number_of_devices)
+            print('{:32s} {:10.1f} us/device'.format(
+                name, seconds / number_of_devices * 1e6), end='')
+            if tracemalloc is not None:
+                print('  {:8d} bytes/device'.format(
+                    measure_memory(function, descriptor)), end='')
+            print()
+
+    except RuntimeError as error:
+        print('\n', error)
+
+
+def measure_time(function, descriptor, count):
+    """Returns the time taken to create and release count devices."""
+    start = default_timer()
+    for _ in range(count):
+        function(descriptor).release()
+    return default_timer() - start
+
+
+def measure_memory(function, descriptor):
+    """Returns the memory allocated by Python for one device."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    daq_device = function(descriptor)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    daq_device.release()
+    return memory
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+"""
+Wrapper call demonstrated:       import uldaq
+
+Purpose:                         Checks that "import uldaq" stays within its
+                                 startup budget
+
+Demonstration:                   Imports uldaq in the specified number of new
+                                 interpreters, displays the median import time
+                                 and the modules loaded by the import, and
+                                 exits with status 1 if the median exceeds the
+                                 budget or if the import loaded libuldaq or
+                                 NumPy
+
+Steps:
+1. Start a new interpreter that times "import uldaq", repeatedly
+2. Display the median import time and the modules loaded
+3. Compare the median with the startup budget
+"""
+from __future__ import print_function
+import json
+import subprocess
+import sys
+
+# Median time of "import uldaq", in seconds
+STARTUP_BUDGET = 0.020
+
+PROBE = '''
+import json, sys
+from timeit import default_timer
+before = set(sys.modules)
+start = default_timer()
+import uldaq
+elapsed = default_timer() - start
+print(json.dumps({"elapsed": elapsed,
+                  "modules": sorted(set(sys.modules) - before)}))
+'''
+
+
+def main():
+    """Import time budget check."""
+    number_of_runs = 15
+    if len(sys.argv) > 1:
+        number_of_runs = int(sys.argv[1])
+
+    times = []
+    modules = []
+    for _ in range(number_of_runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE])
+        result = json.loads(output.decode('utf-8'))
+        times.append(result['elapsed'])
+        modules = result['modules']
+
+    times.sort()
+    median = times[len(times) // 2]
+    print('import uldaq: median {:.1f} ms, min {:.1f} ms over {:d} runs, '
+          'budget {:.1f} ms'.format(median * 1e3, times[0] * 1e3,
+                                    number_of_runs, STARTUP_BUDGET * 1e3))
+    print('Modules loaded:', ', '.join(modules))
+
+    failed = False
+    if median > STARTUP_BUDGET:
+        print('\nError: import uldaq exceeds the startup budget')
+        failed = True
+    heavy = [name for name in modules
+             if name.split('.')[0] == 'numpy'
+             or name in ('uldaq.ul_c_interface', 'uldaq.ul_sim')]
+    if heavy:
+        print('\nError: import uldaq loaded', ', '.join(heavy))
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ from __future__ import print_function
 import sys
 sys.path.append('./datastorage')
 import datastorage_class as ds
+import trace_processing as tp
 import matplotlib.pyplot as plt
 import addcopyfighandler
 import mplcursors
@@ -15,7 +16,7 @@ from os import system
 
 from sys import stdout
 from collections import namedtuple
-from uldaq import (get_daq_device_inventory, DaqDevice, AInScanFlag,
+from uldaq import (get_daq_device_inventory_cache, DaqDevice, AInScanFlag,
                    DaqEventType, ScanOption, InterfaceType, AiInputMode,
                    create_float_buffer, ULException, EventCallbackArgs, DaqInChanDescriptor)
 
@@ -31,22 +32,15 @@ def prepare_datastorage():
 
 def process_data(DsData, TraceData, TraceSettings):
     
-    for j in range(TraceSettings.channel_count):
-
-        TmpData  = create_float_buffer(1, TraceSettings.samples_per_channel)
-        TimeData = create_float_buffer(1, TraceSettings.samples_per_channel)
-
-        TraceNameTxt = "Trace{:1d}".format(j + TraceSettings.low_channel)  
-        
-        for i in range(TraceSettings.samples_per_channel):
-            TmpData[i] = TraceData[i * TraceSettings.channel_count + j]
-            TimeData[i] = i / TraceSettings.samplerate * 1000
-        
-        DsData.add_data(TraceNameTxt, TmpData)
+    #--------------------------------------------------------------------------
+    # Deinterleave the scan buffer into the traces and add the time axis [ms]
+    #--------------------------------------------------------------------------
+    trace_names = ["Trace{:1d}".format(j + TraceSettings.low_channel)
+                   for j in range(TraceSettings.channel_count)]
 
-        if (j == 0):
-            DsData.add_data("Time", TimeData)
-    
+    tp.process_scan(DsData, TraceData, TraceSettings.channel_count,
+                    TraceSettings.samplerate, trace_names, time_name="Time",
+                    samples_per_channel=TraceSettings.samples_per_channel)
     
     plot_measurement(DsData, TraceSettings)
         
@@ -76,29 +70,26 @@ def plot_measurement(DsData, TraceSettings):
 
 def select_device_by_mac(mac):
     
-    descriptor_index = -1;
-    
-    devices = get_daq_device_inventory(InterfaceType.ANY)
-    number_of_devices = len(devices)
+    # The inventory is cached, so the lookup only rediscovers the devices
+    # when the cache has expired or the device is not in it.
+    inventory = get_daq_device_inventory_cache()
+    devices = inventory.get_descriptors(InterfaceType.ANY)
     
-    if number_of_devices == 0:
+    if len(devices) == 0:
         raise RuntimeError('Error: No DAQ devices found')
 
-    print('Found', number_of_devices, 'DAQ device(s):')
+    print('Found', len(devices), 'DAQ device(s):')
     
-    for i in range(number_of_devices):
+    for i in range(len(devices)):
         print('  [', i, '] ', devices[i].product_name, ' (',
               devices[i].unique_id, ')', sep='')
-        
-        if ( mac == devices[i].unique_id):
-            print("Using device [{:d}]".format(i))
-            descriptor_index = i
 
-    if descriptor_index not in range(number_of_devices):
-        raise RuntimeError('Error: Invalid descriptor index')
+    try:
+        daq_device = DaqDevice.open_by_unique_id(mac)
+    except ULException:
+        raise RuntimeError('Error: Device {:s} not found'.format(mac))
 
-    # Create the DAQ device from the descriptor at the specified index.
-    daq_device = DaqDevice(devices[descriptor_index])
+    print("Using device {:s}".format(mac))
 
     return daq_device
 
@@ -205,6 +196,9 @@ def main():
         # Triggering on analog signal values does NOT work.
         # Trigger types as listed below work.
         # [<TriggerType.POS_EDGE: 1>, <TriggerType.NEG_EDGE: 2>, <TriggerType.HIGH: 4>, <TriggerType.LOW: 8>]
+        # For analog level triggering, run a CONTINUOUS scan with
+        # ai_device.stream() and detect the crossings with SoftwareTrigger
+        # (see examples/a_in_scan_software_trigger.py).
         #--------------------------------------------------------------------------
         
         # Does not do anything. External trigger used.
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# Benchmark of datastorage_class.add_data: appends 10^8 samples spread over 16
+# traces in event-sized chunks, as the trace scripts do, and compares with the
+# np.append based storage it replaced on a smaller recording.
+#
+# Run from the datastorage directory:  python benchmark_datastorage.py
+# =================================================================================
+import time
+
+import numpy as np
+
+import datastorage_class as ds
+
+TRACE_COUNT = 16
+CHUNK_SIZE = 10000           # samples per trace per event
+TOTAL_SAMPLES = 10 ** 8      # over all traces
+OLD_TOTAL_SAMPLES = 10 ** 7  # np.append is O(n^2), keep it short
+
+
+def append_old(name_list, in_name, in_data):
+    # The previous add_data
+    old_data = name_list[in_name]
+    name_list[in_name] = np.append(old_data, in_data)
+
+
+def run(total_samples, dtype, old=False):
+    chunk = np.random.default_rng(0).standard_normal(CHUNK_SIZE).astype(dtype)
+    events = total_samples // (TRACE_COUNT * CHUNK_SIZE)
+    names = ["Trace{:d}".format(j) for j in range(TRACE_COUNT)]
+
+    if old:
+        name_list = {name: [] for name in names}
+    else:
+        DsData = ds.datastorage_class('benchmark')
+        for name in names:
+            DsData.add_name(name, dtype=dtype)
+
+    start = time.perf_counter()
+    for i in range(events):
+        for name in names:
+            if old:
+                append_old(name_list, name, chunk)
+            else:
+                DsData.add_data(name, chunk)
+    append_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in names:
+        if old:
+            values = name_list[name]
+        else:
+            values = DsData.get_data(name)
+    get_time = time.perf_counter() - start
+
+    samples = events * TRACE_COUNT * CHUNK_SIZE
+    label = "np.append" if old else "data_column"
+    print("{:12s} {:8s} {:11,d} samples: append {:7.2f} s ({:6.1f} Msamples/s), "
+          "get_data {:5.2f} s".format(label, np.dtype(dtype).name, samples,
+                                      append_time, samples / append_time / 1e6,
+                                      get_time))
+    return
+
+
+if __name__ == '__main__':
+    run(OLD_TOTAL_SAMPLES, np.float64, old=True)
+    run(OLD_TOTAL_SAMPLES, np.float64)
+    run(TOTAL_SAMPLES, np.float32)
+    run(TOTAL_SAMPLES, np.float64)
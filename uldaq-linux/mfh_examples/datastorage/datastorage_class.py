@@ -6,61 +6,264 @@ import matplotlib
 import pickle
 import json
 
+try:
+    from . import recording_format
+    from . import decimation
+except ImportError:
+    # datastorage directory on sys.path, as in the trace scripts
+    import recording_format
+    import decimation
+
+# Traces with more samples are plotted through decimation.lod_plot
+DECIMATE_MIN_SIZE = 20000
+
+
+# =================================================================================
+# One trace of a datastorage, stored as a list of chunks so appending never
+# copies the data already stored. Each new chunk holds at least a quarter of
+# the data so far, which keeps the number of chunks logarithmic and the
+# unused space below 25%. The chunks are only joined into one array when the
+# data is requested.
+# =================================================================================
+class data_column:
+    min_chunk_size = 65536
+
+    def __init__(self, dtype=np.float64, metadata=None):
+        self.dtype = np.dtype(dtype)
+        # JSON serializable, e.g. {'unit': 'V', 'channel': 0}
+        self.metadata = metadata or {}
+        self.chunks = []
+        self.size = 0
+        # Number of samples used in the last chunk
+        self.fill = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, in_data):
+        # Accepts ndarrays, lists and ctypes arrays. Strided 1-D views,
+        # such as one channel of a scan buffer, are copied only once.
+        values = np.asarray(in_data)
+        if values.ndim != 1:
+            values = values.ravel()
+        done = 0
+
+        while done < values.size:
+            if not self.chunks or self.fill == len(self.chunks[-1]):
+                chunk_size = max(self.min_chunk_size, self.size // 4,
+                                 values.size - done)
+                self.chunks.append(np.empty(chunk_size, dtype=self.dtype))
+                self.fill = 0
+
+            chunk = self.chunks[-1]
+            count = min(values.size - done, len(chunk) - self.fill)
+            chunk[self.fill:self.fill + count] = values[done:done + count]
+            self.fill += count
+            self.size += count
+            done += count
+
+        return
+
+    def set(self, in_data):
+        # Takes over an existing array, such as an np.memmap, without
+        # copying it
+        values = np.asanyarray(in_data).ravel()
+        self.dtype = values.dtype
+        self.chunks = [values]
+        self.size = values.size
+        self.fill = values.size
+        return
+
+    def get_chunks(self):
+        # The stored data as a list of arrays, without joining them
+        if not self.chunks:
+            return [np.empty(0, dtype=self.dtype)]
+        return self.chunks[:-1] + [self.chunks[-1][:self.fill]]
+
+    def get(self):
+        # Returns the data as one array; later appends do not change it
+        if not self.chunks:
+            return np.empty(0, dtype=self.dtype)
+
+        if len(self.chunks) > 1:
+            last = self.chunks[-1][:self.fill]
+            self.chunks = [np.concatenate(self.chunks[:-1] + [last])]
+            self.fill = self.size
+
+        return self.chunks[0][:self.size]
+
+
+# =================================================================================
+# An axis of equally spaced values, such as the time of the samples of a
+# scan, stored as start + index * step. The values are only computed when
+# they are requested.
+# =================================================================================
+class linear_axis:
+
+    def __init__(self, start=0.0, step=1.0, length=0, metadata=None):
+        self.start = start
+        self.step = step
+        self.size = length
+        self.dtype = np.dtype(np.float64)
+        self.metadata = metadata or {}
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, count):
+        self.size += count
+        return
+
+    def get(self, first=0, count=None):
+        # Computes the values of samples first to first + count - 1
+        if count is None:
+            count = self.size - first
+        return self.start + np.arange(first, first + count) * self.step
+
+    def get_value(self, index):
+        return self.start + index * self.step
+
+    def get_index(self, value):
+        # Index of the sample nearest to value
+        return int(round((value - self.start) / self.step))
+
 
 class datastorage_class:
-    name_list = {}
-    title = []
 
     def __init__(self, name):
         self.name = name
+        self.title = ''
+        # JSON serializable settings saved with the data, e.g. the samplerate
+        self.metadata = {}
+        # Per-instance dict of trace name -> data_column
+        self.name_list = {}
+        # Trace name -> decimation pyramid, rebuilt when the trace changes
+        self.pyramids = {}
+        self.lod_plots = []
         return
 
     def add_title(self, in_title):
         self.title = in_title
 
-    def add_name(self, in_name, debug=0):
-        # self.name_list.append(in_name)
-        self.name_list[in_name] = []
+    def add_name(self, in_name, debug=0, dtype=np.float64, metadata=None):
+        # dtype: type of the stored values, e.g. np.float32 to halve the
+        # memory of voltage traces, or np.int64 for counters
+        self.name_list[in_name] = data_column(dtype, metadata)
 
         return
 
     def add_data(self, in_name, in_data, debug = 0):
-        old_data = self.name_list[in_name]
-        new_data = np.append(old_data, in_data)
-        self.name_list[in_name] = new_data
+        # Amortized O(1) per sample; in_data is copied, so the caller can
+        # reuse its buffer
+        self.name_list[in_name].append(in_data)
 
         return
 
-    def add_array(self, in_name, in_data, debug = 0):
-        self.name_list[in_name] = in_data
+    def add_array(self, in_name, in_data, debug = 0, metadata=None):
+        if not isinstance(self.name_list.get(in_name), data_column):
+            self.name_list[in_name] = data_column()
+        self.name_list[in_name].set(in_data)
+        if metadata is not None:
+            self.name_list[in_name].metadata = metadata
+
+        return
+
+    def add_axis(self, in_name, start, step, length=0, metadata=None):
+        # Linear axis, e.g. time: add_axis("Time", 0, 1000 / samplerate)
+        self.name_list[in_name] = linear_axis(start, step, length, metadata)
 
         return
-    
-    def get_data(self, in_name):
-        return self.name_list[in_name]
 
-    def plot_data_no_x(self, ax, in_name, color=1, points_only=False, label='', title='', marker='', linewidth=1):
-        values = self.name_list[in_name]
-        fake_x = np.arange(0, values.size)
+    def extend_axis(self, in_name, count):
+        self.name_list[in_name].extend(count)
 
-        if (points_only):
-            self.plot_points(ax, fake_x, values, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+        return
+
+    def is_axis(self, in_name):
+        return isinstance(self.name_list.get(in_name), linear_axis)
+
+    def get_data(self, in_name):
+        return self.name_list[in_name].get()
+
+    def get_names(self):
+        return list(self.name_list.keys())
+
+    def get_size(self, in_name):
+        return len(self.name_list[in_name])
+
+    def get_pyramid(self, in_name):
+        column = self.name_list[in_name]
+        values = column.get()
+        # get() leaves a data_column with a single chunk; the pyramid is
+        # valid as long as the trace still has the same chunk and size
+        key = (column, len(column), column.chunks[0] if getattr(column, 'chunks', None) else None)
+        cached = self.pyramids.get(in_name)
+        if cached is None or cached[0] is not key[0] or cached[1] != key[1] or cached[2] is not key[2]:
+            cached = key + (decimation.decimation_pyramid(values),)
+            self.pyramids[in_name] = cached
+        return cached[3]
+
+    def plot_lod(self, ax, in_name_x, in_name_y, color=1, points_only=False, label='', marker='', linewidth=1, x_offset=0, method='minmax'):
+        # Plots a decimated trace that follows zoom and pan; in_name_x may be
+        # None to plot against the sample index
+        colors = dict(mcolors.CSS4_COLORS, **mcolors.CSS4_COLORS)
+        dict_val = list(colors.values())[color]
+
+        x = None
+        if in_name_x is not None:
+            x = self.name_list[in_name_x]
+            if not isinstance(x, linear_axis):
+                x = x.get()
+        lod = decimation.lod_plot(ax, x, self.get_data(in_name_y), self.get_pyramid(in_name_y),
+                                  method=method, points_only=points_only, x_offset=x_offset,
+                                  label=label, color=dict_val, marker=marker, linewidth=linewidth)
+        self.lod_plots.append(lod)
+        return lod
+
+    def can_decimate(self, in_name_x, in_name_y):
+        # Only worth it for long traces, and only for x increasing with the
+        # sample index
+        if self.get_size(in_name_y) <= DECIMATE_MIN_SIZE:
+            return False
+        if in_name_x is None or self.is_axis(in_name_x):
+            return True
+        values_x = self.get_data(in_name_x)
+        return len(values_x) == self.get_size(in_name_y) and bool(np.all(values_x[1:] >= values_x[:-1]))
+
+    def plot_data_no_x(self, ax, in_name, color=1, points_only=False, label='', title='', marker='', linewidth=1, decimate=True, method='minmax'):
+        if decimate and self.can_decimate(None, in_name):
+            self.plot_lod(ax, None, in_name, color=color, points_only=points_only, label=label,
+                          marker=marker if marker or not points_only else '.', linewidth=linewidth, method=method)
         else:
-            self.plot_results(ax, fake_x, values, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+            values = self.get_data(in_name)
+            fake_x = np.arange(0, values.size)
+
+            if (points_only):
+                self.plot_points(ax, fake_x, values, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+            else:
+                self.plot_results(ax, fake_x, values, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
         
         ax.legend()
         ax.set(title=title)
         ax.grid(True)
         return
 
-    def plot_data(self, ax, in_name_x, in_name_y, color=1, points_only=False, label='', title='', marker='', linewidth=1, x_offset=0):
-        values_x = self.name_list[in_name_x] + x_offset
-        values_y = self.name_list[in_name_y]
-
-        if (points_only):
-            self.plot_points(ax, values_x, values_y, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+    def plot_data(self, ax, in_name_x, in_name_y, color=1, points_only=False, label='', title='', marker='', linewidth=1, x_offset=0, decimate=True, method='minmax'):
+        # decimate: long traces are drawn at the pixel resolution of the axes
+        # and redrawn from the full data on zoom and pan; method 'minmax'
+        # keeps every spike, 'lttb' gives fewer, smoother points
+        if decimate and self.can_decimate(in_name_x, in_name_y):
+            self.plot_lod(ax, in_name_x, in_name_y, color=color, points_only=points_only, label=label,
+                          marker=marker if marker or not points_only else '.', linewidth=linewidth,
+                          x_offset=x_offset, method=method)
         else:
-            self.plot_results(ax, values_x, values_y, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+            values_x = self.get_data(in_name_x) + x_offset
+            values_y = self.get_data(in_name_y)
+
+            if (points_only):
+                self.plot_points(ax, values_x, values_y, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
+            else:
+                self.plot_results(ax, values_x, values_y, color=color, label=label, title=title, marker=marker, linewidth=linewidth)
 
         ax.legend()
         ax.set(title=title)
@@ -85,26 +288,79 @@ class datastorage_class:
         return
 
     def save_data(self, filename):
+        # Native format, see recording_format.py. The chunks of each trace
+        # are written one after the other, without joining them in memory.
+        # Linear axes are saved as their start, step and length only.
+        traces = {}
+        trace_metadata = {}
+        for k, v in self.name_list.items():
+            if isinstance(v, linear_axis):
+                traces[k] = []
+                trace_metadata[k] = dict(v.metadata, linear_axis={
+                    'start': v.start, 'step': v.step, 'length': v.size})
+            else:
+                traces[k] = v.get_chunks()
+                trace_metadata[k] = v.metadata
+        recording_format.write_recording(filename, traces, title=self.title,
+                                         metadata=self.metadata,
+                                         trace_metadata=trace_metadata)
+
+        return
+
+    def save_data_pickle(self, filename):
+        # Previous format: a dict of trace name -> ndarray, then the title
+        tmp_dict = {k: v.get() for k, v in self.name_list.items()}
+
         with open(filename, 'wb') as filehandle:
             # store the data as binary data stream
-            pickle.dump(self.name_list, filehandle)
+            pickle.dump(tmp_dict, filehandle)
             pickle.dump(self.title, filehandle)
 
         return
 
     def load_data(self, filename):
+        # Native recordings are opened as read-only np.memmap traces, so
+        # only the parts that are used are read from disk. Adding data to a
+        # loaded trace copies it into memory. Pickle files from the previous
+        # save_data are still read; convert_pickle turns them into
+        # recordings.
+        if not recording_format.is_recording(filename):
+            self.load_data_pickle(filename)
+            return
+
+        header, traces = recording_format.open_recording(filename)
+        for k, v in traces.items():
+            metadata = dict(header['traces'].get(k, {}))
+            axis = metadata.pop('linear_axis', None)
+            if axis is not None:
+                self.add_axis(k, axis['start'], axis['step'], axis['length'],
+                              metadata=metadata)
+            else:
+                self.add_array(k, v, metadata=metadata)
+        self.title = header['title']
+        self.metadata = header['metadata']
+
+        return
+
+    def load_data_pickle(self, filename):
         with open(filename, 'rb') as filehandle:
             # store the data as binary data stream
             tmp_dict = pickle.load(filehandle)
             tmp_title = pickle.load(filehandle)
 
             for k,v in tmp_dict.items():
-                self.add_name(k)
-                self.add_data(k, v, 0)
+                self.add_array(k, np.asarray(v))
 
 
             self.title = tmp_title
 
+        return
+
+    def convert_pickle(self, pickle_filename, filename):
+        recording_format.convert_pickle(pickle_filename, filename)
+
+        return
+
 
 
 
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# Level of detail for plotting long traces
+#
+# A trace of millions of samples is drawn on a few thousand pixels. Each
+# pixel column only needs the first, last, minimum and maximum sample that
+# falls in it (M4 decimation): the line drawn through those samples covers
+# exactly the same pixels as the line through all samples, so spikes are
+# never lost. The buckets are therefore the samples of each pixel column of
+# the current x limits. The minimum and maximum of blocks of 16, 64, 256,
+# ... samples are precomputed once per trace (the pyramid); a zoom or pan
+# combines the largest blocks that fit in each column and only reads the
+# samples of the last few partial blocks at its edges.
+#
+# LTTB (Largest Triangle Three Buckets) gives a smoother selection of one
+# point per bucket, for point plots. It runs on the M4 selection of the
+# visible range (MinMaxLTTB), so it never has to read all samples.
+# =================================================================================
+import numpy as np
+
+BASE_BLOCK = 16
+FACTOR = 4
+
+
+def _block_extrema(y, start, stop, size):
+    # Sample indices of the minimum and maximum of each block of size
+    # samples in y[start:stop]; the last block may be shorter
+    count = stop - start
+    full = count // size
+    body = np.asarray(y[start:start + full * size]).reshape(full, size)
+    mn = np.argmin(body, axis=1) + np.arange(start, start + full * size, size)
+    mx = np.argmax(body, axis=1) + np.arange(start, start + full * size, size)
+
+    if full * size < count:
+        tail = np.asarray(y[start + full * size:stop])
+        mn = np.append(mn, start + full * size + np.argmin(tail))
+        mx = np.append(mx, start + full * size + np.argmax(tail))
+
+    return mn, mx
+
+
+def _group_extrema(y, mn, mx, group):
+    # Combines groups of group consecutive blocks; the last group may hold
+    # fewer blocks
+    padding = -len(mn) % group
+    mn_val = np.append(np.asarray(y[mn], dtype=np.float64),
+                       np.full(padding, np.inf)).reshape(-1, group)
+    mx_val = np.append(np.asarray(y[mx], dtype=np.float64),
+                       np.full(padding, -np.inf)).reshape(-1, group)
+    mn = np.append(mn, np.zeros(padding, dtype=mn.dtype)).reshape(-1, group)
+    mx = np.append(mx, np.zeros(padding, dtype=mx.dtype)).reshape(-1, group)
+
+    rows = np.arange(len(mn))
+    return (mn[rows, np.argmin(mn_val, axis=1)],
+            mx[rows, np.argmax(mx_val, axis=1)])
+
+
+def _row_min(values, valid, indices):
+    # The entry of indices at the minimum of the valid values of each row
+    values = np.where(valid, np.asarray(values, dtype=np.float64), np.inf)
+    return indices[np.arange(len(indices)), np.argmin(values, axis=1)]
+
+
+def _row_max(values, valid, indices):
+    values = np.where(valid, np.asarray(values, dtype=np.float64), -np.inf)
+    return indices[np.arange(len(indices)), np.argmax(values, axis=1)]
+
+
+def _ranges(starts, ends):
+    # One row of indices starts[k] to ends[k] - 1 per range, padded with
+    # starts[k], and the mask of the indices that are in the range
+    indices = starts[:, np.newaxis] + np.arange((ends - starts).max())
+    valid = indices < ends[:, np.newaxis]
+    return np.where(valid, indices, starts[:, np.newaxis]), valid
+
+
+def _segment_extrema(y, starts, ends):
+    # Indices of the minimum and maximum sample of each segment
+    # y[starts[k]:ends[k]]; for short segments
+    indices, valid = _ranges(starts, ends)
+    values = y[indices]
+    return _row_min(values, valid, indices), _row_max(values, valid, indices)
+
+
+def _bucket_extrema(y, first, starts, ends):
+    # Indices of the minimum and maximum sample of each bucket
+    # y[starts[k]:ends[k]]; the buckets are not empty and follow each other
+    # from first, so all samples are read once
+    values = np.asarray(y[first:ends[-1]], dtype=np.float64)
+    offsets = starts - first
+    lengths = ends - starts
+    out = []
+    for reduce in (np.fmin, np.fmax):
+        extreme = reduce.reduceat(values, offsets)
+        hits = np.flatnonzero(values == np.repeat(extreme, lengths))
+        bucket = np.searchsorted(offsets, hits, side='right') - 1
+        keep = np.append(True, bucket[1:] != bucket[:-1])
+        # Buckets of NaN only keep their first sample
+        index = offsets.copy()
+        index[bucket[keep]] = hits[keep]
+        out.append(first + index)
+    return out
+
+
+def m4_indices(y, edges):
+    # Sorted indices of the first, last, minimum and maximum sample of each
+    # bucket y[edges[k]:edges[k + 1]], read from the samples; edges are the
+    # first sample of each pixel column and the end of the last one. For
+    # data that changes all the time, such as a live view.
+    edges = np.asarray(edges, dtype=np.int64)
+    first, last = int(edges[0]), int(edges[-1])
+    if last - first <= 4 * (len(edges) - 1):
+        return np.arange(first, last)
+
+    used = edges[1:] > edges[:-1]
+    starts, ends = edges[:-1][used], edges[1:][used]
+    mn, mx = _bucket_extrema(y, first, starts, ends)
+    return np.unique(np.concatenate((starts, mn, mx, ends - 1)))
+
+
+def pixel_edges(x_min, x_max, width, x_to_index, first, last):
+    # Bucket edges for samples first to last - 1 on width pixel columns
+    # between x_min and x_max: the first sample of each column and the end
+    # of the last one. x_to_index gives the index of the first sample at or
+    # after each x. The samples before and after the x limits, which only
+    # draw the line to the border, are buckets of their own.
+    bounds = x_min + (x_max - x_min) * np.arange(width + 1) / width
+    inner = np.clip(x_to_index(bounds), first, last).astype(np.int64)
+    return np.concatenate(([first], inner, [last]))
+
+
+# =================================================================================
+class decimation_pyramid:
+
+    def __init__(self, y, base_block=BASE_BLOCK, factor=FACTOR):
+        self.y = y
+        self.size = len(y)
+        self.levels = []
+
+        # Level k holds the indices of the minimum and maximum of each block
+        # of base_block * factor^k samples
+        block = base_block
+        if self.size > block:
+            mn, mx = _block_extrema(y, 0, self.size, block)
+            self.levels.append((block, mn, mx))
+            while len(mn) > factor:
+                mn, mx = _group_extrema(y, mn, mx, factor)
+                block *= factor
+                self.levels.append((block, mn, mx))
+
+    def query(self, edges):
+        # Sorted sample indices to draw the pixel columns y[edges[k]:edges[k
+        # + 1]], see pixel_edges; the same as m4_indices, without reading
+        # all samples
+        edges = np.clip(np.asarray(edges, dtype=np.int64), 0, self.size)
+        first, last = int(edges[0]), int(edges[-1])
+        if last - first <= 4 * (len(edges) - 1) or not self.levels:
+            return m4_indices(self.y, edges)
+
+        used = edges[1:] > edges[:-1]
+        starts, ends = edges[:-1][used], edges[1:][used]
+
+        # Each column is split from the top level down: the blocks of a
+        # level that lie inside a piece of the column are read from the
+        # pyramid, the rest of the piece is passed to the next level, and
+        # what is left below the smallest block is read from the samples.
+        # A column is at most two pieces, and a piece holds only a few
+        # blocks of each level.
+        lo, hi = starts, ends
+        column = np.arange(len(starts))
+        found = []
+        for block, mn, mx in reversed(self.levels):
+            j0 = -(-lo // block)
+            j1 = hi // block
+            inner = j0 < j1
+            if not inner.any():
+                continue
+
+            blocks, valid = _ranges(j0[inner], j1[inner])
+            found.append((column[inner],
+                          _row_min(self.y[mn[blocks]], valid, mn[blocks]),
+                          _row_max(self.y[mx[blocks]], valid, mx[blocks])))
+
+            head = inner & (lo < j0 * block)
+            tail = inner & (j1 * block < hi)
+            lo, hi, column = (np.concatenate((lo[~inner], lo[head], (j1 * block)[tail])),
+                              np.concatenate((hi[~inner], (j0 * block)[head], hi[tail])),
+                              np.concatenate((column[~inner], column[head], column[tail])))
+        if len(lo):
+            found.append((column,) + _segment_extrema(self.y, lo, hi))
+
+        # The minimum and maximum of the pieces of each column
+        column = np.concatenate([entry[0] for entry in found])
+        out = [starts, ends - 1]
+        for k, sign in ((1, 1), (2, -1)):
+            index = np.concatenate([entry[k] for entry in found])
+            values = sign * np.asarray(self.y[index], dtype=np.float64)
+            order = np.lexsort((values, column))
+            keep = np.append(True, column[order][1:] != column[order][:-1])
+            out.append(index[order][keep])
+        return np.unique(np.concatenate(out))
+
+
+def lttb_indices(x, y, out_count):
+    # Indices of out_count points of (x, y) selected with LTTB; the first and
+    # last point are always kept
+    count = len(y)
+    if out_count >= count or out_count < 3:
+        return np.arange(count)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, count - 1, out_count - 1).astype(np.int64)
+    out = np.empty(out_count, dtype=np.int64)
+    out[0] = 0
+    out[-1] = count - 1
+
+    a = 0
+    for i in range(out_count - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else count
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area)) if hi > lo else lo
+        out[i + 1] = a
+
+    return out
+
+
+# =================================================================================
+# A line or point plot of a trace that is decimated to the pixel width of the
+# axes, and decimated again from the full data whenever the x limits change
+# (zoom, pan). x is a linear_axis, a monotonic increasing array or None for
+# the sample index.
+# =================================================================================
+class lod_plot:
+
+    def __init__(self, ax, x, y, pyramid, method='minmax', points_only=False,
+                 x_offset=0, **kwargs):
+        self.ax = ax
+        self.x = x
+        self.y = y
+        self.pyramid = pyramid
+        self.method = method
+        self.points_only = points_only
+        self.x_offset = x_offset
+
+        # Until the axes are drawn, the x limits of the data
+        xv, yv = self.decimate(0, len(y), *self.x_values(np.array([0, len(y) - 1])))
+        if points_only:
+            self.artist = ax.scatter(xv, yv, **kwargs)
+        else:
+            self.artist = ax.plot(xv, yv, **kwargs)[0]
+
+        # The axes only keep a weak reference to the callback; the
+        # datastorage keeps the lod_plot
+        self.callback = ax.callbacks.connect('xlim_changed', self.on_xlim)
+
+    def x_values(self, indices):
+        if self.x is None:
+            return indices + self.x_offset
+        if hasattr(self.x, 'get_value'):
+            return self.x.get_value(indices) + self.x_offset
+        return np.asarray(self.x[indices]) + self.x_offset
+
+    def x_to_index(self, x):
+        # Index of the first sample at or after each x
+        x = x - self.x_offset
+        if self.x is None:
+            return np.ceil(x)
+        if hasattr(self.x, 'get_value'):
+            # Corrected by one where start + index * step rounds the other
+            # way than the division
+            index = np.ceil((x - self.x.start) / self.x.step)
+            index += self.x.get_value(index) < x
+            index -= self.x.get_value(index - 1) >= x
+            return index
+        return np.searchsorted(self.x, x, side='left')
+
+    def visible_range(self, x_min, x_max):
+        x_min -= self.x_offset
+        x_max -= self.x_offset
+        if self.x is None:
+            first, last = int(np.floor(x_min)), int(np.ceil(x_max)) + 1
+        elif hasattr(self.x, 'get_value'):
+            first = int(np.floor((x_min - self.x.start) / self.x.step))
+            last = int(np.ceil((x_max - self.x.start) / self.x.step)) + 1
+        else:
+            first = int(np.searchsorted(self.x, x_min, side='right')) - 1
+            last = int(np.searchsorted(self.x, x_max, side='left')) + 1
+        # One sample beyond each edge, so the line reaches the border
+        return max(first - 1, 0), min(last + 1, len(self.y))
+
+    def decimate(self, first, last, x_min, x_max):
+        # One bucket per pixel column of the x limits
+        width = max(int(self.ax.bbox.width), 100)
+        edges = pixel_edges(x_min, x_max, width, self.x_to_index, first, last)
+        indices = self.pyramid.query(edges)
+        xv = self.x_values(indices)
+        yv = np.asarray(self.y[indices])
+
+        if self.method == 'lttb' and len(indices) > width:
+            keep = lttb_indices(xv, yv, width)
+            xv, yv = xv[keep], yv[keep]
+
+        return xv, yv
+
+    def on_xlim(self, ax):
+        x_min, x_max = sorted(ax.get_xlim())
+        first, last = self.visible_range(x_min, x_max)
+        if last <= first:
+            return
+        xv, yv = self.decimate(first, last, x_min, x_max)
+
+        if self.points_only:
+            self.artist.set_offsets(np.column_stack((xv, yv)))
+        else:
+            self.artist.set_data(xv, yv)
+        return
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self.callback)
+        self.artist.remove()
+        return
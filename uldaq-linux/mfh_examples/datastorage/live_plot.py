@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# Live view of a running scan
+#
+# The device keeps writing to the scan buffer while the view runs in the main
+# thread. Each frame copies the latest window of scans out of the buffer
+# (a snapshot, without locks: the scan count is read again after the copy
+# and the frame is skipped if the device may have overwritten part of the
+# window meanwhile), decimates every channel to the pixel width of the axes
+# and redraws only the lines on top of a cached background (blitting).
+# Frames are capped at fps; a frame slot missed because drawing took too
+# long counts as a dropped frame.
+#
+#   live = live_plot(TraceData, ai_device.get_scan_status, channel_count,
+#                    rate, window=rate * 2)
+#   live.run(stop=lambda: scan_status['complete'])
+#   print(live.get_stats())
+# =================================================================================
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+try:
+    from . import decimation
+except ImportError:
+    # datastorage directory on sys.path, as in the trace scripts
+    import decimation
+
+
+class live_plot:
+
+    def __init__(self, data, get_scan_status, channel_count, rate, window,
+                 channel_names=None, ylim=None, fps=25, time_scale=1000.0,
+                 fig=None, ax=None):
+        # data: the scan buffer (ScanBuffer, ctypes array or ndarray)
+        # get_scan_status: e.g. ai_device.get_scan_status
+        # window: number of scans shown, at most half of the buffer
+        # time_scale: 1000 for a time axis in ms
+        if hasattr(data, 'array'):
+            data = data.array
+        values = np.asarray(data).reshape(-1)
+        self.scans = values[:values.size // channel_count * channel_count] \
+            .reshape(-1, channel_count)
+        self.capacity = len(self.scans)
+        if window > self.capacity // 2:
+            raise ValueError('window must be at most half of the buffer '
+                             '({:d} scans)'.format(self.capacity // 2))
+
+        self.get_scan_status = get_scan_status
+        self.channel_count = channel_count
+        self.rate = rate
+        self.window = int(window)
+        self.time_scale = time_scale
+        self.period = 1.0 / fps
+        self.autoscale = ylim is None
+        self.scaled = False
+
+        if ax is None:
+            fig, ax = plt.subplots(1, 1)
+        self.fig = fig or ax.figure
+        self.ax = ax
+        self.canvas = self.fig.canvas
+
+        if channel_names is None:
+            channel_names = ["Channel {:d}".format(j)
+                             for j in range(channel_count)]
+        self.lines = [ax.plot([], [], label=name, animated=True)[0]
+                      for name in channel_names]
+        ax.set_xlim(-self.window / rate * time_scale, 0)
+        if ylim is not None:
+            ax.set_ylim(ylim)
+        ax.grid(True)
+        ax.legend(loc='upper left')
+
+        self.background = None
+        self.draw_callback = self.canvas.mpl_connect('draw_event',
+                                                     self.on_draw)
+
+        self.frames = 0
+        self.dropped_frames = 0
+        self.torn_snapshots = 0
+        self.full_redraws = 0
+        self.last_frame_time = 0.0
+        self.max_frame_time = 0.0
+        self.total_frame_time = 0.0
+        self.started = None
+        return
+
+    # =================================================================================
+    def on_draw(self, event):
+        # A full redraw (start, resize, new y limits): cache the background
+        # without the lines, then draw the lines on top
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        return
+
+    def snapshot(self):
+        # Copy of the latest window of scans, or None if there is no data
+        # yet or the device overwrote part of it during the copy
+        total = (self.get_scan_status()[1].current_total_count
+                 // self.channel_count)
+        count = min(self.window, total)
+        if count < 2:
+            return None
+
+        end = total % self.capacity
+        if end >= count:
+            window = self.scans[end - count:end].copy()
+        else:
+            window = np.concatenate((self.scans[end - count:],
+                                     self.scans[:end]))
+
+        # The oldest scan copied is overwritten once the device has
+        # acquired capacity scans after it
+        total_after = (self.get_scan_status()[1].current_total_count
+                       // self.channel_count)
+        if total_after - (total - count) > self.capacity:
+            self.torn_snapshots += 1
+            return None
+
+        return window
+
+    def frame(self):
+        start = time.perf_counter()
+        window = self.snapshot()
+        if window is None:
+            return False
+
+        count = len(window)
+        width = max(int(self.ax.bbox.width), 100)
+        # The newest scan is at x = 0
+        x_min, x_max = self.ax.get_xlim()
+        edges = decimation.pixel_edges(
+            x_min, x_max, width,
+            lambda x: np.ceil(x / self.time_scale * self.rate) + count - 1,
+            0, count)
+        for j, line in enumerate(self.lines):
+            y = np.ascontiguousarray(window[:, j])
+            indices = decimation.m4_indices(y, edges)
+            x = (indices - count + 1) / self.rate * self.time_scale
+            line.set_data(x, y[indices])
+
+        if self.autoscale and self.rescale(window):
+            # New limits: the background has to be redrawn
+            self.full_redraws += 1
+            self.canvas.draw()
+        elif self.background is None or not getattr(self.canvas, 'supports_blit', True):
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            for line in self.lines:
+                self.ax.draw_artist(line)
+            self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+
+        frame_time = time.perf_counter() - start
+        self.frames += 1
+        self.last_frame_time = frame_time
+        self.max_frame_time = max(self.max_frame_time, frame_time)
+        self.total_frame_time += frame_time
+        return True
+
+    def rescale(self, window):
+        # Sets the y limits from the first window, then widens them when the
+        # data leaves them, with a 10% margin
+        low, high = np.nanmin(window), np.nanmax(window)
+        if not np.isfinite(low) or not np.isfinite(high):
+            return False
+
+        margin = (high - low) * 0.1 or 1.0
+        if self.scaled:
+            y_min, y_max = self.ax.get_ylim()
+            if y_min <= low and high <= y_max:
+                return False
+            self.ax.set_ylim(min(y_min, low - margin), max(y_max, high + margin))
+        else:
+            self.ax.set_ylim(low - margin, high + margin)
+            self.scaled = True
+        return True
+
+    def run(self, stop=None, duration=None):
+        # Draws frames until the figure is closed, stop() returns True or
+        # duration seconds have passed
+        plt.show(block=False)
+        self.canvas.draw()
+        self.started = time.perf_counter()
+        next_frame = self.started
+
+        while plt.fignum_exists(self.fig.number):
+            if stop is not None and stop():
+                break
+            now = time.perf_counter()
+            if duration is not None and now - self.started >= duration:
+                break
+
+            self.frame()
+
+            next_frame += self.period
+            now = time.perf_counter()
+            if now > next_frame:
+                # Drawing took longer than a frame period
+                missed = int((now - next_frame) / self.period) + 1
+                self.dropped_frames += missed
+                next_frame += missed * self.period
+            # Handles GUI events (zoom, close) while waiting
+            self.canvas.start_event_loop(max(next_frame - time.perf_counter(), 0.001))
+
+        return self.get_stats()
+
+    def get_stats(self):
+        elapsed = (time.perf_counter() - self.started) if self.started else 0.0
+        return {'frames': self.frames,
+                'dropped_frames': self.dropped_frames,
+                'torn_snapshots': self.torn_snapshots,
+                'full_redraws': self.full_redraws,
+                'last_frame_time': self.last_frame_time,
+                'mean_frame_time': self.total_frame_time / self.frames if self.frames else 0.0,
+                'max_frame_time': self.max_frame_time,
+                'fps': self.frames / elapsed if elapsed else 0.0}
+
+    def close(self):
+        self.canvas.mpl_disconnect(self.draw_callback)
+        return
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# Native file format for datastorage recordings
+#
+#   header   magic (8 bytes), header length (uint64, little endian) and a JSON
+#            header with the format version, the title, the storage
+#            metadata (rates, ...) and the metadata of each trace
+#   data     the samples of each trace, one contiguous block per trace,
+#            each block starting on a 64 byte boundary
+#   footer   a JSON index with the name, dtype, offset and length of each
+#            trace, followed by the footer offset (uint64) and the end magic
+#
+# The index is written last, so the data can be written chunk by chunk
+# without knowing the trace lengths in advance. Traces are opened as
+# read-only np.memmap arrays: reading one channel over one time window only
+# reads those bytes from disk.
+#
+# A recording is written to a temporary file that replaces the old file when
+# it is complete, so saving data loaded from a file back to the same file
+# never overwrites the samples still being read.
+# =================================================================================
+import json
+import os
+import pickle
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b'DSREC\x00\x01\x00'
+END_MAGIC = b'DSIDX\x00\x01\x00'
+VERSION = 1
+ALIGNMENT = 64
+
+_LENGTH = struct.Struct('<Q')
+
+
+def is_recording(filename):
+    with open(filename, 'rb') as filehandle:
+        return filehandle.read(len(MAGIC)) == MAGIC
+
+
+def _pad(filehandle):
+    padding = -filehandle.tell() % ALIGNMENT
+    filehandle.write(b'\x00' * padding)
+    return
+
+
+def _json_default(value):
+    # NumPy scalars and arrays in the metadata, e.g. a rate read from a scan
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def write_recording(filename, traces, title='', metadata=None,
+                    trace_metadata=None):
+    # traces: dict of trace name -> list of 1-D ndarray chunks, written
+    # back to back as one contiguous block per trace. The metadata may hold
+    # JSON types and NumPy scalars and arrays.
+    trace_metadata = trace_metadata or {}
+    header = {'version': VERSION,
+              'title': title,
+              'metadata': metadata or {},
+              'traces': {name: trace_metadata.get(name, {})
+                         for name in traces}}
+    header_bytes = json.dumps(header, default=_json_default).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    filehandle = tempfile.NamedTemporaryFile(
+        'wb', dir=directory, prefix=os.path.basename(filename) + '.',
+        suffix='.tmp', delete=False)
+    try:
+        with filehandle:
+            _write_data(filehandle, header_bytes, traces)
+        # Temporary files are only readable by the owner; use the
+        # permissions open() would give the file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(filehandle.name, 0o666 & ~umask)
+        os.replace(filehandle.name, filename)
+    except BaseException:
+        os.remove(filehandle.name)
+        raise
+
+    return
+
+
+def _write_data(filehandle, header_bytes, traces):
+    index = []
+    filehandle.write(MAGIC)
+    filehandle.write(_LENGTH.pack(len(header_bytes)))
+    filehandle.write(header_bytes)
+
+    for name, chunks in traces.items():
+        _pad(filehandle)
+        offset = filehandle.tell()
+        length = 0
+        dtype = None
+        for chunk in chunks:
+            chunk = np.ascontiguousarray(chunk)
+            if dtype is None:
+                dtype = chunk.dtype
+            chunk.astype(dtype, copy=False).tofile(filehandle)
+            length += chunk.size
+        if dtype is None:
+            dtype = np.dtype(np.float64)
+        index.append({'name': name, 'dtype': dtype.str,
+                      'offset': offset, 'length': length})
+
+    footer_offset = filehandle.tell()
+    filehandle.write(json.dumps(index).encode('utf-8'))
+    filehandle.write(_LENGTH.pack(footer_offset))
+    filehandle.write(END_MAGIC)
+
+    return
+
+
+def read_header(filename):
+    with open(filename, 'rb') as filehandle:
+        if filehandle.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{:s} is not a datastorage recording'.format(
+                filename))
+        header_length = _LENGTH.unpack(filehandle.read(_LENGTH.size))[0]
+        header = json.loads(filehandle.read(header_length).decode('utf-8'))
+
+        tail = len(END_MAGIC) + _LENGTH.size
+        filehandle.seek(-tail, 2)
+        footer_end = filehandle.tell()
+        footer_offset = _LENGTH.unpack(filehandle.read(_LENGTH.size))[0]
+        if filehandle.read(len(END_MAGIC)) != END_MAGIC:
+            raise ValueError('{:s} has no index, the recording was not '
+                             'closed'.format(filename))
+        filehandle.seek(footer_offset)
+        index = json.loads(filehandle.read(footer_end - footer_offset)
+                           .decode('utf-8'))
+
+    return header, index
+
+
+def open_recording(filename):
+    # Returns the header and a dict of trace name -> read-only np.memmap
+    header, index = read_header(filename)
+
+    traces = {}
+    for entry in index:
+        if entry['length'] == 0:
+            traces[entry['name']] = np.empty(0, dtype=entry['dtype'])
+            continue
+        traces[entry['name']] = np.memmap(filename, dtype=entry['dtype'],
+                                          mode='r', offset=entry['offset'],
+                                          shape=(entry['length'],))
+
+    return header, traces
+
+
+def convert_pickle(pickle_filename, filename, metadata=None):
+    # Converts a file written by the pickle based save_data
+    with open(pickle_filename, 'rb') as filehandle:
+        tmp_dict = pickle.load(filehandle)
+        tmp_title = pickle.load(filehandle)
+
+    traces = {k: [np.asarray(v).ravel()] for k, v in tmp_dict.items()}
+    if isinstance(tmp_title, list):
+        # The title defaulted to an empty list
+        tmp_title = ''.join(tmp_title)
+    write_recording(filename, traces, title=tmp_title, metadata=metadata)
+
+    return
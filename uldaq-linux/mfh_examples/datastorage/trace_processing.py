@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+# =================================================================================
+# Processing of interleaved scan buffers into a datastorage
+#
+# A scan buffer holds the samples as ch0, ch1, ..., chN, ch0, ch1, ... so
+# reshaping it to (samples, channels) gives each channel as a column view
+# without copying. The time of the samples is kept as a linear axis
+# (start, step, length) in the datastorage instead of an array per scan.
+# =================================================================================
+import numpy as np
+
+
+def deinterleave(in_data, channel_count, samples_per_channel=None):
+    # (samples, channels) view of an interleaved buffer: ndarray, ScanBuffer
+    # or a ctypes array from create_float_buffer
+    if hasattr(in_data, 'array'):
+        in_data = in_data.array
+    values = np.asarray(in_data).reshape(-1)
+
+    if samples_per_channel is None:
+        samples_per_channel = values.size // channel_count
+
+    return values[:samples_per_channel * channel_count].reshape(
+        samples_per_channel, channel_count)
+
+
+def process_scan(DsData, in_data, channel_count, samplerate, trace_names,
+                 time_name="Time", time_scale=1000.0, samples_per_channel=None):
+    # Appends the channels of an interleaved buffer to the traces in
+    # trace_names, one name per channel, and extends the time axis
+    # time_name by the same number of samples. The time step is
+    # time_scale / samplerate, in ms by default. Can be called once per
+    # event with the new part of the buffer.
+    scans = deinterleave(in_data, channel_count, samples_per_channel)
+
+    for j, name in enumerate(trace_names):
+        if name not in DsData.name_list:
+            DsData.add_name(name)
+        DsData.add_data(name, scans[:, j])
+
+    if time_name is not None:
+        if not DsData.is_axis(time_name):
+            # Replaces an empty trace added with add_name
+            DsData.add_axis(time_name, 0.0, time_scale / samplerate)
+        DsData.extend_axis(time_name, len(scans))
+
+    return scans
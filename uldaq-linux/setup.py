@@ -21,6 +21,9 @@ setup(
     install_requires=[
         'enum34;python_version<"3.4"',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
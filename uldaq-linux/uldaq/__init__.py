@@ -1,49 +1,112 @@
-from .daq_device_discovery import (get_daq_device_inventory,
-                                   get_net_daq_device_descriptor)
-from .buffer_management import create_float_buffer, create_int_buffer
-from .daq_device import DaqDevice
-from .daq_device_config import DaqDeviceConfig
-from .daq_device_info import DaqDeviceInfo
-from .ai_device import AiDevice
-from .ai_info import AiInfo
-from .ai_config import AiConfig
-from .ao_device import AoDevice
-from .ao_info import AoInfo
-from .ao_config import AoConfig
-from .daqi_device import DaqiDevice
-from .daqi_info import DaqiInfo
-from .daqo_device import DaqoDevice
-from .daqo_info import DaqoInfo
-from .dio_device import DioDevice
-from .dio_config import DioConfig
-from .dio_info import DioInfo, DioPortInfo
-from .ctr_device import CtrDevice
-from .ctr_info import CtrInfo
-from .ctr_config import CtrConfig
-from .tmr_device import TmrDevice
-from .tmr_info import TmrInfo
-from .dev_mem_info import DevMemInfo
-from .ul_exception import ULException
-from .ul_structs import (DaqDeviceDescriptor, MemDescriptor, AiQueueElement,
-                         DaqInChanDescriptor, DaqOutChanDescriptor,
-                         TransferStatus, EventCallbackArgs)
-from .ul_enums import (ULError, InterfaceType, DaqEventType, WaitType,
-                       DevVersionType, MemAccessType, MemRegion, AiInputMode,
-                       AiChanType, AInFlag, AInScanFlag, Range, ScanOption,
-                       ScanStatus, TriggerType, AdcTimingMode, AiQueueType,
-                       AiChanQueueLimitation, AutoZeroMode, CouplingMode,
-                       IepeMode, TcType, TempUnit, DigitalDirection,
-                       DigitalPortIoType, DigitalPortType, DInScanFlag,
-                       DOutScanFlag, DaqInScanFlag, DaqInChanType, AOutFlag,
-                       AOutScanFlag, DaqOutChanType, DaqOutScanFlag,
-                       CConfigScanFlag, CInScanFlag, CounterDebounceMode,
-                       CounterDebounceTime, CounterEdgeDetection,
-                       CounterMeasurementMode, CounterMeasurementType,
-                       CounterRegisterType, CounterTickSize, TimerType,
-                       TmrIdleState, TmrStatus, PulseOutOption,
-                       SensorConnectionType, TInFlag, TInListFlag, TempScale,
-                       AOutListFlag, AOutSyncMode, AOutSenseMode, OtdMode,
-                       CalibrationType, AiCalTableType, AiRejectFreqType)
+from importlib import import_module
+from sys import version_info
+
+# The modules defining the exported names. A module is only imported when
+# one of its names is first used, so "import uldaq" does not load the C
+# library, every subsystem or NumPy.
+_submodules = {
+    'ul_c_interface': ('set_backend', 'get_backend'),
+    'daq_device_discovery': ('get_daq_device_inventory',
+                             'get_net_daq_device_descriptor',
+                             'DaqDeviceInventory',
+                             'get_daq_device_inventory_cache'),
+    'buffer_management': ('create_float_buffer', 'create_int_buffer',
+                          'create_float_ndarray_buffer',
+                          'create_int_ndarray_buffer', 'ScanBuffer'),
+    'scan_ring_reader': ('ScanRingReader',),
+    'scan_stream': ('ScanStream',),
+    'scan_output_stream': ('ScanOutputStream', 'OutputStreamStats'),
+    'device_group': ('DeviceGroup', 'DeviceGroupStream', 'DeviceBlock',
+                     'DeviceGroupError'),
+    'scan_supervisor': ('ScanSupervisor', 'ScanGap', 'SupervisedBlock',
+                        'ScanSupervisorStats'),
+    'waveforms': ('WaveformGenerator',),
+    'counter_processing': ('CounterUnwrapper', 'EncoderProcessor'),
+    'daqi_demux': ('DaqInDemux',),
+    'software_trigger': ('SoftwareTrigger', 'TriggerCapture'),
+    'segmented_scan': ('SegmentedScan',),
+    'event_dispatcher': ('EventDispatcher', 'EventDispatcherStats',
+                         'DropPolicy'),
+    'daq_device': ('DaqDevice',),
+    'daq_device_config': ('DaqDeviceConfig',),
+    'daq_device_info': ('DaqDeviceInfo',),
+    'daq_device_capabilities': ('DaqDeviceCapabilities', 'AiCapabilities',
+                                'AoCapabilities', 'DioCapabilities',
+                                'DioPortCapabilities', 'CtrCapabilities',
+                                'TmrCapabilities', 'DaqiCapabilities',
+                                'DaqoCapabilities',
+                                'get_capabilities_cache_dir'),
+    'ai_device': ('AiDevice',),
+    'ai_info': ('AiInfo',),
+    'ai_config': ('AiConfig',),
+    'ao_device': ('AoDevice',),
+    'ao_info': ('AoInfo',),
+    'ao_config': ('AoConfig',),
+    'daqi_device': ('DaqiDevice',),
+    'daqi_info': ('DaqiInfo',),
+    'daqo_device': ('DaqoDevice',),
+    'daqo_info': ('DaqoInfo',),
+    'dio_device': ('DioDevice',),
+    'dio_config': ('DioConfig',),
+    'dio_info': ('DioInfo', 'DioPortInfo'),
+    'ctr_device': ('CtrDevice',),
+    'ctr_info': ('CtrInfo',),
+    'ctr_config': ('CtrConfig',),
+    'tmr_device': ('TmrDevice',),
+    'tmr_info': ('TmrInfo',),
+    'dev_mem_info': ('DevMemInfo',),
+    'ul_exception': ('ULException',),
+    'ul_structs': ('DaqDeviceDescriptor', 'MemDescriptor', 'AiQueueElement',
+                   'DaqInChanDescriptor', 'DaqOutChanDescriptor',
+                   'TransferStatus', 'EventCallbackArgs'),
+    'ul_enums': ('ULError', 'InterfaceType', 'DaqEventType', 'WaitType',
+                 'DevVersionType', 'MemAccessType', 'MemRegion', 'AiInputMode',
+                 'AiChanType', 'AInFlag', 'AInScanFlag', 'Range', 'ScanOption',
+                 'ScanStatus', 'TriggerType', 'AdcTimingMode', 'AiQueueType',
+                 'AiChanQueueLimitation', 'AutoZeroMode', 'CouplingMode',
+                 'IepeMode', 'TcType', 'TempUnit', 'DigitalDirection',
+                 'DigitalPortIoType', 'DigitalPortType', 'DInScanFlag',
+                 'DOutScanFlag', 'DaqInScanFlag', 'DaqInChanType', 'AOutFlag',
+                 'AOutScanFlag', 'DaqOutChanType', 'DaqOutScanFlag',
+                 'CConfigScanFlag', 'CInScanFlag', 'CounterDebounceMode',
+                 'CounterDebounceTime', 'CounterEdgeDetection',
+                 'CounterMeasurementMode', 'CounterMeasurementType',
+                 'CounterRegisterType', 'CounterTickSize', 'TimerType',
+                 'TmrIdleState', 'TmrStatus', 'PulseOutOption',
+                 'SensorConnectionType', 'TInFlag', 'TInListFlag', 'TempScale',
+                 'AOutListFlag', 'AOutSyncMode', 'AOutSenseMode', 'OtdMode',
+                 'CalibrationType', 'AiCalTableType', 'AiRejectFreqType'),
+}
+_exports = dict((name, module_name)
+                for module_name, names in _submodules.items()
+                for name in names)
+# The modules that import NumPy at module level
+_numpy_submodules = ('waveforms', 'counter_processing')
+
+
+def __getattr__(name):
+    module_name = _exports.get(name)
+    if module_name is None:
+        raise AttributeError("module '{}' has no attribute '{}'".format(
+            __name__, name))
+    value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+if version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is not available; import eagerly. The
+    # NumPy based modules are left out when NumPy is not installed.
+    for _name, _module_name in _exports.items():
+        try:
+            __getattr__(_name)
+        except ImportError:
+            if _module_name not in _numpy_submodules:
+                raise
 
 __all__ = ['get_daq_device_inventory', 'create_float_buffer',
            'create_int_buffer', 'DaqDevice', 'DaqDeviceConfig', 'DaqDeviceInfo',
@@ -70,4 +133,18 @@ __all__ = ['get_daq_device_inventory', 'create_float_buffer',
            'AOutListFlag', 'AOutSyncMode', 'AOutSenseMode', 'AiConfig',
            'AoConfig', 'CtrConfig', 'OtdMode', 'CalibrationType',
            'AiCalTableType', 'AiRejectFreqType',
-           'get_net_daq_device_descriptor']
+           'get_net_daq_device_descriptor', 'create_float_ndarray_buffer',
+           'create_int_ndarray_buffer', 'ScanBuffer', 'ScanRingReader',
+           'ScanStream', 'EventDispatcher', 'EventDispatcherStats',
+           'DropPolicy', 'set_backend', 'get_backend', 'DaqDeviceCapabilities',
+           'AiCapabilities', 'AoCapabilities', 'DioCapabilities',
+           'DioPortCapabilities', 'CtrCapabilities', 'TmrCapabilities',
+           'DaqiCapabilities', 'DaqoCapabilities',
+           'get_capabilities_cache_dir', 'DaqDeviceInventory',
+           'get_daq_device_inventory_cache', 'DeviceGroup',
+           'DeviceGroupStream', 'DeviceBlock', 'DeviceGroupError',
+           'ScanSupervisor', 'ScanGap', 'SupervisedBlock',
+           'ScanSupervisorStats', 'WaveformGenerator',
+           'ScanOutputStream', 'OutputStreamStats', 'CounterUnwrapper',
+           'EncoderProcessor', 'DaqInDemux', 'SoftwareTrigger',
+           'TriggerCapture', 'SegmentedScan']
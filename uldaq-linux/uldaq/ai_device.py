@@ -6,12 +6,15 @@ Created on Feb 16 2018
 from ctypes import c_uint, c_double, c_longlong, byref, Array
 from .ul_enums import (AiInputMode, AInFlag, AInScanFlag, Range, ScanOption,
                        ScanStatus, TriggerType, WaitType, TInFlag, TempScale,
-                       TInListFlag, ULError)
+                       TInListFlag, ULError, AiQueueType,
+                       AiChanQueueLimitation)
 from .ul_structs import AiQueueElement, TransferStatus
 from .ul_exception import ULException
 from .ul_c_interface import lib
 from .ai_info import AiInfo
 from .ai_config import AiConfig
+from .buffer_management import create_float_ndarray_buffer
+from .scan_stream import ScanStream, _stream_buffer_blocks
 
 
 def ai_queue_array(size, queue_list):
@@ -29,6 +32,12 @@ class AiDevice:
         self.__handle = handle
         self.__ai_info = AiInfo(handle)
         self.__ai_config = AiConfig(handle)
+        # The A/D queue last loaded through this object, as a tuple of
+        # (channel, input_mode, range) tuples
+        self.__queue = ()
+        self.__list_pacer = None
+        self.__list_queue_info = {}
+        self.__list_buffers = {}
 
     def get_info(self):
         # type: () -> AiInfo
@@ -87,6 +96,144 @@ class AiDevice:
             raise ULException(err)
         return data.value
 
+    def a_in_list(self, channels, input_mode, analog_range,
+                  flags=AInFlag.DEFAULT):
+        # type: (list[int], AiInputMode, Union[Range, list[Range]], AInFlag) -> ndarray
+        """
+        Returns the values read from a list of A/D channels on the device
+        referenced by the :class:`AiDevice` object.
+
+        On devices with a hardware pacer all channels are read by a finite
+        scan of one sample per channel at the maximum rate, so the snapshot
+        costs one scan instead of one :func:`a_in` round trip per channel.
+        Channels that are not a contiguous range with a single range are
+        read through the A/D queue; the queue loaded with
+        :func:`a_in_load_queue`, if any, is set aside for the scan and
+        restored afterwards. Devices without a
+        pacer, and channel lists the A/D queue of the device cannot hold
+        (see :func:`AiInfo.get_queue_types`,
+        :func:`AiInfo.get_max_queue_length` and
+        :func:`AiInfo.get_chan_queue_limitations`), are read with
+        :func:`a_in`. Requires NumPy.
+
+        Args:
+            channels (list[int]): The A/D channel numbers, in the order in
+                which the values are returned.
+            input_mode (AiInputMode): The input mode of the channels.
+            analog_range (Range or list[Range]): The range of all channels,
+                or a list with the range of each channel.
+            flags (Optional[AInFlag]): One or more of the :class:`AInFlag`
+                attributes (suitable for bit-wise operations) specifying the
+                conditioning applied to the data before it is returned.
+
+        Returns:
+            ndarray:
+
+            The float64 values of the channels, in the order of channels.
+
+        Raises:
+            :class:`ULException`
+        """
+        from numpy import array
+
+        channels = list(channels)
+        number_of_channels = len(channels)
+        if not number_of_channels:
+            raise ULException(ULError.BAD_ARG)
+        if isinstance(analog_range, (list, tuple)):
+            ranges = list(analog_range)
+            if len(ranges) != number_of_channels:
+                raise ULException(ULError.BAD_ARG)
+        else:
+            ranges = [analog_range] * number_of_channels
+
+        low_channel, high_channel = channels[0], channels[-1]
+        contiguous = (channels == list(range(low_channel, high_channel + 1))
+                      and ranges.count(ranges[0]) == number_of_channels)
+        rate = self.__get_list_rate(number_of_channels)
+        if not rate or not (contiguous or
+                            self.__can_queue(channels, input_mode, ranges)):
+            return array([self.a_in(channel, input_mode, channel_range, flags)
+                          for channel, channel_range in zip(channels, ranges)])
+
+        user_queue = self.__queue
+        if contiguous:
+            queue = ()
+        else:
+            queue = tuple(zip(channels, [input_mode] * number_of_channels,
+                              ranges))
+            low_channel, high_channel = min(channels), max(channels)
+
+        data = self.__list_buffers.get(number_of_channels)
+        if data is None:
+            data = create_float_ndarray_buffer(number_of_channels, 1)
+            self.__list_buffers[number_of_channels] = data
+        if queue != user_queue:
+            self.a_in_load_queue([AiQueueElement(*element)
+                                  for element in queue])
+        try:
+            self.a_in_scan(low_channel, high_channel, input_mode, ranges[0],
+                           1, rate, ScanOption.DEFAULTIO, flags, data)
+            self.scan_wait(WaitType.WAIT_UNTIL_DONE,
+                           1.0 + number_of_channels / rate)
+        finally:
+            # The user's queue stays in effect for their own scans
+            if queue != user_queue:
+                self.a_in_load_queue([AiQueueElement(*element)
+                                      for element in user_queue])
+        return data.array.copy()
+
+    def __get_list_rate(self, number_of_channels):
+        # Returns the per channel rate used by a_in_list, or 0 if the
+        # channels must be read one by one. The pacer information is only
+        # read once.
+        if self.__list_pacer is None:
+            ai_info = self.__ai_info
+            if ai_info.has_pacer():
+                self.__list_pacer = (ai_info.get_max_scan_rate(),
+                                     ai_info.get_max_throughput())
+            else:
+                self.__list_pacer = (0.0, 0.0)
+        max_rate, max_throughput = self.__list_pacer
+        if max_throughput:
+            return min(max_rate, max_throughput / number_of_channels)
+        return max_rate
+
+    def __can_queue(self, channels, input_mode, ranges):
+        # Tells whether the A/D queue of the device can hold the channel
+        # list. The queue information is only read once per input mode.
+        queue_info = self.__list_queue_info.get(input_mode)
+        if queue_info is None:
+            ai_info = self.__ai_info
+            try:
+                queue_info = (ai_info.get_queue_types(),
+                              ai_info.get_max_queue_length(input_mode),
+                              ai_info.get_chan_queue_limitations())
+            except ULException:
+                queue_info = ([], 0, [])
+            self.__list_queue_info[input_mode] = queue_info
+        queue_types, max_queue_length, limitations = queue_info
+
+        if len(channels) > max_queue_length:
+            return False
+        if (ranges.count(ranges[0]) != len(ranges)
+                and AiQueueType.GAIN not in queue_types):
+            return False
+        consecutive = channels == list(range(channels[0],
+                                             channels[0] + len(channels)))
+        if AiQueueType.CHAN not in queue_types:
+            return consecutive
+        if (AiChanQueueLimitation.UNIQUE_CHAN in limitations
+                and len(set(channels)) != len(channels)):
+            return False
+        if (AiChanQueueLimitation.ASCENDING_CHAN in limitations
+                and channels != sorted(channels)):
+            return False
+        if (AiChanQueueLimitation.CONSECUTIVE_CHAN in limitations
+                and not consecutive):
+            return False
+        return True
+
     def a_in_scan(self, low_channel, high_channel, input_mode, analog_range,
                   samples_per_channel, rate, options, flags,
                   data):
@@ -111,7 +258,8 @@ class AiDevice:
                 (suitable for bit-wise operations) specifying the conditioning
                 applied to the data before it is returned.
             data (Array[float]): The buffer to receive the data.
-                Use :class:`create_float_buffer` to create the buffer.
+                Use :class:`create_float_buffer` or
+                :class:`create_float_ndarray_buffer` to create the buffer.
 
         Returns:
             float:
@@ -129,6 +277,56 @@ class AiDevice:
             raise ULException(err)
         return rate.value
 
+    def stream(self, low_channel, high_channel, input_mode, analog_range,
+               rate, block_size, options=ScanOption.DEFAULTIO,
+               flags=AInScanFlag.DEFAULT, buffer_blocks=None):
+        # type: (int, int, AiInputMode, Range, float, int, ScanOption, AInScanFlag, int) -> ScanStream
+        """
+        Starts a CONTINUOUS scan of a range of A/D channels on the device
+        referenced by the :class:`AiDevice` object, and returns an iterator
+        over fixed-size blocks of the acquired data.
+
+        The scan buffer is allocated internally and holds a whole number of
+        blocks. Iterating the returned stream yields
+        (block_index, ndarray[block_size, number_of_channels],
+        first_sample_index) tuples until the stream is closed. Requires NumPy.
+
+        Args:
+            low_channel (int): First A/D channel in the scan.
+            high_channel (int): Last A/D channel in the scan.
+            input_mode (AiInputMode): The input mode of the specified channels.
+            analog_range (Range): The range of the data being read.
+            rate (float): A/D sample rate in samples per channel per second.
+            block_size (int): The number of samples per channel in each block.
+            options (Optional[ScanOption]): One or more of the attributes
+                (suitable for bit-wise operations) specifying the
+                optional conditions that will be applied to the scan;
+                :class:`~ScanOption.CONTINUOUS` is always added.
+            flags (Optional[AInScanFlag]): One or more of the attributes
+                (suitable for bit-wise operations) specifying the conditioning
+                applied to the data before it is returned.
+            buffer_blocks (Optional[int]): The number of blocks the scan
+                buffer holds; by default the buffer holds at least one second
+                of data.
+
+        Returns:
+            ScanStream:
+
+            The block iterator; closing it stops the scan.
+
+        Raises:
+            :class:`ULException`
+        """
+        number_of_channels = high_channel - low_channel + 1
+        blocks = _stream_buffer_blocks(rate, block_size, buffer_blocks)
+        data = create_float_ndarray_buffer(number_of_channels,
+                                           blocks * block_size)
+        rate = self.a_in_scan(low_channel, high_channel, input_mode,
+                              analog_range, blocks * block_size, rate,
+                              options | ScanOption.CONTINUOUS, flags, data)
+        return ScanStream(data, self.get_scan_status, self.scan_stop, rate,
+                          block_size)
+
     def a_in_load_queue(self, queue):
         # type: (list[AiQueueElement]) -> None
         """
@@ -148,6 +346,8 @@ class AiDevice:
         err = lib.ulAInLoadQueue(self.__handle, queue_array, num_elements)
         if err != 0:
             raise ULException(err)
+        self.__queue = tuple((element.channel, element.input_mode,
+                              element.range) for element in queue)
 
     def set_trigger(self, trig_type, trig_chan, level, variance,
                     retrigger_sample_count):
@@ -0,0 +1,329 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+asyncio support for input scans. The UL event callbacks run on the library's
+internal thread; the scans in this module hand each event to the event loop
+with call_soon_threadsafe, so any number of devices can be serviced from a
+single loop without polling. Requires Python 3.5.3 or later.
+"""
+import asyncio
+from .ul_enums import (DaqEventType, ScanOption, ScanStatus, AInScanFlag,
+                       DaqInScanFlag, CInScanFlag, ULError)
+from .ul_structs import TransferStatus
+from .ul_exception import ULException
+from .buffer_management import (create_float_ndarray_buffer,
+                                create_int_ndarray_buffer)
+from .scan_ring_reader import ScanRingReader
+
+INPUT_SCAN_EVENTS = (DaqEventType.ON_DATA_AVAILABLE
+                     | DaqEventType.ON_END_OF_INPUT_SCAN
+                     | DaqEventType.ON_INPUT_SCAN_ERROR)
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError:
+    # Before Python 3.7, get_event_loop returns the running loop when it is
+    # called from a coroutine
+    _get_running_loop = asyncio.get_event_loop
+
+
+def _default_event_parameter(rate, samples_per_channel):
+    # Notify about ten times per second, and at least twice per buffer
+    return max(1, min(int(rate // 10), samples_per_channel // 2))
+
+
+class AsyncScan:
+    """
+    An input scan driven by UL events and consumed from an asyncio event
+    loop.
+
+    Instances are obtained from the :func:`a_in_scan`, :func:`daq_in_scan`
+    and :func:`c_in_scan` coroutines. Iterating with ``async for`` yields
+    (first_sample_index, ndarray[scans, number_of_channels]) tuples as data
+    arrives; each array is a view of the scan buffer (or a copy when the data
+    wraps around the end of the buffer) and remains valid until the next
+    iteration. ``await scan.done()`` waits for the end of the scan.
+
+    Args:
+        daq_device (DaqDevice): The device running the scan.
+        data (ScanBuffer): The buffer the scan writes to.
+        get_scan_status (function): The scan status method of the subsystem.
+        scan_stop (function): The scan stop method of the subsystem.
+        loop (AbstractEventLoop): The event loop the scan is consumed from.
+    """
+    def __init__(self, daq_device, data, get_scan_status, scan_stop, loop):
+        self.__daq_device = daq_device
+        self.__data = data
+        self.__get_scan_status = get_scan_status
+        self.__scan_stop = scan_stop
+        self.__loop = loop
+        self.__transfer_status = TransferStatus()
+        self.__reader = ScanRingReader(data, self.__get_event_status)
+        self.__data_ready = asyncio.Event()
+        self.__done = loop.create_future()
+        self.__scans_in_use = 0
+        self.__events_enabled = False
+        self.__closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # type: () -> tuple[int, ndarray]
+        reader = self.__reader
+        if reader.is_overrun(self.__scans_in_use):
+            self.close()
+            raise ULException(ULError.OVERRUN)
+
+        while True:
+            if reader.get_scans_available() > 0:
+                first_scan, scans = reader.read()
+                self.__scans_in_use = len(scans)
+                return first_scan, scans
+            if self.__done.done():
+                # Raises the scan error, if any
+                self.__done.result()
+                raise StopAsyncIteration
+            self.__data_ready.clear()
+            await self.__data_ready.wait()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exe_type, exe_value, exe_traceback):
+        self.close()
+
+    @property
+    def data(self):
+        """The :class:`ScanBuffer` the scan writes to."""
+        return self.__data
+
+    def done(self):
+        # type: () -> asyncio.Future
+        """
+        Returns a future that completes when the scan ends, or raises the
+        :class:`ULException` that ended it.
+
+        Returns:
+            Future:
+
+            The future; its result is the total number of samples per channel
+            acquired.
+        """
+        return self.__done
+
+    def close(self):
+        # type: () -> None
+        """
+        Stops the scan if it is still running and disables its events.
+
+        Raises:
+            :class:`ULException`
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        try:
+            self.__scan_stop()
+        finally:
+            self.disable_events()
+            if not self.__done.done():
+                self.__done.set_result(
+                    self.__transfer_status.current_scan_count)
+            self.__data_ready.set()
+
+    def enable_events(self, event_parameter):
+        # type: (int) -> None
+        """Enables the input scan events on the device; used when the scan
+        is started."""
+        self.__daq_device.enable_event(INPUT_SCAN_EVENTS, event_parameter,
+                                       self.__on_event, None)
+        self.__events_enabled = True
+
+    def disable_events(self):
+        # type: () -> None
+        """Disables the input scan events on the device."""
+        if self.__events_enabled:
+            self.__events_enabled = False
+            self.__daq_device.disable_event(INPUT_SCAN_EVENTS)
+
+    def __get_event_status(self):
+        return ScanStatus.RUNNING, self.__transfer_status
+
+    def __on_event(self, event_callback_args):
+        # Runs on the UL event thread; only hands the event over to the loop
+        try:
+            self.__loop.call_soon_threadsafe(self.__handle_event,
+                                             event_callback_args.event_type,
+                                             event_callback_args.event_data)
+        except RuntimeError:
+            # The event loop has been closed
+            pass
+
+    def __handle_event(self, event_type, event_data):
+        number_of_channels = self.__reader.number_of_channels
+        if event_type == DaqEventType.ON_DATA_AVAILABLE:
+            self.__set_scan_count(event_data)
+        elif event_type == DaqEventType.ON_END_OF_INPUT_SCAN:
+            transfer_status = self.__get_scan_status()[1]
+            self.__set_scan_count(transfer_status.current_total_count
+                                  // number_of_channels)
+            if not self.__done.done():
+                self.__done.set_result(transfer_status.current_scan_count)
+            self.disable_events()
+        elif event_type == DaqEventType.ON_INPUT_SCAN_ERROR:
+            if not self.__done.done():
+                self.__done.set_exception(ULException(event_data))
+            self.disable_events()
+        self.__data_ready.set()
+
+    def __set_scan_count(self, scan_count):
+        total_count = scan_count * self.__reader.number_of_channels
+        if total_count > self.__transfer_status.current_total_count:
+            self.__transfer_status._current_scan_count = scan_count
+            self.__transfer_status._current_total_count = total_count
+
+
+async def _start_scan(daq_device, data, subsystem, start, event_parameter):
+    loop = _get_running_loop()
+    scan = AsyncScan(daq_device, data, subsystem.get_scan_status,
+                     subsystem.scan_stop, loop)
+    scan.enable_events(event_parameter)
+    try:
+        await loop.run_in_executor(None, start)
+    except BaseException:
+        scan.disable_events()
+        raise
+    return scan
+
+
+async def a_in_scan(daq_device, low_channel, high_channel, input_mode,
+                    analog_range, samples_per_channel, rate,
+                    options=ScanOption.DEFAULTIO, flags=AInScanFlag.DEFAULT,
+                    event_parameter=None):
+    # type: (DaqDevice, int, int, AiInputMode, Range, int, float, ScanOption, AInScanFlag, int) -> AsyncScan
+    """
+    Starts a scan of a range of A/D channels on the analog input subsystem of
+    a device, and returns an :class:`AsyncScan` used to consume its data.
+
+    Args:
+        daq_device (DaqDevice): The device to scan.
+        low_channel (int): First A/D channel in the scan.
+        high_channel (int): Last A/D channel in the scan.
+        input_mode (AiInputMode): The input mode of the specified channels.
+        analog_range (Range): The range of the data being read.
+        samples_per_channel (int): The number of samples per channel to
+            collect, or the buffer size of a CONTINUOUS scan.
+        rate (float): A/D sample rate in samples per channel per second.
+        options (Optional[ScanOption]): The scan options.
+        flags (Optional[AInScanFlag]): The scan flags.
+        event_parameter (Optional[int]): The number of samples per channel
+            between data available events; by default about ten events
+            are raised per second.
+
+    Returns:
+        AsyncScan:
+
+        The running scan.
+
+    Raises:
+        :class:`ULException`
+    """
+    ai_device = daq_device.get_ai_device()
+    number_of_channels = high_channel - low_channel + 1
+    data = create_float_ndarray_buffer(number_of_channels, samples_per_channel)
+    if event_parameter is None:
+        event_parameter = _default_event_parameter(rate, samples_per_channel)
+
+    def start():
+        ai_device.a_in_scan(low_channel, high_channel, input_mode,
+                            analog_range, samples_per_channel, rate, options,
+                            flags, data)
+    return await _start_scan(daq_device, data, ai_device, start,
+                             event_parameter)
+
+
+async def daq_in_scan(daq_device, channel_descriptors, samples_per_channel,
+                      rate, options=ScanOption.DEFAULTIO,
+                      flags=DaqInScanFlag.DEFAULT, event_parameter=None):
+    # type: (DaqDevice, list[DaqInChanDescriptor], int, float, ScanOption, DaqInScanFlag, int) -> AsyncScan
+    """
+    Starts a scan on the DAQ input subsystem of a device, and returns an
+    :class:`AsyncScan` used to consume its data.
+
+    Args:
+        daq_device (DaqDevice): The device to scan.
+        channel_descriptors (list[DaqInChanDescriptor]): A list of DAQ input
+            channel descriptors.
+        samples_per_channel (int): The number of samples per channel to
+            collect, or the buffer size of a CONTINUOUS scan.
+        rate (float): Sample input rate in samples per second.
+        options (Optional[ScanOption]): The scan options.
+        flags (Optional[DaqInScanFlag]): The scan flags.
+        event_parameter (Optional[int]): The number of samples per channel
+            between data available events; by default about ten events
+            are raised per second.
+
+    Returns:
+        AsyncScan:
+
+        The running scan.
+
+    Raises:
+        :class:`ULException`
+    """
+    daqi_device = daq_device.get_daqi_device()
+    data = create_float_ndarray_buffer(len(channel_descriptors),
+                                       samples_per_channel)
+    if event_parameter is None:
+        event_parameter = _default_event_parameter(rate, samples_per_channel)
+
+    def start():
+        daqi_device.daq_in_scan(channel_descriptors, samples_per_channel, rate,
+                                options, flags, data)
+    return await _start_scan(daq_device, data, daqi_device, start,
+                             event_parameter)
+
+
+async def c_in_scan(daq_device, low_counter_num, high_counter_num,
+                    samples_per_counter, rate, options=ScanOption.DEFAULTIO,
+                    flags=CInScanFlag.DEFAULT, event_parameter=None):
+    # type: (DaqDevice, int, int, int, float, ScanOption, CInScanFlag, int) -> AsyncScan
+    """
+    Starts a scan of a range of counters on the counter subsystem of a
+    device, and returns an :class:`AsyncScan` used to consume its data.
+
+    Args:
+        daq_device (DaqDevice): The device to scan.
+        low_counter_num (int): The first counter in the scan.
+        high_counter_num (int): The last counter in the scan.
+        samples_per_counter (int): The number of samples per counter to
+            collect, or the buffer size of a CONTINUOUS scan.
+        rate (float): The rate in samples per second per counter.
+        options (Optional[ScanOption]): The scan options.
+        flags (Optional[CInScanFlag]): The scan flags.
+        event_parameter (Optional[int]): The number of samples per counter
+            between data available events; by default about ten events
+            are raised per second.
+
+    Returns:
+        AsyncScan:
+
+        The running scan.
+
+    Raises:
+        :class:`ULException`
+    """
+    ctr_device = daq_device.get_ctr_device()
+    number_of_counters = high_counter_num - low_counter_num + 1
+    data = create_int_ndarray_buffer(number_of_counters, samples_per_counter)
+    if event_parameter is None:
+        event_parameter = _default_event_parameter(rate, samples_per_counter)
+
+    def start():
+        ctr_device.c_in_scan(low_counter_num, high_counter_num,
+                             samples_per_counter, rate, options, flags, data)
+    return await _start_scan(daq_device, data, ctr_device, start,
+                             event_parameter)
@@ -11,6 +11,8 @@ from .ul_c_interface import lib
 from .ul_enums import (AOutFlag, AOutScanFlag, Range, ScanOption, ScanStatus,
                        WaitType, TriggerType, AOutListFlag, ULError)
 from .ul_structs import TransferStatus
+from .buffer_management import create_float_buffer
+from .scan_output_stream import ScanOutputStream
 
 
 class AoDevice:
@@ -119,6 +121,67 @@ class AoDevice:
 
         return sample_rate.value
 
+    def stream_out(self, source, low_chan, high_chan, analog_range, rate,
+                   block_size, options=ScanOption.DEFAULTIO,
+                   flags=AOutScanFlag.DEFAULT, buffer_blocks=2,
+                   stop_on_underrun=False):
+        # type: (object, int, int, Range, float, int, ScanOption, AOutScanFlag, int, bool) -> ScanOutputStream
+        """
+        Starts a CONTINUOUS output scan of a range of D/A channels on the
+        device referenced by the :class:`AoDevice` object, fed from a source
+        of data of any length.
+
+        The scan buffer holds buffer_blocks blocks and is allocated
+        internally; a background thread refills each block with the next
+        data from the source once the device has output it, so the memory
+        used does not depend on the length of the source. Requires NumPy.
+
+        Args:
+            source: The data to output: an object with a fill method, such
+                as a :class:`WaveformGenerator`, or an iterable of ndarray
+                blocks, each holding a whole number of scans as a
+                (scans, channels) array or as interleaved samples.
+            low_chan (int): First D/A channel in the scan.
+            high_chan (int): Last D/A channel in the scan.
+            analog_range (Range): The range of the data to be written.
+            rate (float): Sample output rate in scans per second.
+            block_size (int): The number of scans written by each refill.
+            options (Optional[ScanOption]): One or more of the attributes
+                (suitable for bit-wise operations) specifying the
+                optional conditions that will be applied to the scan;
+                :class:`~ScanOption.CONTINUOUS` is always added.
+            flags (Optional[AOutScanFlag]): One or more of the attributes
+                (suitable for bit-wise operations) specifying the
+                conditioning applied to the data.
+            buffer_blocks (Optional[int]): The number of blocks in the scan
+                buffer, at least 2; the default is 2.
+            stop_on_underrun (Optional[bool]): If True, the stream stops with
+                an :class:`~ULError.UNDERRUN` error when the device outputs a
+                block before it has been refilled; by default the underrun
+                is counted and the stream carries on.
+
+        Returns:
+            ScanOutputStream:
+
+            The running stream; closing it stops the scan.
+
+        Raises:
+            :class:`ULException`
+        """
+        number_of_channels = high_chan - low_chan + 1
+        samples_per_channel = max(buffer_blocks, 2) * block_size
+        data = create_float_buffer(number_of_channels, samples_per_channel)
+
+        def start_scan():
+            return self.a_out_scan(low_chan, high_chan, analog_range,
+                                   samples_per_channel, rate,
+                                   options | ScanOption.CONTINUOUS, flags,
+                                   data)
+
+        return ScanOutputStream(data, source, number_of_channels, start_scan,
+                                self.get_scan_status, self.scan_stop,
+                                block_size, stop_on_underrun)
+
     def get_scan_status(self):
         # type: () -> tuple[ScanStatus, TransferStatus]
         """
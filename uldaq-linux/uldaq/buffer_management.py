@@ -3,7 +3,7 @@ Created on Feb 12 2018
 
 @author: MCC
 """
-from ctypes import c_ulonglong, c_double, Array
+from ctypes import c_ulonglong, c_double, Array, POINTER, cast
 
 
 def create_float_buffer(number_of_channels, samples_per_channel):
@@ -42,3 +42,127 @@ def create_int_buffer(number_of_channels, samples_per_channel):
     """
     ull_array = c_ulonglong * (number_of_channels * samples_per_channel)  # type: type
     return ull_array()
+
+
+def create_float_ndarray_buffer(number_of_channels, samples_per_channel):
+    # type: (int, int) -> ScanBuffer
+    """
+    Create a NumPy backed buffer for double precision floating point sample
+    values.
+
+    The returned buffer can be passed to :func:`AiDevice.a_in_scan` and
+    :func:`DaqiDevice.daq_in_scan` in place of a buffer created with
+    :func:`create_float_buffer`.
+
+    Args:
+        number_of_channels (int): Number of channels in the scan.
+        samples_per_channel (int): Number samples per channel to be stored in
+            the buffer.
+
+    Returns:
+        ScanBuffer:
+
+        A buffer of size number_of_channels * samples_per_channel whose
+        memory is shared with a float64 ndarray.
+    """
+    return ScanBuffer(c_double, number_of_channels, samples_per_channel)
+
+
+def create_int_ndarray_buffer(number_of_channels, samples_per_channel):
+    # type: (int, int) -> ScanBuffer
+    """
+    Create a NumPy backed buffer for 64-bit unsigned integer sample values.
+
+    The returned buffer can be passed to :func:`CtrDevice.c_in_scan` and
+    :func:`DioDevice.d_in_scan` in place of a buffer created with
+    :func:`create_int_buffer`.
+
+    Args:
+        number_of_channels (int): Number of channels in the scan.
+        samples_per_channel (int): Number samples per channel to be stored in
+            the buffer.
+
+    Returns:
+        ScanBuffer:
+
+        A buffer of size number_of_channels * samples_per_channel whose
+        memory is shared with a uint64 ndarray.
+    """
+    return ScanBuffer(c_ulonglong, number_of_channels, samples_per_channel)
+
+
+class ScanBuffer:
+    """
+    A scan buffer whose memory is shared between the ctypes array handed to
+    the UL and a NumPy ndarray, so samples written by the device can be
+    processed without copying them element by element.
+
+    Instances are usually created with :func:`create_float_ndarray_buffer` or
+    :func:`create_int_ndarray_buffer`. Requires NumPy.
+
+    Args:
+        c_type (type): The ctypes element type, c_double or c_ulonglong.
+        number_of_channels (int): Number of channels in the scan.
+        samples_per_channel (int): Number samples per channel to be stored in
+            the buffer.
+    """
+    def __init__(self, c_type, number_of_channels, samples_per_channel):
+        from numpy.ctypeslib import as_array
+
+        size = number_of_channels * samples_per_channel
+        c_array_type = c_type * size  # type: type
+        self.__c_array = c_array_type()
+        self.__number_of_channels = number_of_channels
+        self.__samples_per_channel = samples_per_channel
+        self.__array = as_array(self.__c_array)
+        self.__by_channel = self.__array.reshape(samples_per_channel,
+                                                 number_of_channels)
+        # Used by ctypes when the buffer is passed to a UL function
+        self._as_parameter_ = cast(self.__c_array, POINTER(c_type))
+
+    def __len__(self):
+        return len(self.__array)
+
+    def __getitem__(self, index):
+        return self.__array[index]
+
+    def __setitem__(self, index, value):
+        self.__array[index] = value
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == self.__array.dtype:
+            return self.__array
+        return self.__array.astype(dtype)
+
+    @property
+    def _length_(self):
+        """The total number of samples, matching the ctypes array
+        attribute of the same name."""
+        return len(self.__array)
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in the scan."""
+        return self.__number_of_channels
+
+    @property
+    def samples_per_channel(self):
+        """The number of samples per channel the buffer holds."""
+        return self.__samples_per_channel
+
+    @property
+    def c_array(self):
+        """The ctypes array that owns the buffer memory."""
+        return self.__c_array
+
+    @property
+    def array(self):
+        """A one dimensional ndarray view of the interleaved samples."""
+        return self.__array
+
+    @property
+    def by_channel(self):
+        """A (samples_per_channel, number_of_channels) ndarray view of the
+        samples; column n holds the samples of the n-th channel in the
+        scan."""
+        return self.__by_channel
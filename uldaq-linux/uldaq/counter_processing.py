@@ -0,0 +1,384 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+Vectorized post-processing of counter scan data: rollover unwrapping,
+encoder position, velocity and acceleration, and conversion of period and
+pulse width measurements. The functions take the (samples, counters)
+ndarrays of :func:`CtrDevice.stream` blocks or of a reshaped
+:func:`CtrDevice.c_in_scan` buffer. Requires NumPy.
+"""
+import numpy as np
+from .ul_enums import (CInScanFlag, CounterMeasurementMode, CounterTickSize,
+                       ULError)
+from .ul_exception import ULException
+
+
+def get_scan_resolution(ctr_info, flags=CInScanFlag.DEFAULT):
+    # type: (CtrInfo, CInScanFlag) -> int
+    """
+    Returns the number of bits of the counter values returned by
+    :func:`CtrDevice.c_in_scan` for the specified flags.
+
+    Args:
+        ctr_info (CtrInfo): The counter information object of the device.
+        flags (Optional[CInScanFlag]): The flags passed to the scan.
+
+    Returns:
+        int:
+
+        16, 32 or 64 if the flags select the counter size, otherwise the
+        resolution returned by :func:`CtrInfo.get_resolution`.
+
+    Raises:
+        :class:`ULException`
+    """
+    if flags & CInScanFlag.CTR16_BIT:
+        return 16
+    if flags & CInScanFlag.CTR32_BIT:
+        return 32
+    if flags & CInScanFlag.CTR64_BIT:
+        return 64
+    return ctr_info.get_resolution()
+
+
+def get_tick_seconds(tick_size):
+    # type: (CounterTickSize) -> float
+    """
+    Returns the duration of a counter tick in seconds.
+
+    Args:
+        tick_size (CounterTickSize): The tick size passed to
+            :func:`CtrDevice.c_config_scan`.
+
+    Returns:
+        float:
+
+        The tick duration in seconds.
+    """
+    # Tick size names encode the duration, e.g. TICK_20PT83ns, TICK_2000ns
+    name = CounterTickSize(tick_size).name
+    return float(name[5:-2].replace('PT', '.')) * 1e-9
+
+
+def unwrap_counts(counts, resolution, bidirectional=False):
+    # type: (ndarray, int, bool) -> ndarray
+    """
+    Removes the rollovers from counter values.
+
+    Args:
+        counts (ndarray): The counter values, one column per counter.
+        resolution (int): The number of bits of the counter values; see
+            :func:`get_scan_resolution`.
+        bidirectional (Optional[bool]): If True, as for encoders, the
+            counters may count down, and changes of more than half the counter
+            range between samples are taken as a rollover in the other
+            direction. The default is False.
+
+    Returns:
+        ndarray:
+
+        The int64 counts, continuing past the counter range.
+    """
+    return CounterUnwrapper(resolution, bidirectional).unwrap(counts)
+
+
+def counts_to_position(counts, counts_per_revolution,
+                       units_per_revolution=1.0):
+    # type: (ndarray, float, float) -> ndarray
+    """
+    Converts unwrapped encoder counts to position.
+
+    Args:
+        counts (ndarray): The unwrapped counts.
+        counts_per_revolution (float): The number of counts per revolution in
+            the configured encoder mode, for instance four times the number
+            of lines for :class:`~CounterMeasurementMode.ENCODER_X4`.
+        units_per_revolution (Optional[float]): The position units per
+            revolution, such as 360 for degrees; the default of 1.0 returns
+            revolutions.
+
+    Returns:
+        ndarray:
+
+        The float64 positions.
+    """
+    return np.asarray(counts) * (units_per_revolution
+                                 / float(counts_per_revolution))
+
+
+def sliding_velocity(position, rate, window=1):
+    # type: (ndarray, float, int) -> ndarray
+    """
+    Computes the rate of change of each column over a sliding window.
+
+    Args:
+        position (ndarray): The positions, one row per sample.
+        rate (float): The sample rate in samples per second.
+        window (Optional[int]): The number of sample intervals the change is
+            measured over; longer windows reduce the quantization noise of
+            slow encoders. The default is 1.
+
+    Returns:
+        ndarray:
+
+        The float64 change per second, aligned with position; the first
+        window rows, which lack history, are NaN.
+    """
+    return _difference(np.asarray(position, dtype=np.float64), None, rate,
+                       window)
+
+
+def sliding_acceleration(position, rate, window=1):
+    # type: (ndarray, float, int) -> ndarray
+    """
+    Computes the second derivative of each column, applying
+    :func:`sliding_velocity` twice with the same window.
+
+    Args:
+        position (ndarray): The positions, one row per sample.
+        rate (float): The sample rate in samples per second.
+        window (Optional[int]): The number of sample intervals each change is
+            measured over; the default is 1.
+
+    Returns:
+        ndarray:
+
+        The float64 acceleration, aligned with position; the first
+        2 * window rows are NaN.
+    """
+    return sliding_velocity(sliding_velocity(position, rate, window), rate,
+                            window)
+
+
+def ticks_to_seconds(ticks, tick_size):
+    # type: (ndarray, CounterTickSize) -> ndarray
+    """
+    Converts period, pulse width or timing measurements from ticks to
+    seconds.
+
+    Args:
+        ticks (ndarray): The measurements in ticks.
+        tick_size (CounterTickSize): The tick size passed to
+            :func:`CtrDevice.c_config_scan`.
+
+    Returns:
+        ndarray:
+
+        The float64 durations in seconds.
+    """
+    return np.asarray(ticks, dtype=np.float64) * get_tick_seconds(tick_size)
+
+
+def period_to_frequency(ticks, tick_size,
+                        measurement_mode=CounterMeasurementMode.PERIOD_X1):
+    # type: (ndarray, CounterTickSize, CounterMeasurementMode) -> ndarray
+    """
+    Converts period measurements to frequency.
+
+    Args:
+        ticks (ndarray): The period measurements in ticks.
+        tick_size (CounterTickSize): The tick size passed to
+            :func:`CtrDevice.c_config_scan`.
+        measurement_mode (Optional[CounterMeasurementMode]): The measurement
+            mode passed to :func:`CtrDevice.c_config_scan`; with
+            :class:`~CounterMeasurementMode.PERIOD_X10`, PERIOD_X100 or
+            PERIOD_X1000 each measurement spans that many periods.
+
+    Returns:
+        ndarray:
+
+        The float64 frequencies in Hz; NaN where no period was measured.
+    """
+    periods = 1
+    for mode, count in ((CounterMeasurementMode.PERIOD_X10, 10),
+                        (CounterMeasurementMode.PERIOD_X100, 100),
+                        (CounterMeasurementMode.PERIOD_X1000, 1000)):
+        if measurement_mode & mode:
+            periods = count
+    seconds = ticks_to_seconds(ticks, tick_size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(seconds > 0, periods / seconds, np.nan)
+
+
+def pulse_width_to_frequency(high_ticks, low_ticks, tick_size):
+    # type: (ndarray, ndarray, CounterTickSize) -> tuple[ndarray, ndarray]
+    """
+    Converts the high and low pulse widths of a signal, measured by two
+    counters configured for :class:`~CounterMeasurementType.PULSE_WIDTH`
+    with opposite edges, to frequency and duty cycle.
+
+    Args:
+        high_ticks (ndarray): The high pulse widths in ticks.
+        low_ticks (ndarray): The low pulse widths in ticks.
+        tick_size (CounterTickSize): The tick size passed to
+            :func:`CtrDevice.c_config_scan`.
+
+    Returns:
+        ndarray, ndarray:
+
+        The float64 frequencies in Hz and duty cycles from 0 to 1; NaN
+        where no pulse was measured.
+    """
+    high = ticks_to_seconds(high_ticks, tick_size)
+    period = high + ticks_to_seconds(low_ticks, tick_size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = period > 0
+        return (np.where(valid, 1 / period, np.nan),
+                np.where(valid, high / period, np.nan))
+
+
+class CounterUnwrapper:
+    """
+    Removes counter rollovers from successive blocks of a counter scan,
+    carrying the last value of each counter from one block to the next.
+
+    Args:
+        resolution (int): The number of bits of the counter values; see
+            :func:`get_scan_resolution`.
+        bidirectional (Optional[bool]): If True, as for encoders, changes of
+            more than half the counter range between samples are taken as a
+            rollover in the other direction. The default is False.
+
+    Raises:
+        :class:`ULException`: The resolution is invalid.
+    """
+    def __init__(self, resolution, bidirectional=False):
+        if not 0 < resolution <= 64:
+            raise ULException(ULError.BAD_ARG)
+        self.__mask = np.uint64((1 << resolution) - 1)
+        self.__half = np.uint64(1 << (resolution - 1))
+        self.__modulus = 1 << resolution
+        self.__bidirectional = bidirectional
+        self.__last = None
+        self.__offset = None
+
+    def reset(self):
+        # type: () -> None
+        """Restarts unwrapping, as for a new scan."""
+        self.__last = None
+        self.__offset = None
+
+    def unwrap(self, counts):
+        # type: (ndarray) -> ndarray
+        """
+        Unwraps the next block of counter values.
+
+        Args:
+            counts (ndarray): The counter values, one column per counter;
+                a one dimensional array holds a single counter.
+
+        Returns:
+            ndarray:
+
+            The int64 counts, continuing past the counter range and from the
+            previous block.
+        """
+        counts = np.asarray(counts).astype(np.uint64) & self.__mask
+        if not len(counts):
+            return counts.astype(np.int64)
+        if self.__last is None:
+            self.__last = counts[0]
+            self.__offset = counts[0].astype(np.int64)
+        # Unsigned differences wrap modulo 2**64; masking reduces them
+        # modulo the counter range.
+        previous = np.concatenate((self.__last[np.newaxis], counts[:-1]))
+        steps = (counts - previous) & self.__mask
+        if self.__bidirectional:
+            signed = steps.astype(np.int64)
+            if self.__modulus < 1 << 64:
+                # steps - modulus, without a constant overflowing int64
+                half = self.__half.astype(np.int64)
+                signed = np.where(steps >= self.__half, signed - half - half,
+                                  signed)
+            steps = signed
+        else:
+            steps = steps.astype(np.int64)
+        total = np.cumsum(steps, axis=0) + self.__offset
+        self.__last = counts[-1]
+        self.__offset = total[-1]
+        return total
+
+
+class EncoderProcessor:
+    """
+    Converts successive blocks of an encoder scan, such as those of
+    :func:`CtrDevice.stream`, to position, velocity and acceleration,
+    keeping the history needed for continuous results across blocks.
+
+    Args:
+        counts_per_revolution (float): The number of counts per revolution in
+            the configured encoder mode.
+        rate (float): The scan rate in samples per second per counter.
+        resolution (int): The number of bits of the counter values; see
+            :func:`get_scan_resolution`.
+        window (Optional[int]): The number of sample intervals velocity and
+            acceleration are computed over; the default is 1.
+        units_per_revolution (Optional[float]): The position units per
+            revolution; the default of 1.0 returns revolutions.
+    """
+    def __init__(self, counts_per_revolution, rate, resolution, window=1,
+                 units_per_revolution=1.0):
+        self.__unwrapper = CounterUnwrapper(resolution, bidirectional=True)
+        self.__scale = units_per_revolution / float(counts_per_revolution)
+        self.__rate = rate
+        self.__window = window
+        self.__position_history = None
+        self.__velocity_history = None
+
+    def reset(self):
+        # type: () -> None
+        """Restarts processing, as for a new scan."""
+        self.__unwrapper.reset()
+        self.__position_history = None
+        self.__velocity_history = None
+
+    def process(self, counts):
+        # type: (ndarray) -> tuple[ndarray, ndarray, ndarray]
+        """
+        Processes the next block of counter values.
+
+        Args:
+            counts (ndarray): The counter values, one column per encoder.
+
+        Returns:
+            ndarray, ndarray, ndarray:
+
+            The float64 position, velocity (units per second) and acceleration
+            (units per second squared) of each encoder, aligned with counts.
+            Values that need samples from before the start of the scan are
+            NaN.
+        """
+        position = self.__unwrapper.unwrap(counts) * self.__scale
+        velocity = _difference(position, self.__position_history,
+                               self.__rate, self.__window)
+        acceleration = _difference(velocity, self.__velocity_history,
+                                   self.__rate, self.__window)
+        self.__position_history = _tail(self.__position_history, position,
+                                        self.__window)
+        self.__velocity_history = _tail(self.__velocity_history, velocity,
+                                        self.__window)
+        return position, velocity, acceleration
+
+
+def _difference(values, history, rate, window):
+    # (values[i] - values[i - window]) * rate / window, using the rows of
+    # history before values; NaN where no earlier row exists
+    if window < 1:
+        raise ULException(ULError.BAD_ARG)
+    if history is None:
+        history = np.full((window,) + values.shape[1:], np.nan)
+    extended = np.concatenate((history[-window:], values))
+    if len(extended) < len(values) + window:
+        padding = np.full((len(values) + window - len(extended),)
+                          + values.shape[1:], np.nan)
+        extended = np.concatenate((padding, extended))
+    return (extended[window:] - extended[:-window]) * (rate / float(window))
+
+
+def _tail(history, values, window):
+    # The last window rows of history followed by values
+    if history is not None and len(values) < window:
+        values = np.concatenate((history, values))
+    return values[-window:].copy()
@@ -14,6 +14,8 @@ from .ul_enums import (CounterRegisterType, CounterDebounceMode,
                        CounterTickSize, CConfigScanFlag, TriggerType,
                        ScanStatus, WaitType, ScanOption, CInScanFlag)
 from .ul_structs import TransferStatus
+from .buffer_management import create_int_ndarray_buffer
+from .scan_stream import ScanStream, _stream_buffer_blocks
 
 
 class CtrDevice:
@@ -161,7 +163,8 @@ class CtrDevice:
                 bit-wise operations) specifying the conditioning
                 applied to the data before it is returned.
             data (Array[int]): The buffer to receive the data being read. Use
-                :class:`create_int_buffer` to create the buffer.
+                :class:`create_int_buffer` or
+                :class:`create_int_ndarray_buffer` to create the buffer.
 
         Returns:
             float:
@@ -179,6 +182,54 @@ class CtrDevice:
             raise ULException(err)
         return rate.value
 
+    def stream(self, low_counter_num, high_counter_num, rate, block_size,
+               options=ScanOption.DEFAULTIO, flags=CInScanFlag.DEFAULT,
+               buffer_blocks=None):
+        # type: (int, int, float, int, ScanOption, CInScanFlag, int) -> ScanStream
+        """
+        Starts a CONTINUOUS scan of a range of counters on the device
+        referenced by the :class:`CtrDevice` object, and returns an iterator
+        over fixed-size blocks of the acquired data.
+
+        The scan buffer is allocated internally and holds a whole number of
+        blocks. Iterating the returned stream yields
+        (block_index, ndarray[block_size, number_of_counters],
+        first_sample_index) tuples until the stream is closed. Requires NumPy.
+
+        Args:
+            low_counter_num (int): The first counter in the scan.
+            high_counter_num (int): The last counter in the scan.
+            rate (float): The rate in samples per second per counter.
+            block_size (int): The number of samples per counter in each block.
+            options (Optional[ScanOption]): One or more scan options
+                (suitable for bit-wise operations) specifying the
+                optional conditions that will be applied to the scan;
+                :class:`~ScanOption.CONTINUOUS` is always added.
+            flags (Optional[CInScanFlag]): One or more flag values (suitable
+                for bit-wise operations) specifying the conditioning
+                applied to the data before it is returned.
+            buffer_blocks (Optional[int]): The number of blocks the scan
+                buffer holds; by default the buffer holds at least one second
+                of data.
+
+        Returns:
+            ScanStream:
+
+            The block iterator; closing it stops the scan.
+
+        Raises:
+            :class:`ULException`
+        """
+        number_of_counters = high_counter_num - low_counter_num + 1
+        blocks = _stream_buffer_blocks(rate, block_size, buffer_blocks)
+        data = create_int_ndarray_buffer(number_of_counters,
+                                         blocks * block_size)
+        rate = self.c_in_scan(low_counter_num, high_counter_num,
+                              blocks * block_size, rate,
+                              options | ScanOption.CONTINUOUS, flags, data)
+        return ScanStream(data, self.get_scan_status, self.scan_stop, rate,
+                          block_size)
+
     def c_config_scan(self,
                       counter_number,  # type: int
                       measurement_type,  # type: CounterMeasurementType
@@ -3,24 +3,37 @@ Created on Feb 14 2018
 
 @author: MCC
 """
+from importlib import import_module
 from ctypes import c_int, c_byte, c_longlong, c_ulonglong, py_object, byref
 from .ul_enums import DaqEventType, MemRegion, ULError, InterfaceType
 from .ul_structs import DaqDeviceDescriptor
 from .ul_exception import ULException
 from .ul_c_interface import lib, EventParams
 from .ul_c_interface import (InterfaceCallbackProcType,
-                             interface_event_callback_function, DevConfigItem)
+                             interface_event_callback_function,
+                             interface_event_dispatch_function, DevConfigItem)
 from .daq_device_info import DaqDeviceInfo
+from .daq_device_discovery import get_daq_device_inventory_cache
 from .daq_device_config import DaqDeviceConfig
-from .ai_device import AiDevice
-from .ao_device import AoDevice
-from .dio_device import DioDevice
-from .ctr_device import CtrDevice
-from .tmr_device import TmrDevice
-from .daqi_device import DaqiDevice
-from .daqo_device import DaqoDevice
+from .daq_device_capabilities import (collect_capabilities,
+                                      get_capabilities_cache_dir,
+                                      get_firmware_version,
+                                      load_cached_capabilities,
+                                      save_cached_capabilities)
 from .utils import enum_mask_to_list
 
+# The module and class of each subsystem, and the DaqDeviceInfo method
+# telling whether the device has it. The keys are also the subsystem fields
+# of DaqDeviceCapabilities. The modules are only imported when the subsystem
+# is first requested.
+_SUBSYSTEMS = {'ai': ('ai_device', 'AiDevice', '_has_ai_device'),
+               'ao': ('ao_device', 'AoDevice', '_has_ao_device'),
+               'dio': ('dio_device', 'DioDevice', '_has_dio_device'),
+               'ctr': ('ctr_device', 'CtrDevice', '_has_ctr_device'),
+               'tmr': ('tmr_device', 'TmrDevice', '_has_tmr_device'),
+               'daqi': ('daqi_device', 'DaqiDevice', '_has_daqi_device'),
+               'daqo': ('daqo_device', 'DaqoDevice', '_has_daqo_device')}
+
 
 class DaqDevice:
     """
@@ -43,39 +56,55 @@ class DaqDevice:
 
         self.__dev_info = DaqDeviceInfo(self._handle)
         self.__dev_config = DaqDeviceConfig(self._handle)
+        self.__capabilities = None
 
-        self.__ai_device = None
-        if self.__dev_info._has_ai_device():
-            self.__ai_device = AiDevice(self._handle)
+        # The subsystems present on the device, probed together on the first
+        # get_*_device() call, and the subsystem objects created so far.
+        self.__has_subsystem = None
+        self.__subsystems = {}
 
-        self.__ao_device = None
-        if self.__dev_info._has_ao_device():
-            self.__ao_device = AoDevice(self._handle)
+        # create dictionaries to prevent garbage collection of the items stored
+        # in the dictionary
+        self.__event_params = {}
+        self.__interface_callbacks = {}
+        self.__event_dispatchers = {}
 
-        self.__dio_device = None
-        if self.__dev_info._has_dio_device():
-            self.__dio_device = DioDevice(self._handle)
+    @classmethod
+    def open_by_unique_id(cls, unique_id, interface_type=InterfaceType.ANY):
+        # type: (str, InterfaceType) -> DaqDevice
+        """
+        Creates a :class:`DaqDevice` object for the device with the specified
+        unique ID, such as a serial number or the MAC address of an Ethernet
+        device.
 
-        self.__ctr_device = None
-        if self.__dev_info._has_ctr_device():
-            self.__ctr_device = CtrDevice(self._handle)
+        The descriptor is looked up in the shared :class:`DaqDeviceInventory`
+        returned by :func:`get_daq_device_inventory_cache`, so devices are
+        only rediscovered when the cached inventory has expired or does not
+        contain the device.
 
-        self.__tmr_device = None
-        if self.__dev_info._has_tmr_device():
-            self.__tmr_device = TmrDevice(self._handle)
+        Args:
+            unique_id (str): The unique ID of the device; the comparison
+                ignores case.
+            interface_type (Optional[InterfaceType]): One or more of the
+                :class:`InterfaceType` attributes (suitable for bit-wise
+                operations) specifying which physical interfaces to search;
+                the default is :class:`~InterfaceType.ANY`.
 
-        self.__daqi_device = None
-        if self.__dev_info._has_daqi_device():
-            self.__daqi_device = DaqiDevice(self._handle)
+        Returns:
+            DaqDevice:
 
-        self.__daqo_device = None
-        if self.__dev_info._has_daqo_device():
-            self.__daqo_device = DaqoDevice(self._handle)
+            The DaqDevice object; it is not connected.
 
-        # create dictionaries to prevent garbage collection of the items stored
-        # in the dictionary
-        self.__event_params = {}
-        self.__interface_callbacks = {}
+        Raises:
+            :class:`ULException`: The device was not found
+                (:class:`~ULError.DEV_NOT_FOUND`), or the inventory could not
+                be obtained.
+        """
+        descriptor = get_daq_device_inventory_cache().find_by_unique_id(
+            unique_id, interface_type)
+        if descriptor is None:
+            raise ULException(ULError.DEV_NOT_FOUND)
+        return cls(descriptor)
 
     def __del__(self):
         if self._handle is not None:
@@ -207,6 +236,60 @@ class DaqDevice:
         """
         return self.__dev_config
 
+    def get_capabilities(self, use_cache=True, refresh=False):
+        # type: (bool, bool) -> DaqDeviceCapabilities
+        """
+        Gets a snapshot of the capabilities of the device
+        referenced by the :class:`DaqDevice` object.
+
+        Every info item of every subsystem is read once; later calls return
+        the same snapshot, so reconnecting or validating scan parameters
+        against it does not communicate with the device. When use_cache is
+        True the snapshot is also stored in the directory returned by
+        :func:`get_capabilities_cache_dir`, keyed by the product ID, unique
+        ID and main firmware version, and a new :class:`DaqDevice` for the
+        same device only reads the firmware version. Snapshots are not cached
+        on disk when the firmware version cannot be read, for example because
+        the device is not connected.
+
+        Args:
+            use_cache (Optional[bool]): Load the snapshot from, and save it
+                to, the on-disk cache; the default is True.
+            refresh (Optional[bool]): Read the capabilities from the device
+                even if a snapshot is available; the default is False.
+
+        Returns:
+            DaqDeviceCapabilities:
+
+            The immutable, picklable capability snapshot.
+
+        Raises:
+            :class:`ULException`
+        """
+        if self.__capabilities is not None and not refresh:
+            return self.__capabilities
+
+        # The firmware version is only read here for the cache key;
+        # otherwise collect_capabilities() reads it with the snapshot.
+        firmware_version = None
+        if use_cache:
+            firmware_version = get_firmware_version(self)
+            use_cache = bool(firmware_version)
+        cache_dir = get_capabilities_cache_dir()
+        capabilities = None
+        if use_cache and not refresh:
+            descriptor = self.get_descriptor()
+            capabilities = load_cached_capabilities(
+                cache_dir, descriptor.product_id, descriptor.unique_id,
+                firmware_version)
+        if capabilities is None:
+            capabilities = collect_capabilities(self, firmware_version)
+            if use_cache:
+                save_cached_capabilities(cache_dir, capabilities)
+
+        self.__capabilities = capabilities
+        return capabilities
+
     def get_ai_device(self):
         # type: () -> AiDevice
         """
@@ -217,7 +300,7 @@ class DaqDevice:
         Returns:
             AiDevice: The object used to access the AI subsystem.
         """
-        return self.__ai_device
+        return self.__get_subsystem('ai')
 
     def get_ao_device(self):
         # type: () -> AoDevice
@@ -229,7 +312,7 @@ class DaqDevice:
         Returns:
            AoDevice: The object used to access the AO subsystem.
         """
-        return self.__ao_device
+        return self.__get_subsystem('ao')
 
     def get_dio_device(self):
         # type: () -> DioDevice
@@ -241,7 +324,7 @@ class DaqDevice:
         Returns:
             DioDevice: The object used to access the DIO subsystem.
         """
-        return self.__dio_device
+        return self.__get_subsystem('dio')
 
     def get_ctr_device(self):
         # type: () -> CtrDevice
@@ -253,7 +336,7 @@ class DaqDevice:
         Returns:
             CtrDevice: The object used to access the counter subsystem.
         """
-        return self.__ctr_device
+        return self.__get_subsystem('ctr')
 
     def get_tmr_device(self):
         # type: () -> TmrDevice
@@ -265,7 +348,7 @@ class DaqDevice:
         Returns:
             TmrDevice: The object used to access the timer subsystem.
         """
-        return self.__tmr_device
+        return self.__get_subsystem('tmr')
 
     def get_daqi_device(self):
         # type: () -> DaqiDevice
@@ -277,7 +360,7 @@ class DaqDevice:
         Returns:
             DaqiDevice: The object used to access the DAQ input subsystem.
         """
-        return self.__daqi_device
+        return self.__get_subsystem('daqi')
 
     def get_daqo_device(self):
         # type: () -> DaqoDevice
@@ -289,11 +372,37 @@ class DaqDevice:
         Returns:
             DaqoDevice: The object used to access the DAQ output subsystem.
         """
-        return self.__daqo_device
+        return self.__get_subsystem('daqo')
+
+    def __get_subsystem(self, subsystem):
+        try:
+            return self.__subsystems[subsystem]
+        except KeyError:
+            pass
+
+        if self.__has_subsystem is None:
+            self.__has_subsystem = self.__probe_subsystems()
+        device = None
+        if self.__has_subsystem[subsystem]:
+            module_name, class_name, _ = _SUBSYSTEMS[subsystem]
+            module = import_module('.' + module_name, __package__)
+            device = getattr(module, class_name)(self._handle)
+        self.__subsystems[subsystem] = device
+        return device
+
+    def __probe_subsystems(self):
+        # A capability snapshot already knows the subsystems; otherwise ask
+        # the device for all of them at once.
+        capabilities = self.__capabilities
+        if capabilities is not None:
+            return dict((name, getattr(capabilities, name) is not None)
+                        for name in _SUBSYSTEMS)
+        return dict((name, getattr(self.__dev_info, has_device)())
+                    for name, (_, _, has_device) in _SUBSYSTEMS.items())
 
     def enable_event(self, event_types, event_parameter,
-                     event_callback_function, user_data):
-        # type: (DaqEventType, int, function, object) -> None
+                     event_callback_function, user_data, dispatcher=None):
+        # type: (DaqEventType, int, function, object, EventDispatcher) -> None
         """
         Binds one or more event conditions to a callback function for the device
         referenced by the :class:`DaqDevice` object.
@@ -309,17 +418,40 @@ class DaqDevice:
                 executed on the event condition.
             user_data (object): Data (defined by the user) to be passed to the
                 callback function.
+            dispatcher (Optional[EventDispatcher]): If specified, the UL
+                callback thread only queues the events and the callback
+                function is executed on the dispatcher's worker thread.
+                Calling enable_event again with the same dispatcher for an
+                enabled event type adds another callback for that event type.
 
         Raises:
             :class:`ULException`
         """
-        event_parameter = c_ulonglong(event_parameter)
         event_list = enum_mask_to_list(DaqEventType, event_types)
+        subscribed_types = event_types
         event_params = EventParams()
-        event_params.user_data = py_object(user_data)
-        event_params.user_callback = py_object(event_callback_function)
-        interface_callback = InterfaceCallbackProcType(
-            interface_event_callback_function)
+        if dispatcher is None:
+            event_params.user_data = py_object(user_data)
+            event_params.user_callback = py_object(event_callback_function)
+            interface_callback = InterfaceCallbackProcType(
+                interface_event_callback_function)
+        else:
+            # Event types already enabled with this dispatcher only need
+            # the additional subscriber.
+            event_list = [event for event in event_list if
+                          self.__event_dispatchers.get(event) is not dispatcher]
+            if not event_list:
+                dispatcher.subscribe(subscribed_types,
+                                     event_callback_function, user_data,
+                                     self._handle)
+                return
+            event_types = 0
+            for event in event_list:
+                event_types |= event
+            event_params.user_data = py_object(None)
+            event_params.user_callback = py_object(dispatcher.post)
+            interface_callback = InterfaceCallbackProcType(
+                interface_event_dispatch_function)
 
         # This code has been added to prevent garbage collection and it should
         # not be removed
@@ -330,12 +462,23 @@ class DaqDevice:
 
         err = lib.ulEnableEvent(c_longlong(self._handle),
                                 event_types,
-                                event_parameter,
+                                c_ulonglong(event_parameter),
                                 interface_callback,
                                 event_params)
         if err != 0:
             raise ULException(err)
 
+        # Subscribe only once the events are enabled, so a failed call
+        # leaves no callback behind
+        if dispatcher is not None:
+            dispatcher.subscribe(subscribed_types, event_callback_function,
+                                 user_data, self._handle)
+        for event in event_list:
+            if dispatcher is None:
+                self.__event_dispatchers.pop(event, None)
+            else:
+                self.__event_dispatchers[event] = dispatcher
+
     def disable_event(self, event_types):
         # type: (DaqEventType) -> None
         """
@@ -355,6 +498,12 @@ class DaqDevice:
         if err != 0:
             raise ULException(err)
 
+        for event in enum_mask_to_list(DaqEventType, event_types):
+            dispatcher = self.__event_dispatchers.pop(event, None)
+            if dispatcher is not None:
+                # Only this device's callbacks; the dispatcher may be shared
+                dispatcher.unsubscribe(event, handle=self._handle)
+
     def mem_read(self, mem_region_type, address, count):
         # type: (MemRegion, int, int) -> bytearray
         """
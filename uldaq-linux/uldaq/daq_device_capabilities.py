@@ -0,0 +1,457 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+Capability snapshots. Every info item of a device is read once and stored in
+immutable, picklable named tuples, which can be cached on disk and used to
+validate scan parameters without talking to the device.
+"""
+from collections import namedtuple
+from os import environ, makedirs, path, remove
+try:
+    from os import replace
+except ImportError:
+    # Python 2; rename also replaces an existing file on Linux
+    from os import rename as replace
+from pickle import dump, load, HIGHEST_PROTOCOL, PicklingError
+from tempfile import NamedTemporaryFile
+from .ul_enums import (AiInputMode, DigitalDirection, DevVersionType,
+                       ULError)
+from .ul_exception import ULException
+
+# Incremented whenever the layout of the snapshot changes, so that snapshots
+# cached by an older version of uldaq are ignored.
+CAPABILITIES_FORMAT_VERSION = 1
+
+# Errors returned for info items that do not apply to a device; the item is
+# stored as None instead of failing the whole snapshot.
+_UNSUPPORTED_ITEM_ERRORS = (ULError.BAD_INFO_ITEM, ULError.BAD_CONFIG_ITEM,
+                            ULError.CONFIG_NOT_SUPPORTED, ULError.BAD_DEV_TYPE)
+
+
+class _FrozenDict(dict):
+    """A dict that cannot be modified after it is created."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError('capability snapshots are read-only')
+
+    __setitem__ = __delitem__ = __readonly
+    clear = pop = popitem = setdefault = update = __readonly
+
+
+class _ScanCapabilities:
+    """Scan parameter checks shared by the capabilities of the subsystems
+    that support paced scans."""
+    __slots__ = ()
+
+    def check_scan_rate(self, rate, number_of_channels=1):
+        # type: (float, int) -> None
+        """
+        Checks a scan rate against the rate and throughput limits of the
+        subsystem.
+
+        Args:
+            rate (float): The scan rate in samples per channel per second.
+            number_of_channels (Optional[int]): The number of channels in
+                the scan.
+
+        Raises:
+            :class:`ULException`: The rate is not supported
+                (:class:`~ULError.BAD_RATE`).
+        """
+        if rate <= 0 or (self.min_scan_rate and rate < self.min_scan_rate):
+            raise ULException(ULError.BAD_RATE)
+        if self.max_scan_rate and rate > self.max_scan_rate:
+            raise ULException(ULError.BAD_RATE)
+        if (self.max_throughput
+                and rate * number_of_channels > self.max_throughput):
+            raise ULException(ULError.BAD_RATE)
+
+    def check_scan_options(self, options):
+        # type: (ScanOption) -> None
+        """
+        Checks that every option in a scan options mask is supported by the
+        subsystem.
+
+        Args:
+            options (ScanOption): One or more :class:`ScanOption` attributes
+                (suitable for bit-wise operations).
+
+        Raises:
+            :class:`ULException`: An option is not supported
+                (:class:`~ULError.BAD_OPTION`).
+        """
+        supported = 0
+        for option in self.scan_options or ():
+            supported |= option
+        if options & ~supported:
+            raise ULException(ULError.BAD_OPTION)
+
+
+class AiCapabilities(_ScanCapabilities, namedtuple(
+        'AiCapabilities',
+        'num_chans num_chans_by_mode num_chans_by_type resolution '
+        'min_scan_rate max_scan_rate max_throughput max_burst_rate '
+        'max_burst_throughput fifo_size scan_options has_pacer chan_types '
+        'ranges trigger_types max_queue_length queue_types '
+        'chan_queue_limitations supports_iepe')):
+    """
+    The analog input capabilities of a device; each field holds the value
+    returned by the :class:`AiInfo` method of the same name.
+    The num_chans_by_mode, ranges and max_queue_length fields map each
+    :class:`AiInputMode` to its value, and num_chans_by_type maps each
+    supported :class:`AiChanType` to its number of channels.
+    """
+    __slots__ = ()
+
+    def check_range(self, input_mode, analog_range):
+        # type: (AiInputMode, Range) -> None
+        """
+        Checks that a range is supported for an input mode.
+
+        Args:
+            input_mode (AiInputMode): The input mode.
+            analog_range (Range): The range.
+
+        Raises:
+            :class:`ULException`: The range is not supported
+                (:class:`~ULError.BAD_RANGE`).
+        """
+        if analog_range not in self.ranges.get(input_mode, ()):
+            raise ULException(ULError.BAD_RANGE)
+
+
+class AoCapabilities(_ScanCapabilities, namedtuple(
+        'AoCapabilities',
+        'num_chans resolution min_scan_rate max_scan_rate max_throughput '
+        'fifo_size scan_options has_pacer ranges trigger_types')):
+    """
+    The analog output capabilities of a device; each field holds the value
+    returned by the :class:`AoInfo` method of the same name.
+    """
+    __slots__ = ()
+
+    def check_range(self, analog_range):
+        # type: (Range) -> None
+        """
+        Checks that an output range is supported.
+
+        Args:
+            analog_range (Range): The range.
+
+        Raises:
+            :class:`ULException`: The range is not supported
+                (:class:`~ULError.BAD_RANGE`).
+        """
+        if analog_range not in self.ranges:
+            raise ULException(ULError.BAD_RANGE)
+
+
+"""A named tuple with the port_type, port_io_type and number_of_bits of a
+digital port, as returned by :func:`DioInfo.get_port_info`."""
+DioPortCapabilities = namedtuple('DioPortCapabilities',
+                                 'port_type port_io_type number_of_bits')
+
+
+class DioCapabilities(namedtuple(
+        'DioCapabilities',
+        'num_ports port_types port_info has_pacer min_scan_rate '
+        'max_scan_rate max_throughput fifo_size scan_options trigger_types')):
+    """
+    The digital I/O capabilities of a device; each field holds the value
+    returned by the :class:`DioInfo` method of the same name.
+    port_info maps each :class:`DigitalPortType` to a
+    :class:`DioPortCapabilities`, and the scan fields map each
+    :class:`DigitalDirection` to its value.
+    """
+    __slots__ = ()
+
+
+class CtrCapabilities(_ScanCapabilities, namedtuple(
+        'CtrCapabilities',
+        'num_ctrs measurement_types measurement_modes register_types '
+        'resolution min_scan_rate max_scan_rate max_throughput fifo_size '
+        'scan_options has_pacer trigger_types')):
+    """
+    The counter capabilities of a device; each field holds the value
+    returned by the :class:`CtrInfo` method of the same name.
+    measurement_types maps each counter number to its measurement types, and
+    measurement_modes maps each of those types to its measurement modes.
+    """
+    __slots__ = ()
+
+
+class TmrCapabilities(namedtuple(
+        'TmrCapabilities',
+        'num_tmrs timer_types min_frequency max_frequency')):
+    """
+    The timer capabilities of a device; each field holds the value returned
+    by the :class:`TmrInfo` method of the same name. timer_types maps each
+    timer number to its :class:`TimerType`.
+    """
+    __slots__ = ()
+
+
+class DaqiCapabilities(_ScanCapabilities, namedtuple(
+        'DaqiCapabilities',
+        'channel_types min_scan_rate max_scan_rate max_throughput fifo_size '
+        'scan_options trigger_types')):
+    """
+    The DAQ input capabilities of a device; each field holds the value
+    returned by the :class:`DaqiInfo` method of the same name.
+    """
+    __slots__ = ()
+
+
+class DaqoCapabilities(_ScanCapabilities, namedtuple(
+        'DaqoCapabilities',
+        'channel_types min_scan_rate max_scan_rate max_throughput fifo_size '
+        'scan_options trigger_types')):
+    """
+    The DAQ output capabilities of a device; each field holds the value
+    returned by the :class:`DaqoInfo` method of the same name.
+    """
+    __slots__ = ()
+
+
+class DaqDeviceCapabilities(namedtuple(
+        'DaqDeviceCapabilities',
+        'product_name product_id unique_id firmware_version event_types '
+        'ai ao dio ctr tmr daqi daqo')):
+    """
+    A snapshot of every capability of a device, returned by
+    :func:`DaqDevice.get_capabilities`. The subsystem fields are None for the
+    subsystems the device does not have.
+
+    The snapshot is immutable and picklable; reading it never communicates
+    with the device.
+    """
+    __slots__ = ()
+
+
+def _item(getter, *args):
+    # Reads one info item, or returns None if the device does not support it
+    try:
+        value = getter(*args)
+    except ULException as e:
+        if e.error_code in _UNSUPPORTED_ITEM_ERRORS:
+            return None
+        raise
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _by_key(getter, keys):
+    return _FrozenDict((key, _item(getter, key)) for key in keys)
+
+
+def _ai_capabilities(info):
+    modes = tuple(AiInputMode)
+    chan_types = _item(info.get_chan_types) or ()
+    return AiCapabilities(
+        _item(info.get_num_chans),
+        _by_key(info.get_num_chans_by_mode, modes),
+        _by_key(info.get_num_chans_by_type, chan_types),
+        _item(info.get_resolution), _item(info.get_min_scan_rate),
+        _item(info.get_max_scan_rate), _item(info.get_max_throughput),
+        _item(info.get_max_burst_rate), _item(info.get_max_burst_throughput),
+        _item(info.get_fifo_size), _item(info.get_scan_options),
+        _item(info.has_pacer), chan_types,
+        _by_key(info.get_ranges, modes), _item(info.get_trigger_types),
+        _by_key(info.get_max_queue_length, modes),
+        _item(info.get_queue_types), _item(info.get_chan_queue_limitations),
+        _item(info.supports_iepe))
+
+
+def _ao_capabilities(info):
+    return AoCapabilities(
+        _item(info.get_num_chans), _item(info.get_resolution),
+        _item(info.get_min_scan_rate), _item(info.get_max_scan_rate),
+        _item(info.get_max_throughput), _item(info.get_fifo_size),
+        _item(info.get_scan_options), _item(info.has_pacer),
+        _item(info.get_ranges), _item(info.get_trigger_types))
+
+
+def _dio_capabilities(info):
+    port_types = _item(info.get_port_types) or ()
+    port_info = {}
+    for port_type in port_types:
+        port = info.get_port_info(port_type)
+        port_info[port_type] = DioPortCapabilities(
+            port.port_type, port.port_io_type, port.number_of_bits)
+    directions = tuple(DigitalDirection)
+    return DioCapabilities(
+        _item(info.get_num_ports), port_types, _FrozenDict(port_info),
+        _by_key(info.has_pacer, directions),
+        _by_key(info.get_min_scan_rate, directions),
+        _by_key(info.get_max_scan_rate, directions),
+        _by_key(info.get_max_throughput, directions),
+        _by_key(info.get_fifo_size, directions),
+        _by_key(info.get_scan_options, directions),
+        _by_key(info.get_trigger_types, directions))
+
+
+def _ctr_capabilities(info):
+    num_ctrs = _item(info.get_num_ctrs) or 0
+    measurement_types = _by_key(info.get_measurement_types, range(num_ctrs))
+    all_types = set()
+    for types in measurement_types.values():
+        all_types.update(types or ())
+    return CtrCapabilities(
+        num_ctrs, measurement_types,
+        _by_key(info.get_measurement_modes, sorted(all_types)),
+        _item(info.get_register_types), _item(info.get_resolution),
+        _item(info.get_min_scan_rate), _item(info.get_max_scan_rate),
+        _item(info.get_max_throughput), _item(info.get_fifo_size),
+        _item(info.get_scan_options), _item(info.has_pacer),
+        _item(info.get_trigger_types))
+
+
+def _tmr_capabilities(info):
+    num_tmrs = _item(info.get_num_tmrs) or 0
+    return TmrCapabilities(
+        num_tmrs, _by_key(info.get_timer_type, range(num_tmrs)),
+        _item(info.get_min_frequency), _item(info.get_max_frequency))
+
+
+def _daqi_capabilities(info):
+    return DaqiCapabilities(
+        _item(info.get_channel_types), _item(info.get_min_scan_rate),
+        _item(info.get_max_scan_rate), _item(info.get_max_throughput),
+        _item(info.get_fifo_size), _item(info.get_scan_options),
+        _item(info.get_trigger_types))
+
+
+def _daqo_capabilities(info):
+    return DaqoCapabilities(
+        _item(info.get_channel_types), _item(info.get_min_scan_rate),
+        _item(info.get_max_scan_rate), _item(info.get_max_throughput),
+        _item(info.get_fifo_size), _item(info.get_scan_options),
+        _item(info.get_trigger_types))
+
+
+def get_firmware_version(daq_device):
+    # type: (DaqDevice) -> str
+    """Returns the main firmware version of a device, or an empty string if
+    it cannot be read (for example because the device is not connected)."""
+    try:
+        return daq_device.get_config().get_version(DevVersionType.FW_MAIN)
+    except ULException:
+        return ''
+
+
+def collect_capabilities(daq_device, firmware_version=None):
+    # type: (DaqDevice, str) -> DaqDeviceCapabilities
+    """
+    Reads every info item of a device into a :class:`DaqDeviceCapabilities`
+    snapshot.
+
+    Args:
+        daq_device (DaqDevice): The device.
+        firmware_version (Optional[str]): The main firmware version, if it
+            has already been read.
+
+    Returns:
+        DaqDeviceCapabilities:
+
+        The snapshot.
+
+    Raises:
+        :class:`ULException`
+    """
+    descriptor = daq_device.get_descriptor()
+    if firmware_version is None:
+        firmware_version = get_firmware_version(daq_device)
+
+    def subsystem(get_device, collect):
+        device = get_device()
+        return collect(device.get_info()) if device is not None else None
+
+    return DaqDeviceCapabilities(
+        descriptor.product_name, descriptor.product_id, descriptor.unique_id,
+        firmware_version, _item(daq_device.get_info().get_event_types),
+        subsystem(daq_device.get_ai_device, _ai_capabilities),
+        subsystem(daq_device.get_ao_device, _ao_capabilities),
+        subsystem(daq_device.get_dio_device, _dio_capabilities),
+        subsystem(daq_device.get_ctr_device, _ctr_capabilities),
+        subsystem(daq_device.get_tmr_device, _tmr_capabilities),
+        subsystem(daq_device.get_daqi_device, _daqi_capabilities),
+        subsystem(daq_device.get_daqo_device, _daqo_capabilities))
+
+
+def get_capabilities_cache_dir():
+    # type: () -> str
+    """
+    Gets the directory in which capability snapshots are cached: the
+    ULDAQ_CACHE_DIR environment variable if it is set, otherwise the uldaq
+    directory in the user's cache directory (XDG_CACHE_HOME or ~/.cache).
+
+    Returns:
+        str:
+
+        The directory path.
+    """
+    cache_dir = environ.get('ULDAQ_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    cache_home = (environ.get('XDG_CACHE_HOME')
+                  or path.join(path.expanduser('~'), '.cache'))
+    return path.join(cache_home, 'uldaq')
+
+
+def _cache_file_path(cache_dir, product_id, unique_id, firmware_version):
+    key = '{:04x}_{}_{}'.format(product_id, unique_id, firmware_version)
+    key = ''.join(c if c.isalnum() or c in '._-' else '_' for c in key)
+    return path.join(cache_dir, key + '.pickle')
+
+
+def load_cached_capabilities(cache_dir, product_id, unique_id,
+                             firmware_version):
+    # type: (str, int, str, str) -> DaqDeviceCapabilities
+    """Returns the snapshot cached for a device, or None if there is no
+    usable cached snapshot."""
+    file_path = _cache_file_path(cache_dir, product_id, unique_id,
+                                 firmware_version)
+    try:
+        with open(file_path, 'rb') as cache_file:
+            version, capabilities = load(cache_file)
+    except Exception:
+        return None
+    if (version != CAPABILITIES_FORMAT_VERSION
+            or not isinstance(capabilities, DaqDeviceCapabilities)):
+        return None
+    return capabilities
+
+
+def save_cached_capabilities(cache_dir, capabilities):
+    # type: (str, DaqDeviceCapabilities) -> None
+    """Writes a snapshot to the cache. The file is replaced atomically, so
+    concurrent readers never see a partial snapshot; errors are ignored."""
+    file_path = _cache_file_path(cache_dir, capabilities.product_id,
+                                 capabilities.unique_id,
+                                 capabilities.firmware_version)
+    try:
+        if not path.isdir(cache_dir):
+            makedirs(cache_dir)
+        cache_file = NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp',
+                                        delete=False)
+    except (OSError, IOError):
+        return
+    try:
+        with cache_file:
+            dump((CAPABILITIES_FORMAT_VERSION, capabilities), cache_file,
+                 HIGHEST_PROTOCOL)
+        replace(cache_file.name, file_path)
+    except (OSError, IOError, PicklingError, AttributeError, TypeError):
+        # Never leave a partial snapshot behind; pickle raises the last three
+        # for an object it cannot serialize
+        try:
+            remove(cache_file.name)
+        except OSError:
+            pass
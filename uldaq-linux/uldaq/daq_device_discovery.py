@@ -4,10 +4,12 @@ Created on Feb 12 2018
 @author: MCC
 """
 from ctypes import c_uint, byref
+from threading import Lock
 from .ul_enums import InterfaceType
 from .ul_structs import DaqDeviceDescriptor
 from .ul_exception import ULException
 from .ul_c_interface import lib
+from .utils import monotonic
 
 
 def _daq_device_descriptor_array(size):
@@ -85,3 +87,201 @@ def get_net_daq_device_descriptor(host, port, ifc_name, timeout=-1):
     if err != 0:
         raise ULException(err)
     return descriptor
+
+
+class _InventoryScan:
+    """The descriptors found by one inventory scan, indexed by unique ID,
+    product ID and interface type."""
+    def __init__(self, descriptors):
+        self.timestamp = monotonic()
+        self.descriptors = descriptors
+        self.by_unique_id = {}
+        self.by_product_id = {}
+        self.by_interface = {}
+        for descriptor in descriptors:
+            self.by_unique_id[descriptor.unique_id.upper()] = descriptor
+            self.by_product_id.setdefault(descriptor.product_id,
+                                          []).append(descriptor)
+            self.by_interface.setdefault(descriptor.dev_interface,
+                                         []).append(descriptor)
+
+
+class DaqDeviceInventory:
+    """
+    A cache of the device inventory, indexed by unique ID, product ID and
+    interface type.
+
+    :func:`get_daq_device_inventory` scans every requested interface on each
+    call, which takes a while for Ethernet devices. The cache keeps the
+    result of each scan for ttl seconds, so lookups on a warm cache return
+    immediately without rediscovering devices. The shared instance used by
+    :func:`DaqDevice.open_by_unique_id` is returned by
+    :func:`get_daq_device_inventory_cache`.
+
+    The cached :class:`DaqDeviceDescriptor` objects are shared between
+    callers and must not be modified.
+
+    Args:
+        ttl (Optional[float]): The time in seconds a scan remains valid; the
+            default is 30. None keeps scans until :func:`invalidate` is
+            called, and 0 rescans on every lookup.
+        number_of_devices (Optional[int]): The maximum number of devices
+            returned by a scan; the default is 100.
+    """
+    def __init__(self, ttl=30.0, number_of_devices=100):
+        self.__ttl = ttl
+        self.__number_of_devices = number_of_devices
+        self.__scans = {}
+        self.__lock = Lock()
+
+    @property
+    def ttl(self):
+        """The time in seconds a scan remains valid, or None if scans never
+        expire."""
+        return self.__ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        self.__ttl = value
+
+    def invalidate(self, interface_type=None):
+        # type: (InterfaceType) -> None
+        """
+        Discards cached scans, so the next lookup rediscovers devices.
+
+        Args:
+            interface_type (Optional[InterfaceType]): Discards only the scan
+                of these interfaces; by default discards every scan.
+        """
+        with self.__lock:
+            if interface_type is None:
+                self.__scans.clear()
+            else:
+                self.__scans.pop(interface_type, None)
+
+    def get_descriptors(self, interface_type=InterfaceType.ANY):
+        # type: (InterfaceType) -> list[DaqDeviceDescriptor]
+        """
+        Gets the descriptors of the devices found on the specified
+        interfaces, scanning them if there is no valid cached scan.
+
+        Args:
+            interface_type (Optional[InterfaceType]): One or more of the
+                :class:`InterfaceType` attributes (suitable for bit-wise
+                operations) specifying which physical interfaces to search;
+                the default is :class:`~InterfaceType.ANY`.
+
+        Returns:
+            list[DaqDeviceDescriptor]:
+
+            A list of :class:`DaqDeviceDescriptor` objects.
+
+        Raises:
+            :class:`ULException`
+        """
+        return list(self.__get_scan(interface_type).descriptors)
+
+    def find_by_unique_id(self, unique_id, interface_type=InterfaceType.ANY):
+        # type: (str, InterfaceType) -> DaqDeviceDescriptor
+        """
+        Gets the descriptor of the device with the specified unique ID, such
+        as a serial number or the MAC address of an Ethernet device. The
+        comparison ignores case. If the device is not in a valid cached
+        scan, the interfaces are scanned once more before giving up.
+
+        Args:
+            unique_id (str): The unique ID of the device.
+            interface_type (Optional[InterfaceType]): The interfaces to
+                search; the default is :class:`~InterfaceType.ANY`.
+
+        Returns:
+            DaqDeviceDescriptor:
+
+            The descriptor, or None if the device was not found.
+
+        Raises:
+            :class:`ULException`
+        """
+        key = unique_id.upper()
+        lookup_time = monotonic()
+        scan = self.__get_scan(interface_type)
+        descriptor = scan.by_unique_id.get(key)
+        if descriptor is None and scan.timestamp < lookup_time:
+            # The device may have been attached since the cached scan
+            descriptor = self.__get_scan(interface_type,
+                                         True).by_unique_id.get(key)
+        return descriptor
+
+    def find_by_product_id(self, product_id,
+                           interface_type=InterfaceType.ANY):
+        # type: (int, InterfaceType) -> list[DaqDeviceDescriptor]
+        """
+        Gets the descriptors of the devices with the specified product ID.
+
+        Args:
+            product_id (int): The product ID.
+            interface_type (Optional[InterfaceType]): The interfaces to
+                search; the default is :class:`~InterfaceType.ANY`.
+
+        Returns:
+            list[DaqDeviceDescriptor]:
+
+            A list of :class:`DaqDeviceDescriptor` objects, empty if no
+            device was found.
+
+        Raises:
+            :class:`ULException`
+        """
+        return list(self.__get_scan(interface_type).by_product_id.get(
+            product_id, ()))
+
+    def find_by_interface(self, interface_type):
+        # type: (InterfaceType) -> list[DaqDeviceDescriptor]
+        """
+        Gets the descriptors of the devices connected through one interface,
+        using the cached scan of every interface.
+
+        Args:
+            interface_type (InterfaceType): A single :class:`InterfaceType`
+                attribute, such as :class:`~InterfaceType.ETHERNET`.
+
+        Returns:
+            list[DaqDeviceDescriptor]:
+
+            A list of :class:`DaqDeviceDescriptor` objects, empty if no
+            device was found.
+
+        Raises:
+            :class:`ULException`
+        """
+        return list(self.__get_scan(InterfaceType.ANY).by_interface.get(
+            interface_type, ()))
+
+    def __get_scan(self, interface_type, rescan=False):
+        with self.__lock:
+            scan = self.__scans.get(interface_type)
+            ttl = self.__ttl
+            if (rescan or scan is None or (
+                    ttl is not None and monotonic() - scan.timestamp >= ttl)):
+                scan = _InventoryScan(get_daq_device_inventory(
+                    interface_type, self.__number_of_devices))
+                self.__scans[interface_type] = scan
+            return scan
+
+
+_inventory_cache = DaqDeviceInventory()
+
+
+def get_daq_device_inventory_cache():
+    # type: () -> DaqDeviceInventory
+    """
+    Gets the shared :class:`DaqDeviceInventory` used by
+    :func:`DaqDevice.open_by_unique_id`. Set its ttl attribute or call its
+    invalidate method to control when devices are rediscovered.
+
+    Returns:
+        DaqDeviceInventory:
+
+        The shared inventory cache.
+    """
+    return _inventory_cache
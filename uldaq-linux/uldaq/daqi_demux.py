@@ -0,0 +1,231 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from collections import OrderedDict
+from ctypes import Array
+from .ul_enums import DaqInChanType, DigitalPortType, ULError
+from .ul_exception import ULException
+from .buffer_management import ScanBuffer
+
+_ANALOG_TYPES = DaqInChanType.ANALOG_DIFF | DaqInChanType.ANALOG_SE
+
+
+class DaqInDemux:
+    """
+    Splits the interleaved buffer of a :func:`DaqiDevice.daq_in_scan` into
+    one array per channel, using the channel descriptor list of the scan.
+
+    :func:`views` returns strided float64 views of the buffer without
+    copying. :func:`split` and :func:`to_structured` return compact copies
+    converted to the smallest type that holds each channel's values:
+
+    ==============================  =====================================
+    **Channel type**                **Type**
+    ------------------------------  -------------------------------------
+    ANALOG_DIFF, ANALOG_SE, DAC     float32
+    DIGITAL                         uint8, or uint16 for ports wider than
+                                    8 bits
+    CTR16                           uint16
+    CTR32                           uint32
+    CTR48                           uint64
+    ==============================  =====================================
+
+    Channels are named AI<n>, DAC<n> and CTR<n>, and digital ports by their
+    :class:`DigitalPortType` name; a name used twice gets the position of the
+    channel in the scan appended. Requires NumPy.
+
+    Args:
+        channel_descriptors (list[DaqInChanDescriptor]): The channel
+            descriptors passed to the scan.
+        port_bits (Optional[dict[DigitalPortType, int]]): The number of bits
+            of digital ports wider than 8 bits, for instance from
+            :func:`DioInfo.get_port_info`.
+
+    Raises:
+        :class:`ULException`: The descriptor list is empty or has an invalid
+        channel type.
+    """
+    def __init__(self, channel_descriptors, port_bits=None):
+        import numpy as np
+
+        if not channel_descriptors:
+            raise ULException(ULError.BAD_NUM_CHANS)
+        port_bits = port_bits or {}
+        names = []
+        types = []
+        for descriptor in channel_descriptors:
+            chan_type = descriptor.type
+            channel = descriptor.channel
+            if chan_type & _ANALOG_TYPES:
+                name, dtype = 'AI{}'.format(channel), np.float32
+            elif chan_type == DaqInChanType.DAC:
+                name, dtype = 'DAC{}'.format(channel), np.float32
+            elif chan_type == DaqInChanType.DIGITAL:
+                try:
+                    name = DigitalPortType(channel).name
+                except ValueError:
+                    name = 'PORT{}'.format(channel)
+                dtype = (np.uint16 if port_bits.get(channel, 8) > 8
+                         else np.uint8)
+            elif chan_type == DaqInChanType.CTR16:
+                name, dtype = 'CTR{}'.format(channel), np.uint16
+            elif chan_type == DaqInChanType.CTR32:
+                name, dtype = 'CTR{}'.format(channel), np.uint32
+            elif chan_type == DaqInChanType.CTR48:
+                name, dtype = 'CTR{}'.format(channel), np.uint64
+            else:
+                raise ULException(ULError.BAD_DAQI_CHAN_TYPE)
+            if name in names:
+                name = '{}_{}'.format(name, len(names))
+            names.append(name)
+            types.append(np.dtype(dtype))
+
+        self.__names = names
+        self.__types = types
+        self.__dtype = np.dtype(list(zip(names, types)))
+
+    @property
+    def names(self):
+        """The channel names, in scan order."""
+        return list(self.__names)
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return len(self.__names)
+
+    @property
+    def dtype(self):
+        """The structured dtype of the arrays returned by
+        :func:`to_structured`, with one field per channel."""
+        return self.__dtype
+
+    def get_dtype(self, name):
+        # type: (str) -> dtype
+        """
+        Gets the type of a channel's values in the arrays returned by
+        :func:`split`.
+
+        Args:
+            name (str): The channel name.
+
+        Returns:
+            dtype:
+
+            The NumPy type.
+        """
+        return self.__types[self.__names.index(name)]
+
+    def views(self, data, first_scan=0, scan_count=None):
+        # type: (Array[float], int, int) -> OrderedDict[str, ndarray]
+        """
+        Returns a strided float64 view of each channel's samples, sharing
+        the memory of the scan buffer.
+
+        Args:
+            data (Array[float] or ScanBuffer or ndarray): The scan buffer, or
+                a (scans, channels) block such as those of
+                :func:`DaqiDevice.stream`.
+            first_scan (Optional[int]): The index of the first scan (one
+                sample per channel) to include; the default is 0.
+            scan_count (Optional[int]): The number of scans to include; by
+                default all scans from first_scan on.
+
+        Returns:
+            OrderedDict[str, ndarray]:
+
+            The samples of each channel, by name, in scan order.
+
+        Raises:
+            :class:`ULException`: The buffer size is not a multiple of the
+            number of channels.
+        """
+        scans = self.__scans(data, first_scan, scan_count)
+        return OrderedDict((name, scans[:, column])
+                           for column, name in enumerate(self.__names))
+
+    def split(self, data, first_scan=0, scan_count=None):
+        # type: (Array[float], int, int) -> OrderedDict[str, ndarray]
+        """
+        Returns a compact copy of each channel's samples, converted to the
+        channel's type.
+
+        Args:
+            data (Array[float] or ScanBuffer or ndarray): The scan buffer, or
+                a (scans, channels) block such as those of
+                :func:`DaqiDevice.stream`.
+            first_scan (Optional[int]): The index of the first scan to
+                include; the default is 0.
+            scan_count (Optional[int]): The number of scans to include; by
+                default all scans from first_scan on.
+
+        Returns:
+            OrderedDict[str, ndarray]:
+
+            The samples of each channel, by name, in scan order.
+
+        Raises:
+            :class:`ULException`: The buffer size is not a multiple of the
+            number of channels.
+        """
+        scans = self.__scans(data, first_scan, scan_count)
+        return OrderedDict((name, scans[:, column].astype(dtype))
+                           for column, (name, dtype)
+                           in enumerate(zip(self.__names, self.__types)))
+
+    def to_structured(self, data, first_scan=0, scan_count=None, out=None):
+        # type: (Array[float], int, int, ndarray) -> ndarray
+        """
+        Returns the scans as a structured array with one typed field per
+        channel.
+
+        Args:
+            data (Array[float] or ScanBuffer or ndarray): The scan buffer, or
+                a (scans, channels) block such as those of
+                :func:`DaqiDevice.stream`.
+            first_scan (Optional[int]): The index of the first scan to
+                include; the default is 0.
+            scan_count (Optional[int]): The number of scans to include; by
+                default all scans from first_scan on.
+            out (Optional[ndarray]): An array of :attr:`dtype` with one
+                element per scan to write to, such as a slice of a larger
+                recording; by default a new array is returned.
+
+        Returns:
+            ndarray:
+
+            The array of :attr:`dtype`, one element per scan.
+
+        Raises:
+            :class:`ULException`: The buffer size is not a multiple of the
+            number of channels, or out has the wrong type or length.
+        """
+        import numpy as np
+
+        scans = self.__scans(data, first_scan, scan_count)
+        if out is None:
+            out = np.empty(len(scans), dtype=self.__dtype)
+        elif out.dtype != self.__dtype or len(out) != len(scans):
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        for column, name in enumerate(self.__names):
+            out[name] = scans[:, column]
+        return out
+
+    def __scans(self, data, first_scan, scan_count):
+        import numpy as np
+
+        if isinstance(data, ScanBuffer):
+            array = data.array
+        elif isinstance(data, Array):
+            from numpy.ctypeslib import as_array
+            array = as_array(data)
+        else:
+            array = np.asarray(data)
+        number_of_channels = len(self.__names)
+        if array.size % number_of_channels:
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        scans = array.reshape(-1, number_of_channels)
+        end = len(scans) if scan_count is None else first_scan + scan_count
+        return scans[first_scan:end]
@@ -11,6 +11,8 @@ from .ul_structs import DaqInChanDescriptor, TransferStatus
 from .ul_exception import ULException
 from .ul_c_interface import lib
 from .daqi_info import DaqiInfo
+from .buffer_management import create_float_ndarray_buffer
+from .scan_stream import ScanStream, _stream_buffer_blocks
 
 
 def _daqi_chan_descriptor_array(size, descriptor_list):
@@ -99,7 +101,8 @@ class DaqiDevice:
                 operations) specifying the conditioning applied to the data
                 before it is returned.
             data (Array[float]): The data buffer to receive the data being read.
-                Use :class:`create_float_buffer` to create the buffer.
+                Use :class:`create_float_buffer` or
+                :class:`create_float_ndarray_buffer` to create the buffer.
 
         Returns:
             float:
@@ -120,6 +123,52 @@ class DaqiDevice:
             raise ULException(err)
         return rate.value
 
+    def stream(self, channel_descriptors, rate, block_size,
+               options=ScanOption.DEFAULTIO, flags=DaqInScanFlag.DEFAULT,
+               buffer_blocks=None):
+        # type: (list[DaqInChanDescriptor], float, int, ScanOption, DaqInScanFlag, int) -> ScanStream
+        """
+        Starts a CONTINUOUS DAQ input scan on the device referenced by the
+        :class:`DaqiDevice` object, and returns an iterator over fixed-size
+        blocks of the acquired data.
+
+        The scan buffer is allocated internally and holds a whole number of
+        blocks. Iterating the returned stream yields
+        (block_index, ndarray[block_size, number_of_channels],
+        first_sample_index) tuples until the stream is closed. Requires NumPy.
+
+        Args:
+            channel_descriptors (list[DaqInChanDescriptor]): A list of DAQ input
+                channel descriptors.
+            rate (float): Sample input rate in samples per second.
+            block_size (int): The number of samples per channel in each block.
+            options (Optional[ScanOption]): One or more attributes (suitable
+                for bit-wise operations) specifying the optional conditions
+                that will be applied to the scan;
+                :class:`~ScanOption.CONTINUOUS` is always added.
+            flags (Optional[DaqInScanFlag]): One or more attributes (suitable
+                for bit-wise operations) specifying the conditioning applied
+                to the data before it is returned.
+            buffer_blocks (Optional[int]): The number of blocks the scan
+                buffer holds; by default the buffer holds at least one second
+                of data.
+
+        Returns:
+            ScanStream:
+
+            The block iterator; closing it stops the scan.
+
+        Raises:
+            :class:`ULException`
+        """
+        blocks = _stream_buffer_blocks(rate, block_size, buffer_blocks)
+        data = create_float_ndarray_buffer(len(channel_descriptors),
+                                           blocks * block_size)
+        rate = self.daq_in_scan(channel_descriptors, blocks * block_size, rate,
+                                options | ScanOption.CONTINUOUS, flags, data)
+        return ScanStream(data, self.get_scan_status, self.scan_stop, rate,
+                          block_size)
+
     def get_scan_status(self):
         # type: () -> tuple[ScanStatus, TransferStatus]
         """
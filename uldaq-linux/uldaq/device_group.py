@@ -0,0 +1,466 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+Concurrent acquisition on several devices. Every device gets its own worker
+thread; the scans are released together by a barrier so they start with
+minimal skew, and the blocks of all devices are merged into one stream.
+"""
+from collections import namedtuple, OrderedDict
+from threading import Condition, Event, Lock, Thread
+try:
+    from queue import Queue, Empty, Full
+except ImportError:
+    from Queue import Queue, Empty, Full
+try:
+    from threading import Barrier, BrokenBarrierError
+except ImportError:
+    Barrier = None
+from .ul_enums import AInScanFlag, ScanOption, ULError
+from .ul_exception import ULException
+from .buffer_management import create_float_ndarray_buffer
+from .scan_stream import ScanStream, _stream_buffer_blocks
+from .daq_device import DaqDevice
+from .utils import monotonic
+
+if Barrier is None:
+    # Python 2; only the single use wait() and abort() of threading.Barrier
+    # are needed here
+    class BrokenBarrierError(RuntimeError):
+        pass
+
+    class Barrier(object):
+        def __init__(self, parties):
+            self.__parties = parties
+            self.__count = 0
+            self.__broken = False
+            self.__condition = Condition()
+
+        def wait(self):
+            with self.__condition:
+                self.__count += 1
+                if self.__count == self.__parties:
+                    self.__condition.notify_all()
+                while not self.__broken and self.__count < self.__parties:
+                    self.__condition.wait()
+                if self.__broken:
+                    raise BrokenBarrierError()
+
+        def abort(self):
+            with self.__condition:
+                self.__broken = True
+                self.__condition.notify_all()
+
+"""A named tuple containing a block of samples from one device of a
+:class:`DeviceGroup`: the device ID, the index of the block in the stream of
+that device, the (block_size, number_of_channels) ndarray, and the index of
+the first sample of the block since the start of the scan."""
+DeviceBlock = namedtuple('DeviceBlock',
+                         'device_id block_index data first_sample_index')
+
+
+class DeviceGroupError(ULException):
+    """
+    Exception for errors on one or more devices of a :class:`DeviceGroup`.
+
+    The error_code and error_message are those of the first device that
+    failed; the errors attribute holds the exception raised for each device.
+
+    Args:
+        errors (OrderedDict): The exception raised for each failed device,
+            keyed by device ID.
+    """
+    def __init__(self, errors):
+        first_error = next(iter(errors.values()))
+        error_code = getattr(first_error, 'error_code',
+                             ULError.UNHANDLED_EXCEPTION)
+        ULException.__init__(self, error_code)
+        self.errors = errors
+        """An OrderedDict of the exception raised for each failed device,
+        keyed by device ID."""
+
+    def __str__(self):
+        return '; '.join('{}: {}'.format(device_id, error)
+                         for device_id, error in self.errors.items())
+
+
+class DeviceGroup:
+    """
+    A group of DAQ devices that are connected, configured and scanned
+    concurrently.
+
+    Each operation runs on one thread per device and returns once every
+    device has finished; if it fails on any device, a
+    :class:`DeviceGroupError` holding the error of each failed device is
+    raised.
+
+    Args:
+        daq_devices (list[DaqDevice]): The devices in the group.
+        device_ids (Optional[list]): An ID for each device, used to tag its
+            blocks and errors; by default the unique ID of each device.
+    """
+    def __init__(self, daq_devices, device_ids=None):
+        self.__daq_devices = list(daq_devices)
+        if device_ids is None:
+            device_ids = [daq_device.get_descriptor().unique_id
+                          for daq_device in self.__daq_devices]
+        self.__device_ids = list(device_ids)
+        if len(self.__device_ids) != len(self.__daq_devices):
+            raise ValueError('One device ID is required for each device')
+
+    @classmethod
+    def open_by_unique_ids(cls, unique_ids):
+        # type: (list[str]) -> DeviceGroup
+        """
+        Creates a group from the unique IDs of its devices, using
+        :func:`DaqDevice.open_by_unique_id`. The devices are not connected.
+
+        Args:
+            unique_ids (list[str]): The unique IDs of the devices, such as
+                the MAC addresses of Ethernet devices.
+
+        Returns:
+            DeviceGroup:
+
+            The group; the device IDs are the unique IDs.
+
+        Raises:
+            :class:`DeviceGroupError`
+        """
+        devices = OrderedDict()
+        errors = OrderedDict()
+        for unique_id in unique_ids:
+            try:
+                devices[unique_id] = DaqDevice.open_by_unique_id(unique_id)
+            except ULException as error:
+                errors[unique_id] = error
+        if errors:
+            for daq_device in devices.values():
+                daq_device.release()
+            raise DeviceGroupError(errors)
+        return cls(list(devices.values()), list(devices.keys()))
+
+    @property
+    def daq_devices(self):
+        """The list of :class:`DaqDevice` objects in the group."""
+        return list(self.__daq_devices)
+
+    @property
+    def device_ids(self):
+        """The list of device IDs, in the order of the devices."""
+        return list(self.__device_ids)
+
+    def connect(self, connection_code=0):
+        # type: (int) -> None
+        """
+        Connects to every device in the group in parallel.
+
+        Args:
+            connection_code (Optional[int]): The connection code of the
+                Ethernet devices; the default is 0.
+
+        Raises:
+            :class:`DeviceGroupError`
+        """
+        self.run(lambda daq_device: daq_device.connect(connection_code))
+
+    def disconnect(self):
+        # type: () -> None
+        """
+        Disconnects from every device in the group in parallel.
+
+        Raises:
+            :class:`DeviceGroupError`
+        """
+        self.run(lambda daq_device: daq_device.disconnect())
+
+    def release(self):
+        # type: () -> None
+        """
+        Releases every device in the group.
+
+        Raises:
+            :class:`DeviceGroupError`
+        """
+        self.run(lambda daq_device: daq_device.release())
+
+    def run(self, function):
+        # type: (function) -> list
+        """
+        Calls a function for every device in the group in parallel, for
+        example to apply the same configuration to all of them.
+
+        Args:
+            function (function): Called with each :class:`DaqDevice`.
+
+        Returns:
+            list:
+
+            The value returned for each device, in the order of the devices.
+
+        Raises:
+            :class:`DeviceGroupError`: The function raised an exception for
+                one or more devices.
+        """
+        results = [None] * len(self.__daq_devices)
+        errors = {}
+
+        def call(index):
+            try:
+                results[index] = function(self.__daq_devices[index])
+            except Exception as error:
+                errors[index] = error
+
+        threads = [Thread(target=call, args=(index,),
+                          name='uldaq-group-' + str(device_id))
+                   for index, device_id in enumerate(self.__device_ids)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise DeviceGroupError(OrderedDict(
+                (self.__device_ids[index], errors[index])
+                for index in sorted(errors)))
+        return results
+
+    def a_in_stream(self, low_channel, high_channel, input_mode,
+                    analog_range, rate, block_size,
+                    options=ScanOption.DEFAULTIO, flags=AInScanFlag.DEFAULT,
+                    buffer_blocks=None, queue_blocks=None):
+        # type: (int, int, AiInputMode, Range, float, int, ScanOption, AInScanFlag, int, int) -> DeviceGroupStream
+        """
+        Starts the same CONTINUOUS analog input scan on every device in the
+        group, and returns a merged stream of their blocks.
+
+        The scan buffers are allocated before any scan is started, and the
+        worker threads then call :func:`AiDevice.a_in_scan` together.
+        Returns once every scan has started.
+
+        Args:
+            low_channel (int): First A/D channel in the scan.
+            high_channel (int): Last A/D channel in the scan.
+            input_mode (AiInputMode): The input mode of the specified channels.
+            analog_range (Range): The range of the data being read.
+            rate (float): A/D sample rate in samples per channel per second.
+            block_size (int): The number of samples per channel in each block.
+            options (Optional[ScanOption]): The scan options;
+                :class:`~ScanOption.CONTINUOUS` is always added.
+            flags (Optional[AInScanFlag]): The scan flags.
+            buffer_blocks (Optional[int]): The number of blocks each scan
+                buffer holds; by default the buffers hold at least one second
+                of data.
+            queue_blocks (Optional[int]): The number of blocks the merged
+                stream can hold before the workers wait for the consumer; by
+                default the number of blocks in one scan buffer per device.
+
+        Returns:
+            DeviceGroupStream:
+
+            The merged block stream; closing it stops every scan.
+
+        Raises:
+            :class:`DeviceGroupError`: A scan could not be started; the scans
+                already started are stopped.
+        """
+        blocks = _stream_buffer_blocks(rate, block_size, buffer_blocks)
+        if queue_blocks is None:
+            queue_blocks = blocks * len(self.__daq_devices)
+
+        def start_scan(ai_device, data):
+            return ai_device.a_in_scan(
+                low_channel, high_channel, input_mode, analog_range,
+                blocks * block_size, rate, options | ScanOption.CONTINUOUS,
+                flags, data)
+
+        number_of_channels = high_channel - low_channel + 1
+        stream = DeviceGroupStream(self.__daq_devices, self.__device_ids,
+                                   number_of_channels, blocks, block_size,
+                                   start_scan, queue_blocks)
+        stream._start()
+        return stream
+
+
+class DeviceGroupStream:
+    """
+    The merged block stream of a :class:`DeviceGroup` scan, obtained by
+    calling :func:`DeviceGroup.a_in_stream`.
+
+    Iterating yields :class:`DeviceBlock` tuples from all devices in the
+    order they were acquired. Each block is a copy, so it remains valid
+    after the iteration. If a device fails, every scan is stopped; the
+    blocks already queued are still returned, then the iteration raises a
+    :class:`DeviceGroupError`.
+    """
+    def __init__(self, daq_devices, device_ids, number_of_channels, blocks,
+                 block_size, start_scan, queue_blocks):
+        self.__daq_devices = daq_devices
+        self.__device_ids = device_ids
+        self.__number_of_channels = number_of_channels
+        self.__blocks = blocks
+        self.__block_size = block_size
+        self.__start_scan = start_scan
+        self.__queue = Queue(queue_blocks)
+        self.__stop = Event()
+        self.__lock = Lock()
+        self.__errors = {}
+        self.__errors_raised = False
+        number_of_devices = len(daq_devices)
+        self.__barrier = Barrier(number_of_devices)
+        self.__started = [Event() for _ in range(number_of_devices)]
+        self.__start_times = [None] * number_of_devices
+        self.__rates = [None] * number_of_devices
+        self.__threads = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> DeviceBlock
+        while True:
+            try:
+                return self.__queue.get(timeout=0.1)
+            except Empty:
+                if any(thread.is_alive() for thread in self.__threads):
+                    continue
+                if not self.__queue.empty():
+                    continue
+                self.__raise_errors()
+                raise StopIteration
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exe_type, exe_value, exe_traceback):
+        self.close()
+
+    @property
+    def rates(self):
+        """The actual scan rate of each device, in the order of the
+        devices."""
+        return list(self.__rates)
+
+    @property
+    def start_skew(self):
+        """The time in seconds between the first and the last scan start."""
+        start_times = [start_time for start_time in self.__start_times
+                       if start_time is not None]
+        if not start_times:
+            return 0.0
+        return max(start_times) - min(start_times)
+
+    @property
+    def errors(self):
+        """An OrderedDict of the exception raised for each failed device,
+        keyed by device ID."""
+        with self.__lock:
+            return OrderedDict((self.__device_ids[index], self.__errors[index])
+                               for index in sorted(self.__errors))
+
+    def stop(self):
+        # type: () -> None
+        """Signals every worker to stop its scan, and waits for them. The
+        blocks already queued can still be read."""
+        self.__stop.set()
+        for thread in self.__threads:
+            thread.join()
+
+    def close(self):
+        # type: () -> None
+        """
+        Stops every scan and discards the queued blocks.
+
+        Raises:
+            :class:`DeviceGroupError`: A device failed and its error has not
+                been raised by the iteration.
+        """
+        self.stop()
+        while not self.__queue.empty():
+            self.__queue.get_nowait()
+        self.__raise_errors()
+
+    def _start(self):
+        for index, device_id in enumerate(self.__device_ids):
+            thread = Thread(target=self.__run, args=(index,),
+                            name='uldaq-group-' + str(device_id))
+            thread.daemon = True
+            self.__threads.append(thread)
+            thread.start()
+        for started in self.__started:
+            started.wait()
+        if self.__errors:
+            self.close()
+
+    def __raise_errors(self):
+        errors = self.errors
+        if errors and not self.__errors_raised:
+            self.__errors_raised = True
+            raise DeviceGroupError(errors)
+
+    def __set_error(self, index, error):
+        with self.__lock:
+            self.__errors[index] = error
+        self.__stop.set()
+
+    def __run(self, index):
+        stream = None
+        try:
+            # Everything but the scan start is done before the barrier, so
+            # creating the subsystem objects adds no skew
+            try:
+                ai_device = self.__daq_devices[index].get_ai_device()
+                if ai_device is None:
+                    raise ULException(ULError.BAD_DEV_TYPE)
+                data = create_float_ndarray_buffer(
+                    self.__number_of_channels,
+                    self.__blocks * self.__block_size)
+            except BaseException:
+                self.__barrier.abort()
+                raise
+            # Release every scan at the same time
+            self.__barrier.wait()
+            rate = self.__start_scan(ai_device, data)
+            self.__start_times[index] = monotonic()
+            self.__rates[index] = rate
+            stream = ScanStream(data, ai_device.get_scan_status,
+                                ai_device.scan_stop, rate, self.__block_size)
+        except BrokenBarrierError:
+            # Another device failed before the scans were started
+            pass
+        except Exception as error:
+            self.__set_error(index, error)
+        finally:
+            self.__started[index].set()
+
+        if stream is None:
+            return
+        try:
+            self.__forward_blocks(index, stream)
+        except Exception as error:
+            self.__set_error(index, error)
+        finally:
+            try:
+                stream.close()
+            except ULException as error:
+                self.__set_error(index, error)
+
+    def __forward_blocks(self, index, stream):
+        device_id = self.__device_ids[index]
+        stop = self.__stop
+        queue = self.__queue
+        for block_index, block, first_sample_index in stream:
+            if stop.is_set():
+                return
+            device_block = DeviceBlock(device_id, block_index, block.copy(),
+                                       first_sample_index)
+            while True:
+                try:
+                    queue.put(device_block, timeout=0.1)
+                    break
+                except Full:
+                    if stop.is_set():
+                        return
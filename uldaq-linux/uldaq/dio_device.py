@@ -26,6 +26,8 @@ class DioDevice:
         self.__handle = handle
         self.__dio_info = DioInfo(handle)
         self.__dio_config = DioConfig(handle)
+        # The last value written to each output port, used by write_lines
+        self.__port_shadow = {}
 
     def get_info(self):
         # type: () -> DioInfo
@@ -135,6 +137,7 @@ class DioDevice:
         err = lib.ulDOut(self.__handle, port_type, data)
         if err != 0:
             raise ULException(err)
+        self.__port_shadow[port_type] = data
 
     def d_bit_in(self, port_type, bit_number):
         # type: (DigitalPortType, int) -> int
@@ -179,6 +182,8 @@ class DioDevice:
             :class:`ULException`
         """
         err = lib.ulDBitOut(self.__handle, port_type, bit_number, data)
+        # The bit number may address a bit beyond the first port
+        self.__port_shadow.clear()
         if err != 0:
             raise ULException(err)
 
@@ -202,7 +207,8 @@ class DioDevice:
                 (suitable for bit-wise operations) specifying the conditioning
                 applied to the data before it is returned.
             data (Array[int]): The buffer in which the digital data is returned.
-                Use :class:`create_int_buffer` to create the buffer.
+                Use :class:`create_int_buffer` or
+                :class:`create_int_ndarray_buffer` to create the buffer.
 
         Returns:
             float:
@@ -256,6 +262,7 @@ class DioDevice:
         err = lib.ulDOutScan(self.__handle, low_port_type, high_port_type,
                              samples_per_port, byref(rate), options, flags,
                              data)
+        self.__port_shadow.clear()
         if err != 0:
             raise ULException(err)
 
@@ -512,6 +519,101 @@ class DioDevice:
                               ull_array)
         if err != 0:
             raise ULException(err)
+        for port, value in enumerate(data, low_port_type):
+            self.__port_shadow[port] = value
+
+    def write_lines(self, lines):
+        # type: (dict[tuple[DigitalPortType, int], int]) -> None
+        """
+        Writes the specified values to digital output bits in as few
+        transfers as possible for the device referenced by the
+        :class:`DioDevice` object.
+
+        The bits are grouped by port and each group of consecutive ports is
+        written with one :func:`d_out` or :func:`d_out_list` call. The other
+        bits of each port keep the value last written through this object;
+        ports that were not written yet are read once with :func:`d_in_list`
+        first.
+
+        Args:
+            lines (dict[tuple[DigitalPortType, int], int]): The value to
+                write to each (port, bit) pair, where bit is the bit position
+                within the port; any true value sets the bit. A list of
+                ((port, bit), value) pairs is also accepted.
+
+        Raises:
+            :class:`ULException`
+        """
+        if hasattr(lines, 'items'):
+            lines = lines.items()
+        masks = {}
+        for (port_type, bit_number), value in lines:
+            if not 0 <= bit_number < 64:
+                raise ULException(ULError.BAD_BIT_NUM)
+            mask, bits = masks.get(port_type, (0, 0))
+            bit = 1 << bit_number
+            bits = bits | bit if value else bits & ~bit
+            masks[port_type] = (mask | bit, bits)
+        if not masks:
+            return
+
+        shadow = self.__port_shadow
+        unknown = [port_type for port_type in masks if port_type not in shadow]
+        if unknown:
+            shadow.update(zip(unknown, self.__read_ports(unknown)))
+
+        for run in _consecutive_ports(masks):
+            data = []
+            for port_type in run:
+                mask, bits = masks[port_type]
+                data.append((shadow[port_type] & ~mask) | bits)
+            if len(run) == 1:
+                self.d_out(run[0], data[0])
+            else:
+                self.d_out_list(run[0], run[-1], data)
+
+    def read_lines(self, lines):
+        # type: (list[tuple[DigitalPortType, int]]) -> ndarray
+        """
+        Returns the values read from digital bits in as few transfers as
+        possible for the device referenced by the :class:`DioDevice` object.
+
+        Each group of consecutive ports containing the bits is read with one
+        :func:`d_in` or :func:`d_in_list` call. Requires NumPy.
+
+        Args:
+            lines (list[tuple[DigitalPortType, int]]): The (port, bit) pairs
+                to read, where bit is the bit position within the port.
+
+        Returns:
+            ndarray:
+
+            A bool array with the value of each bit, in the order of lines.
+
+        Raises:
+            :class:`ULException`
+        """
+        from numpy import array
+
+        lines = list(lines)
+        for _, bit_number in lines:
+            if not 0 <= bit_number < 64:
+                raise ULException(ULError.BAD_BIT_NUM)
+        port_types = list(set(port_type for port_type, _ in lines))
+        values = dict(zip(port_types, self.__read_ports(port_types)))
+        return array([(values[port_type] >> bit_number) & 1
+                      for port_type, bit_number in lines], dtype=bool)
+
+    def __read_ports(self, port_types):
+        # Returns the values of the ports, reading each group of consecutive
+        # ports with one call
+        values = {}
+        for run in _consecutive_ports(port_types):
+            if len(run) == 1:
+                values[run[0]] = self.d_in(run[0])
+            else:
+                values.update(zip(run, self.d_in_list(run[0], run[-1])))
+        return [values[port_type] for port_type in port_types]
 
     def d_clear_alarm(self, port_type, bit_mask):
         # type: (DigitalPortType, int) -> None
@@ -532,3 +634,15 @@ class DioDevice:
         err = lib.ulDClearAlarm(self.__handle, port_type, bit_mask)
         if err != 0:
             raise ULException(err)
+
+
+def _consecutive_ports(port_types):
+    # Splits the port types into sorted runs of consecutive ports, each of
+    # which can be transferred with one array call
+    runs = []
+    for port_type in sorted(set(port_types)):
+        if runs and port_type == runs[-1][-1] + 1:
+            runs[-1].append(port_type)
+        else:
+            runs.append([port_type])
+    return runs
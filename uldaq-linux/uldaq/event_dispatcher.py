@@ -0,0 +1,257 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from collections import namedtuple
+from enum import IntEnum
+from threading import Condition, Thread
+from traceback import print_exc
+from .ul_enums import DaqEventType
+from .ul_structs import EventCallbackArgs
+from .utils import enum_mask_to_list, monotonic
+
+"""A named tuple containing the counters of an :class:`EventDispatcher`.
+Returned by :func:`EventDispatcher.get_stats`."""
+EventDispatcherStats = namedtuple(
+    'EventDispatcherStats',
+    'queue_depth max_queue_depth received dispatched coalesced dropped '
+    'callback_errors last_latency max_latency mean_latency')
+
+
+class DropPolicy(IntEnum):
+    """Used with :class:`EventDispatcher` to select which event is discarded
+    when the event queue is full."""
+    DROP_NEWEST = 0,  #: Discard the incoming event.
+    DROP_OLDEST = 1,  #: Discard the oldest queued event.
+
+
+class EventDispatcher:
+    """
+    Runs event callbacks on a worker thread instead of the UL's internal
+    callback thread.
+
+    Pass an instance as the dispatcher argument of
+    :func:`DaqDevice.enable_event`. The callback invoked by the UL then only
+    stores (event_type, event_data, timestamp) in a preallocated bounded
+    queue, and the worker thread calls every callback subscribed to the
+    event type for the device that raised it, so one dispatcher can be
+    shared by several devices. A slow callback therefore no longer stalls
+    the driver; if the consumers fall behind, the queue statistics show
+    it.
+
+    Args:
+        queue_size (Optional[int]): The number of events the queue can hold;
+            the default is 256.
+        coalesce_data_available (Optional[bool]): If True (default),
+            consecutive queued :class:`~DaqEventType.ON_DATA_AVAILABLE` events
+            are merged into one carrying the latest sample count.
+        drop_policy (Optional[DropPolicy]): The event discarded when the
+            queue is full; the default is :class:`~DropPolicy.DROP_OLDEST`.
+    """
+    def __init__(self, queue_size=256, coalesce_data_available=True,
+                 drop_policy=DropPolicy.DROP_OLDEST):
+        self.__slots = [[0, 0, 0.0, None] for _ in range(queue_size)]
+        self.__size = queue_size
+        self.__head = 0
+        self.__count = 0
+        self.__coalesce = coalesce_data_available
+        self.__drop_policy = drop_policy
+        self.__condition = Condition()
+        self.__subscribers = {}
+        self.__thread = None
+        self.__running = False
+
+        self.__max_queue_depth = 0
+        self.__received = 0
+        self.__dispatched = 0
+        self.__coalesced = 0
+        self.__dropped = 0
+        self.__callback_errors = 0
+        self.__last_latency = 0.0
+        self.__max_latency = 0.0
+        self.__total_latency = 0.0
+
+    def subscribe(self, event_types, event_callback_function, user_data=None,
+                  handle=None):
+        # type: (DaqEventType, function, object, int) -> None
+        """
+        Adds a callback for one or more event types. Several callbacks can be
+        subscribed to the same event type; they are called in the order they
+        were subscribed. Starts the worker thread if it is not running.
+
+        Args:
+            event_types (DaqEventType): One or more attributes
+                (suitable for bit-wise operations) specifying the conditions
+                to bind to the callback function.
+            event_callback_function (function): The callback function; it
+                receives an :class:`EventCallbackArgs` like the callbacks
+                passed to :func:`DaqDevice.enable_event`.
+            user_data (Optional[object]): Data (defined by the user) to be
+                passed to the callback function.
+            handle (Optional[int]): The handle of the device whose events
+                the callback receives; :func:`DaqDevice.enable_event` passes
+                its own. Callbacks subscribed without a handle receive the
+                events posted without one.
+        """
+        with self.__condition:
+            for event in enum_mask_to_list(DaqEventType, event_types):
+                key = (handle, event)
+                subscribers = list(self.__subscribers.get(key, ()))
+                subscribers.append((event_callback_function, user_data))
+                self.__subscribers[key] = subscribers
+        self.start()
+
+    def unsubscribe(self, event_types, event_callback_function=None,
+                    handle=None):
+        # type: (DaqEventType, function, int) -> None
+        """
+        Removes a callback, or all callbacks if event_callback_function is
+        None, from one or more event types of a device. The callbacks
+        subscribed for other devices are kept.
+
+        Args:
+            event_types (DaqEventType): One or more attributes
+                (suitable for bit-wise operations) specifying the conditions.
+            event_callback_function (Optional[function]): The callback
+                function to remove.
+            handle (Optional[int]): The handle the callbacks were subscribed
+                with.
+        """
+        with self.__condition:
+            for event in enum_mask_to_list(DaqEventType, event_types):
+                key = (handle, event)
+                if event_callback_function is None:
+                    self.__subscribers.pop(key, None)
+                    continue
+                self.__subscribers[key] = [
+                    subscriber for subscriber in
+                    self.__subscribers.get(key, ())
+                    if subscriber[0] != event_callback_function]
+
+    def post(self, event_type, event_data, handle=None):
+        # type: (int, int, int) -> None
+        """
+        Queues an event for the worker thread. Called by the UL callback
+        thread; never blocks on user code.
+
+        Args:
+            event_type (int): The :class:`DaqEventType` that occurred.
+            event_data (int): The data associated with the event.
+            handle (Optional[int]): The handle of the device that raised the
+                event.
+        """
+        timestamp = monotonic()
+        with self.__condition:
+            self.__received += 1
+            if (self.__coalesce and self.__count
+                    and event_type == DaqEventType.ON_DATA_AVAILABLE):
+                last = self.__slots[(self.__head + self.__count - 1)
+                                    % self.__size]
+                if (last[0] == DaqEventType.ON_DATA_AVAILABLE
+                        and last[3] == handle):
+                    # Keep the original timestamp so the latency shows how
+                    # long the oldest notification has waited.
+                    last[1] = event_data
+                    self.__coalesced += 1
+                    return
+
+            if self.__count == self.__size:
+                self.__dropped += 1
+                if self.__drop_policy == DropPolicy.DROP_NEWEST:
+                    return
+                self.__head = (self.__head + 1) % self.__size
+                self.__count -= 1
+
+            slot = self.__slots[(self.__head + self.__count) % self.__size]
+            slot[0] = event_type
+            slot[1] = event_data
+            slot[2] = timestamp
+            slot[3] = handle
+            self.__count += 1
+            if self.__count > self.__max_queue_depth:
+                self.__max_queue_depth = self.__count
+            self.__condition.notify()
+
+    def start(self):
+        # type: () -> None
+        """Starts the worker thread if it is not running."""
+        with self.__condition:
+            if self.__running:
+                return
+            self.__running = True
+            self.__thread = Thread(target=self.__run,
+                                   name='uldaq-event-dispatcher')
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def stop(self, timeout=None):
+        # type: (float) -> None
+        """
+        Stops the worker thread after the queued events have been
+        dispatched.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait
+                for the worker thread to finish; by default waits
+                indefinitely.
+        """
+        with self.__condition:
+            if not self.__running:
+                return
+            self.__running = False
+            self.__condition.notify()
+            thread = self.__thread
+        thread.join(timeout)
+
+    def get_stats(self):
+        # type: () -> EventDispatcherStats
+        """
+        Gets the dispatcher counters. Latencies are the time in seconds from
+        the UL posting an event to its first callback being invoked.
+
+        Returns:
+            EventDispatcherStats:
+
+            A named tuple containing the current and maximum queue depth, the
+            number of events received, dispatched, coalesced and dropped,
+            the number of callbacks that raised an exception, and the last,
+            maximum and mean latency.
+        """
+        with self.__condition:
+            mean_latency = (self.__total_latency / self.__dispatched
+                            if self.__dispatched else 0.0)
+            return EventDispatcherStats(
+                self.__count, self.__max_queue_depth, self.__received,
+                self.__dispatched, self.__coalesced, self.__dropped,
+                self.__callback_errors, self.__last_latency,
+                self.__max_latency, mean_latency)
+
+    def __run(self):
+        condition = self.__condition
+        while True:
+            with condition:
+                while not self.__count and self.__running:
+                    condition.wait()
+                if not self.__count:
+                    return
+                slot = self.__slots[self.__head]
+                event_type, event_data, timestamp, handle = slot
+                self.__head = (self.__head + 1) % self.__size
+                self.__count -= 1
+                subscribers = self.__subscribers.get((handle, event_type), ())
+
+                latency = monotonic() - timestamp
+                self.__dispatched += 1
+                self.__last_latency = latency
+                self.__total_latency += latency
+                if latency > self.__max_latency:
+                    self.__max_latency = latency
+
+            for event_callback_function, user_data in subscribers:
+                try:
+                    event_callback_function(EventCallbackArgs(
+                        event_type, event_data, user_data))
+                except Exception:
+                    self.__callback_errors += 1
+                    print_exc()
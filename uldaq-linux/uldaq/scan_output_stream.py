@@ -0,0 +1,305 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from collections import namedtuple
+from ctypes import Array
+from threading import Event, Thread
+from .ul_enums import ScanStatus, ULError
+from .ul_exception import ULException
+from .buffer_management import ScanBuffer
+from .utils import monotonic
+
+"""A named tuple containing the counters of a :class:`ScanOutputStream`.
+Returned by :func:`ScanOutputStream.get_stats`. The margins are the
+time in seconds of data still queued in the buffer when a refill started;
+a margin close to zero means the refills barely keep up."""
+OutputStreamStats = namedtuple(
+    'OutputStreamStats',
+    'scans_written scans_output refill_count underrun_count '
+    'underrun_scans min_margin last_margin max_refill_time')
+
+
+class ScanOutputStream:
+    """
+    Streams data from a source to a running CONTINUOUS output scan by
+    refilling the parts of the scan buffer the device has already output.
+
+    Instances are obtained by calling :func:`AoDevice.stream_out`. The buffer
+    holds a whole number of blocks, two by default so that one half is
+    refilled while the other is output. A background thread polls the scan
+    status and writes the next block as soon as the device has finished
+    with one; the scan is stopped once the source is exhausted and all of its
+    data has been output, or when the stream is closed.
+
+    If the device outputs scans that have not been refilled yet, the stale
+    data is counted as an underrun. Unless stop_on_underrun is set, the
+    stream then resynchronizes ahead of the device and carries on.
+
+    Args:
+        data (ScanBuffer or Array): The scan buffer; its size must be a
+            multiple of block_size scans.
+        source: Either an object with a fill method, such as a
+            :class:`WaveformGenerator`, or an iterable of ndarray blocks. Each
+            block holds a whole number of scans, as a (scans, channels)
+            array or as interleaved samples; blocks need not be block_size
+            scans long.
+        number_of_channels (int): The number of channels in each scan.
+        start_scan (function): Starts the scan once the buffer is filled and
+            returns the actual scan rate.
+        get_scan_status (function): The scan status method of the subsystem.
+        scan_stop (function): The scan stop method of the subsystem.
+        block_size (int): The number of scans written by each refill.
+        stop_on_underrun (Optional[bool]): If True, an underrun stops the
+            stream with a :class:`ULException` with the
+            :class:`~ULError.UNDERRUN` error code. The default is False.
+
+    Raises:
+        :class:`ULException`: The scan could not be started.
+    """
+    def __init__(self, data, source, number_of_channels, start_scan,
+                 get_scan_status, scan_stop, block_size,
+                 stop_on_underrun=False):
+        if isinstance(data, ScanBuffer):
+            array = data.array
+        elif isinstance(data, Array):
+            from numpy.ctypeslib import as_array
+            array = as_array(data)
+        else:
+            array = data
+        self.__data = data
+        self.__scans = array.reshape(-1, number_of_channels)
+        capacity = len(self.__scans)
+        if not block_size or capacity % block_size or capacity < block_size:
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        self.__capacity = capacity
+        self.__block_size = block_size
+        self.__number_of_channels = number_of_channels
+        self.__get_scan_status = get_scan_status
+        self.__scan_stop = scan_stop
+        self.__stop_on_underrun = stop_on_underrun
+
+        if hasattr(source, 'fill'):
+            self.__fill = source.fill
+            self.__source = None
+        else:
+            self.__fill = None
+            self.__source = iter(source)
+        self.__pending = None
+        self.__exhausted = False
+
+        self.__stop = Event()
+        self.__error = None
+        self.__scans_written = 0
+        self.__scans_output = 0
+        self.__refill_count = 0
+        self.__underrun_count = 0
+        self.__underrun_scans = 0
+        self.__min_margin = None
+        self.__last_margin = None
+        self.__max_refill_time = 0.0
+
+        # The whole buffer is filled before the scan starts
+        self.__scans_written = self.__write(0, capacity)
+        self.__end = self.__scans_written if self.__exhausted else None
+        self.__hold(self.__scans_written, capacity)
+        self.__rate = start_scan()
+        self.__thread = Thread(target=self.__run, name='ScanOutputStream')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exe_type, exe_value, exe_traceback):
+        self.close()
+
+    @property
+    def rate(self):
+        """The actual scan rate in scans per second."""
+        return self.__rate
+
+    @property
+    def block_size(self):
+        """The number of scans written by each refill."""
+        return self.__block_size
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return self.__number_of_channels
+
+    def is_running(self):
+        # type: () -> bool
+        """
+        Returns True until the stream has output all of the source's data,
+        been closed or failed.
+        """
+        return self.__thread.is_alive()
+
+    def wait(self, timeout=None):
+        # type: (float) -> bool
+        """
+        Waits until the stream ends.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds; by
+                default the call waits indefinitely.
+
+        Returns:
+            bool:
+
+            True if the stream has ended, False if the timeout elapsed.
+
+        Raises:
+            :class:`ULException`: The stream ended because of an error, such
+            as an underrun with stop_on_underrun set or a scan error.
+            Exception: Any error raised by the source, which also stops the
+            stream.
+        """
+        self.__thread.join(timeout)
+        if self.__thread.is_alive():
+            return False
+        if self.__error is not None:
+            raise self.__error
+        return True
+
+    def close(self):
+        # type: () -> None
+        """
+        Stops the refill thread and the scan, and releases the scan buffer.
+
+        Raises:
+            :class:`ULException`
+        """
+        self.__stop.set()
+        self.__thread.join()
+        self.__data = None
+        self.__scan_stop()
+
+    def get_stats(self):
+        # type: () -> OutputStreamStats
+        """
+        Gets the counters of the stream.
+
+        Returns:
+            OutputStreamStats:
+
+            A named tuple containing the number of scans written to the
+            buffer and output by the device, the number of refills, the
+            number of underruns and of stale scans output, the minimum and
+            last refill margin in seconds, and the longest time taken by a
+            refill in seconds.
+        """
+        return OutputStreamStats(
+            self.__scans_written, self.__scans_output, self.__refill_count,
+            self.__underrun_count, self.__underrun_scans, self.__min_margin,
+            self.__last_margin, self.__max_refill_time)
+
+    def __run(self):
+        try:
+            self.__pump()
+        except Exception as error:
+            # Errors raised by the source are re-raised by wait()
+            self.__error = error
+        finally:
+            # The device would otherwise keep replaying the buffer
+            try:
+                self.__scan_stop()
+            except ULException:
+                pass
+
+    def __pump(self):
+        block_size = self.__block_size
+        capacity = self.__capacity
+        rate = self.__rate
+        while not self.__stop.is_set():
+            status, transfer_status = self.__get_scan_status()
+            output = transfer_status.current_scan_count
+            self.__scans_output = output
+            if status == ScanStatus.IDLE:
+                return
+
+            written = self.__scans_written
+            if self.__end is not None:
+                # The source is exhausted; the rest of the buffer holds the
+                # last scan until the device reaches the end of the data.
+                if output >= self.__end:
+                    return
+                self.__stop.wait((self.__end - output) / rate)
+                continue
+
+            if output > written:
+                self.__underrun_count += 1
+                self.__underrun_scans += output - written
+                if self.__stop_on_underrun:
+                    raise ULException(ULError.UNDERRUN)
+                written = self.__scans_written = output
+
+            free = output + capacity - written
+            if free < block_size:
+                self.__stop.wait((block_size - free) / rate)
+                continue
+
+            margin = (written - output) / rate
+            self.__last_margin = margin
+            if self.__min_margin is None or margin < self.__min_margin:
+                self.__min_margin = margin
+
+            start = monotonic()
+            count = self.__write(written, block_size)
+            self.__max_refill_time = max(self.__max_refill_time,
+                                         monotonic() - start)
+            self.__refill_count += 1
+            self.__scans_written = written + count
+            if self.__exhausted:
+                self.__end = written + count
+                self.__hold(self.__end, output + capacity)
+
+    def __write(self, first_scan, count):
+        # Writes up to count scans from the source at scan index first_scan,
+        # wrapping around the end of the buffer; returns the number written
+        capacity = self.__capacity
+        written = 0
+        while written < count and not self.__exhausted:
+            start = (first_scan + written) % capacity
+            end = min(start + count - written, capacity)
+            written += self.__read(self.__scans[start:end])
+        return written
+
+    def __read(self, out):
+        # Fills out from the source, returning fewer scans than requested
+        # only when the source is exhausted
+        if self.__fill is not None:
+            return self.__fill(out)
+        from numpy import asarray
+
+        done = 0
+        while done < len(out):
+            block = self.__pending
+            if block is None:
+                try:
+                    block = next(self.__source)
+                except StopIteration:
+                    self.__exhausted = True
+                    break
+                block = asarray(block).reshape(-1, self.__number_of_channels)
+            count = min(len(out) - done, len(block))
+            out[done:done + count] = block[:count]
+            done += count
+            self.__pending = block[count:] if count < len(block) else None
+        return done
+
+    def __hold(self, first_scan, end_scan):
+        # Repeats the last scan written in the buffer up to end_scan so the
+        # device does not output stale data after the end of the source
+        capacity = self.__capacity
+        if first_scan >= end_scan or not first_scan:
+            return
+        last = self.__scans[(first_scan - 1) % capacity].copy()
+        start = first_scan % capacity
+        count = min(end_scan - first_scan, capacity)
+        head = min(count, capacity - start)
+        self.__scans[start:start + head] = last
+        self.__scans[:count - head] = last
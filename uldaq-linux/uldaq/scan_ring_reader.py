@@ -0,0 +1,215 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from .ul_enums import ULError
+from .ul_exception import ULException
+from .buffer_management import ScanBuffer
+
+
+class ScanRingReader:
+    """
+    Reads the samples of a CONTINUOUS (or finite) input scan out of its
+    buffer as they arrive, handling buffer wraparound and detecting overruns.
+
+    The reader keeps track of the number of scans (one sample per channel)
+    already consumed and compares it with the total count reported by the
+    subsystem's scan status function; newly arrived scans are returned as
+    ndarray views of the scan buffer. Requires NumPy.
+
+    Args:
+        data (ScanBuffer or Array): The buffer passed to the scan function,
+            created with one of the buffer management functions.
+        get_scan_status (function): The scan status method of the subsystem
+            running the scan, such as :func:`AiDevice.get_scan_status`,
+            :func:`DaqiDevice.get_scan_status`, :func:`CtrDevice.get_scan_status`
+            or :func:`DioDevice.d_in_get_scan_status`.
+        number_of_channels (Optional[int]): The number of channels, counters
+            or ports in the scan; may be omitted when data is a
+            :class:`ScanBuffer`.
+        skip_overruns (Optional[bool]): On an overrun the scans that have
+            been overwritten, and the oldest scans that are about to be, are
+            skipped and counted in :attr:`lost_scan_count`. If True, reading
+            then carries on with the remaining intact scans; otherwise a
+            :class:`ULException` is raised. The default is False.
+
+    Raises:
+        :class:`ULException`
+    """
+    def __init__(self, data, get_scan_status, number_of_channels=None,
+                 skip_overruns=False):
+        if isinstance(data, ScanBuffer):
+            array = data.array
+            if number_of_channels is None:
+                number_of_channels = data.number_of_channels
+        else:
+            from numpy.ctypeslib import as_array
+            array = as_array(data)
+
+        if (not number_of_channels or number_of_channels < 0
+                or len(array) % number_of_channels != 0):
+            raise ULException(ULError.BAD_NUM_CHANS)
+
+        self.__scans = array.reshape(-1, number_of_channels)
+        self.__capacity = len(self.__scans)
+        self.__number_of_channels = number_of_channels
+        self.__get_scan_status = get_scan_status
+        self.__skip_overruns = skip_overruns
+        self.__scans_read = 0
+        self.__overrun_count = 0
+        self.__lost_scan_count = 0
+
+    @property
+    def capacity(self):
+        """The number of scans the buffer holds."""
+        return self.__capacity
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return self.__number_of_channels
+
+    @property
+    def scans_read(self):
+        """The index of the next scan to be read, which is also the number
+        of scans read or skipped since the scan started."""
+        return self.__scans_read
+
+    @property
+    def overrun_count(self):
+        """The number of overruns detected."""
+        return self.__overrun_count
+
+    @property
+    def lost_scan_count(self):
+        """The number of scans skipped because they were overwritten, or
+        about to be, before they could be read."""
+        return self.__lost_scan_count
+
+    def get_scans_available(self):
+        # type: () -> int
+        """
+        Gets the number of scans transferred to the buffer but not yet read.
+
+        Returns:
+            int:
+
+            The number of unread scans; larger than :attr:`capacity` if the
+            buffer has been overrun.
+
+        Raises:
+            :class:`ULException`
+        """
+        transfer_status = self.__get_scan_status()[1]
+        total_scans = (transfer_status.current_total_count
+                       // self.__number_of_channels)
+        return total_scans - self.__scans_read
+
+    def read_views(self, max_scans=None):
+        # type: (int) -> tuple[int, list]
+        """
+        Returns the newly arrived scans without copying them.
+
+        The returned views share memory with the scan buffer, so they must be
+        consumed before the device wraps around and overwrites them.
+
+        Args:
+            max_scans (Optional[int]): The maximum number of scans to return;
+                by default all unread scans are returned.
+
+        Returns:
+            int, list[ndarray]:
+
+            A tuple containing the index of the first returned scan since the
+            start of the scan, and a list of zero, one or two
+            (scans, number_of_channels) views; there are two views when the
+            data wraps around the end of the buffer.
+
+        Raises:
+            :class:`ULException`
+        """
+        available = self.__check_overrun(self.get_scans_available())
+        if max_scans is not None and max_scans < available:
+            available = max_scans
+
+        first_scan = self.__scans_read
+        if available <= 0:
+            return first_scan, []
+
+        start = first_scan % self.__capacity
+        end = start + available
+        if end <= self.__capacity:
+            views = [self.__scans[start:end]]
+        else:
+            views = [self.__scans[start:],
+                     self.__scans[:end - self.__capacity]]
+
+        self.__scans_read += available
+        return first_scan, views
+
+    def read(self, max_scans=None):
+        # type: (int) -> tuple[int, ndarray]
+        """
+        Returns the newly arrived scans as one contiguous array.
+
+        The array is a view of the scan buffer when the data does not wrap
+        around the end of the buffer, and a copy otherwise.
+
+        Args:
+            max_scans (Optional[int]): The maximum number of scans to return;
+                by default all unread scans are returned.
+
+        Returns:
+            int, ndarray:
+
+            A tuple containing the index of the first returned scan since the
+            start of the scan, and a (scans, number_of_channels) array.
+
+        Raises:
+            :class:`ULException`
+        """
+        first_scan, views = self.read_views(max_scans)
+        if len(views) == 1:
+            return first_scan, views[0]
+        if not views:
+            return first_scan, self.__scans[:0]
+
+        from numpy import concatenate
+        return first_scan, concatenate(views)
+
+    def is_overrun(self, scans_in_use=0):
+        # type: (int) -> bool
+        """
+        Checks whether the device has overwritten scans that have not been
+        read, or that are still in use, such as the views returned by the
+        last call to :func:`read_views` once they have been processed.
+
+        Args:
+            scans_in_use (Optional[int]): The number of scans preceding the
+                read position that must still be intact; the default is 0.
+
+        Returns:
+            bool:
+
+            True if the device has written over any of those scans.
+
+        Raises:
+            :class:`ULException`
+        """
+        return self.get_scans_available() + scans_in_use > self.__capacity
+
+    def __check_overrun(self, available):
+        if available <= self.__capacity:
+            return available
+
+        # Skip the overwritten scans and a margin of the oldest intact ones,
+        # which the device may overwrite while they are being read.
+        lost = min(available - self.__capacity + self.__capacity // 8,
+                   available)
+        self.__overrun_count += 1
+        self.__lost_scan_count += lost
+        self.__scans_read += lost
+        if not self.__skip_overruns:
+            raise ULException(ULError.OVERRUN)
+        return available - lost
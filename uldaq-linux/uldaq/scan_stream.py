@@ -0,0 +1,165 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from time import sleep
+from .ul_enums import ScanStatus, ULError
+from .ul_exception import ULException
+from .utils import monotonic
+
+
+def _stream_buffer_blocks(rate, block_size, buffer_blocks=None):
+    # type: (float, int, int) -> int
+    """Number of blocks in a stream buffer; by default the buffer holds at
+    least one second of data and no fewer than four blocks."""
+    if buffer_blocks is not None:
+        return max(buffer_blocks, 2)
+    blocks_per_second = int(rate // block_size) + 1
+    return max(blocks_per_second, 4)
+
+
+class ScanStream:
+    """
+    An iterator over fixed-size blocks of a running CONTINUOUS input scan.
+
+    Instances are obtained by calling :func:`AiDevice.stream`,
+    :func:`DaqiDevice.stream` or :func:`CtrDevice.stream`. Each iteration
+    yields a tuple containing the block index, a
+    (block_size, number_of_channels) ndarray and the index of the first scan
+    in the block since the start of the scan. The scan is stopped and its
+    buffer released when the stream is closed, exhausted or garbage collected.
+
+    The yielded arrays are views of the scan buffer; each one remains valid
+    until the following block is requested. If the device overwrites a block
+    while it is still in use, the next iteration raises a
+    :class:`ULException` with the :class:`~ULError.OVERRUN` error code.
+
+    Args:
+        data (ScanBuffer): The buffer the scan is writing to; its size must be
+            a multiple of block_size scans.
+        get_scan_status (function): The scan status method of the subsystem.
+        scan_stop (function): The scan stop method of the subsystem.
+        rate (float): The actual scan rate in scans per second.
+        block_size (int): The number of scans in each block.
+        stall_timeout (Optional[float]): If set, a scan that reports RUNNING
+            but acquires no data for this many seconds is considered dead and
+            the iteration raises a :class:`ULException` with the
+            :class:`~ULError.TIMEDOUT` error code.
+    """
+    def __init__(self, data, get_scan_status, scan_stop, rate, block_size,
+                 stall_timeout=None):
+        self.__data = data
+        self.__blocks = data.by_channel.reshape(-1, block_size,
+                                                data.number_of_channels)
+        self.__get_scan_status = get_scan_status
+        self.__scan_stop = scan_stop
+        self.__rate = rate
+        self.__block_size = block_size
+        self.__number_of_channels = data.number_of_channels
+        self.__block_index = 0
+        self.__stall_timeout = stall_timeout
+        self.__closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> tuple[int, ndarray, int]
+        if self.__closed:
+            raise StopIteration
+
+        try:
+            self.__wait_for_block()
+        except BaseException:
+            self.close()
+            raise
+
+        block_index = self.__block_index
+        self.__block_index += 1
+        block = self.__blocks[block_index % len(self.__blocks)]
+        return block_index, block, block_index * self.__block_size
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exe_type, exe_value, exe_traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except ULException:
+            pass
+
+    @property
+    def rate(self):
+        """The actual scan rate in scans per second."""
+        return self.__rate
+
+    @property
+    def block_size(self):
+        """The number of scans in each block."""
+        return self.__block_size
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return self.__number_of_channels
+
+    @property
+    def blocks_read(self):
+        """The number of blocks returned so far."""
+        return self.__block_index
+
+    def close(self):
+        # type: () -> None
+        """
+        Stops the scan and releases the scan buffer. Further iterations raise
+        StopIteration.
+
+        Raises:
+            :class:`ULException`
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        # The device writes into the buffer until the scan is stopped
+        try:
+            self.__scan_stop()
+        finally:
+            self.__blocks = None
+            self.__data = None
+
+    def __wait_for_block(self):
+        block_size = self.__block_size
+        capacity = len(self.__blocks) * block_size
+        first_scan = self.__block_index * block_size
+        # The previous block stays in use until this call
+        scans_in_use = block_size if self.__block_index else 0
+        last_count = None
+        last_progress = monotonic()
+
+        while True:
+            status, transfer_status = self.__get_scan_status()
+            total_count = transfer_status.current_total_count
+            available = (total_count // self.__number_of_channels) - first_scan
+            if available + scans_in_use > capacity:
+                raise ULException(ULError.OVERRUN)
+            if available >= block_size:
+                return
+            if status == ScanStatus.IDLE:
+                raise StopIteration
+            if self.__stall_timeout is not None:
+                now = monotonic()
+                if total_count != last_count:
+                    last_count = total_count
+                    last_progress = now
+                elif now - last_progress > self.__stall_timeout:
+                    raise ULException(ULError.TIMEDOUT)
+
+            # Sleep for roughly the time it takes the block to fill
+            wait = (block_size - available) / self.__rate
+            sleep(min(max(wait, 0.001), 0.1))
@@ -0,0 +1,317 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+Keeps a continuous analog input scan running across connection losses. The
+supervisor reconnects the device with exponential backoff, replays the
+configuration and restarts the scan, and reports each interruption as a gap
+in the sample stream.
+"""
+from collections import namedtuple
+from threading import Event
+from .ul_enums import AInScanFlag, ScanOption, ULError
+from .ul_exception import ULException
+from .buffer_management import create_float_ndarray_buffer
+from .scan_stream import ScanStream, _stream_buffer_blocks
+from .utils import monotonic
+
+"""A named tuple describing an interruption of a supervised scan: the
+monotonic time at which the last block before the gap ended and the scan
+restarted, its duration in seconds, the estimated number of samples per
+channel missed, and the :class:`ULException` that interrupted the scan."""
+ScanGap = namedtuple('ScanGap',
+                     'start_time end_time duration samples_missed error')
+
+"""A named tuple containing a block returned by a :class:`ScanSupervisor`:
+the segment number (incremented each time the scan is restarted), the index
+of the block in the supervised stream, the (block_size, number_of_channels)
+ndarray, the index of its first sample on a timeline that includes the
+samples missed during gaps, and the :class:`ScanGap` preceding the block, or
+None if the block directly follows the previous one."""
+SupervisedBlock = namedtuple(
+    'SupervisedBlock',
+    'segment block_index data first_sample_index gap')
+
+"""A named tuple containing the counters of a :class:`ScanSupervisor`.
+Returned by :func:`ScanSupervisor.get_stats`."""
+ScanSupervisorStats = namedtuple(
+    'ScanSupervisorStats',
+    'gap_count total_gap_duration max_gap_duration last_gap_duration '
+    'samples_missed reconnect_attempts')
+
+
+class ScanSupervisor:
+    """
+    Runs a CONTINUOUS analog input scan on a device and restarts it when it
+    fails, for example when an Ethernet device loses its link.
+
+    Iterating the supervisor after calling :func:`a_in_stream` yields
+    :class:`SupervisedBlock` tuples. When the scan fails, because a
+    :class:`ULException` is raised, :func:`DaqDevice.is_connected` returns
+    False or the scan count stops advancing, the supervisor:
+
+    1. stops the scan,
+    2. reconnects the device if needed, retrying with exponential backoff,
+    3. calls every configuration function added with
+       :func:`add_configuration`, and
+    4. restarts the scan.
+
+    The first block after the restart carries a :class:`ScanGap` describing
+    the interruption instead of the error being raised.
+
+    The yielded arrays are views of the scan buffer and remain valid until
+    the next iteration.
+
+    Args:
+        daq_device (DaqDevice): The device to supervise.
+        connection_code (Optional[int]): The connection code used to
+            reconnect Ethernet devices; the default is 0.
+        initial_backoff (Optional[float]): The delay in seconds after the
+            first failed reconnection attempt; the default is 0.5.
+        max_backoff (Optional[float]): The maximum delay in seconds between
+            reconnection attempts; the default is 30.
+        max_attempts (Optional[int]): The number of consecutive failed
+            reconnection attempts after which the last error is raised; by
+            default the supervisor retries indefinitely.
+        check_interval (Optional[float]): The interval in seconds between
+            calls to :func:`DaqDevice.is_connected`; the default is 1.
+        stall_timeout (Optional[float]): The time in seconds without new
+            samples after which the scan is considered stalled; by default
+            four block periods, and at least two seconds.
+    """
+    def __init__(self, daq_device, connection_code=0, initial_backoff=0.5,
+                 max_backoff=30.0, max_attempts=None, check_interval=1.0,
+                 stall_timeout=None):
+        self.__daq_device = daq_device
+        self.__connection_code = connection_code
+        self.__initial_backoff = initial_backoff
+        self.__max_backoff = max_backoff
+        self.__max_attempts = max_attempts
+        self.__check_interval = check_interval
+        self.__stall_timeout = stall_timeout
+        self.__configuration = []
+        self.__closed = Event()
+
+        self.__start_scan = None
+        self.__stream = None
+        self.__rate = 0.0
+        self.__segment = 0
+        self.__block_index = 0
+        self.__segment_start_time = 0.0
+        self.__segment_offset = 0
+        self.__next_sample_index = 0
+        self.__last_check = 0.0
+        self.__error = None
+        self.__pending_gap = None
+
+        self.__gap_count = 0
+        self.__total_gap_duration = 0.0
+        self.__max_gap_duration = 0.0
+        self.__last_gap_duration = 0.0
+        self.__samples_missed = 0
+        self.__reconnect_attempts = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> SupervisedBlock
+        while not self.__closed.is_set():
+            if self.__stream is None:
+                if self.__start_scan is None:
+                    break
+                self.__recover()
+                continue
+            try:
+                self.__check_connection()
+                _, data, first_scan = next(self.__stream)
+            except (ULException, StopIteration) as error:
+                if isinstance(error, StopIteration):
+                    # A CONTINUOUS scan only ends when it is stopped
+                    error = ULException(ULError.DEAD_DEV)
+                self.__interrupted(error)
+                continue
+
+            first_sample_index = self.__segment_offset + first_scan
+            self.__next_sample_index = first_sample_index + len(data)
+            gap, self.__pending_gap = self.__pending_gap, None
+            block = SupervisedBlock(self.__segment, self.__block_index, data,
+                                    first_sample_index, gap)
+            self.__block_index += 1
+            return block
+        raise StopIteration
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exe_type, exe_value, exe_traceback):
+        self.close()
+
+    @property
+    def rate(self):
+        """The actual scan rate in scans per second."""
+        return self.__rate
+
+    def add_configuration(self, configure_function):
+        # type: (function) -> None
+        """
+        Adds a function that configures the device, such as loading the A/D
+        queue or setting the trigger. It is called immediately if the device
+        is connected, and again after every reconnection, before the scan is
+        restarted.
+
+        Args:
+            configure_function (function): Called with the
+                :class:`DaqDevice`.
+
+        Raises:
+            :class:`ULException`
+        """
+        self.__configuration.append(configure_function)
+        if self.__daq_device.is_connected():
+            configure_function(self.__daq_device)
+
+    def a_in_stream(self, low_channel, high_channel, input_mode,
+                    analog_range, rate, block_size,
+                    options=ScanOption.DEFAULTIO, flags=AInScanFlag.DEFAULT,
+                    buffer_blocks=None):
+        # type: (int, int, AiInputMode, Range, float, int, ScanOption, AInScanFlag, int) -> ScanSupervisor
+        """
+        Starts the supervised CONTINUOUS scan of a range of A/D channels. The
+        device must be connected. The arguments are those of
+        :func:`AiDevice.stream`.
+
+        Returns:
+            ScanSupervisor:
+
+            The supervisor, which is iterated to read the blocks.
+
+        Raises:
+            :class:`ULException`: The scan could not be started.
+        """
+        ai_device = self.__daq_device.get_ai_device()
+        if ai_device is None:
+            raise ULException(ULError.BAD_DEV_TYPE)
+        number_of_channels = high_channel - low_channel + 1
+        blocks = _stream_buffer_blocks(rate, block_size, buffer_blocks)
+        data = create_float_ndarray_buffer(number_of_channels,
+                                           blocks * block_size)
+        stall_timeout = self.__stall_timeout
+        if stall_timeout is None:
+            stall_timeout = max(2.0, 4.0 * block_size / rate)
+
+        def start_scan():
+            actual_rate = ai_device.a_in_scan(
+                low_channel, high_channel, input_mode, analog_range,
+                blocks * block_size, rate, options | ScanOption.CONTINUOUS,
+                flags, data)
+            stream = ScanStream(data, ai_device.get_scan_status,
+                                ai_device.scan_stop, actual_rate, block_size,
+                                stall_timeout)
+            return actual_rate, stream
+
+        self.__rate, self.__stream = start_scan()
+        self.__start_scan = start_scan
+        self.__segment_start_time = self.__last_check = monotonic()
+        return self
+
+    def close(self):
+        # type: () -> None
+        """
+        Stops the scan and any reconnection in progress. Can be called from
+        another thread to end the iteration.
+        """
+        self.__closed.set()
+        self.__close_stream()
+
+    def get_stats(self):
+        # type: () -> ScanSupervisorStats
+        """
+        Gets the gap counters of the supervisor.
+
+        Returns:
+            ScanSupervisorStats:
+
+            A named tuple containing the number of gaps, their total, maximum
+            and last duration in seconds, the total number of samples per
+            channel missed, and the number of failed reconnection attempts.
+        """
+        return ScanSupervisorStats(
+            self.__gap_count, self.__total_gap_duration,
+            self.__max_gap_duration, self.__last_gap_duration,
+            self.__samples_missed, self.__reconnect_attempts)
+
+    def __check_connection(self):
+        now = monotonic()
+        if now - self.__last_check < self.__check_interval:
+            return
+        self.__last_check = now
+        if not self.__daq_device.is_connected():
+            raise ULException(ULError.DEAD_DEV)
+
+    def __close_stream(self):
+        stream, self.__stream = self.__stream, None
+        if stream is not None:
+            try:
+                stream.close()
+            except ULException:
+                pass
+
+    def __interrupted(self, error):
+        self.__close_stream()
+        self.__error = error
+
+    def __recover(self):
+        daq_device = self.__daq_device
+        backoff = self.__initial_backoff
+        attempts = 0
+        while not self.__closed.is_set():
+            try:
+                if not daq_device.is_connected():
+                    daq_device.connect(self.__connection_code)
+                for configure_function in self.__configuration:
+                    configure_function(daq_device)
+                rate, stream = self.__start_scan()
+                break
+            except ULException:
+                attempts += 1
+                self.__reconnect_attempts += 1
+                if (self.__max_attempts is not None
+                        and attempts >= self.__max_attempts):
+                    self.close()
+                    raise
+                try:
+                    daq_device.disconnect()
+                except ULException:
+                    pass
+                self.__closed.wait(backoff)
+                backoff = min(backoff * 2, self.__max_backoff)
+        else:
+            return
+
+        # The gap runs from the end of the last block returned to the start
+        # of the new scan.
+        now = monotonic()
+        samples_in_segment = self.__next_sample_index - self.__segment_offset
+        gap_start = (self.__segment_start_time
+                     + samples_in_segment / float(self.__rate))
+        duration = max(now - gap_start, 0.0)
+        samples_missed = int(round(duration * self.__rate))
+        self.__pending_gap = ScanGap(gap_start, now, duration, samples_missed,
+                                     self.__error)
+
+        self.__gap_count += 1
+        self.__total_gap_duration += duration
+        self.__max_gap_duration = max(self.__max_gap_duration, duration)
+        self.__last_gap_duration = duration
+        self.__samples_missed += samples_missed
+
+        self.__stream = stream
+        self.__rate = rate
+        self.__segment += 1
+        self.__segment_offset = self.__next_sample_index + samples_missed
+        self.__next_sample_index = self.__segment_offset
+        self.__segment_start_time = self.__last_check = now
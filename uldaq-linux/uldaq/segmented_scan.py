@@ -0,0 +1,229 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from time import sleep
+from .ul_enums import ScanStatus, ULError
+from .ul_exception import ULException
+from .buffer_management import ScanBuffer
+from .utils import monotonic
+
+_POLL_INTERVAL = 0.001
+
+
+class SegmentedScan:
+    """
+    An iterator over the segments of an input scan started with
+    :class:`~ScanOption.RETRIGGER`, one segment per trigger.
+
+    Each trigger acquires the retrigger_sample_count scans passed to the
+    subsystem's set_trigger method, and the device writes the segments back
+    to back in the scan buffer. The segment boundaries are derived from the
+    total count reported by the scan status function: segment n holds scans
+    n * segment_size to (n + 1) * segment_size - 1 since the start of the
+    scan. Each iteration yields a tuple containing the trigger number and a
+    (segment_size, number_of_channels) ndarray view of the scan buffer; the
+    buffer must hold a whole number of segments so that no segment wraps
+    around its end. The iteration ends once the scan is no longer running and
+    every complete segment has been returned.
+
+    With average set, every segment returned is added to a running sum, so
+    signal averaging across thousands of triggers keeps a single segment in
+    memory; :func:`get_average` returns the mean so far and
+    :func:`average_segments` consumes the segments and returns the mean.
+
+    The yielded arrays remain valid until the following segment is
+    requested. If the device overwrites a segment while it is still in use,
+    the next iteration raises a :class:`ULException` with the
+    :class:`~ULError.OVERRUN` error code. Works with the scans of
+    :class:`AiDevice`, :class:`DaqiDevice`, :class:`CtrDevice` and
+    :class:`DioDevice`. Requires NumPy.
+
+    Args:
+        data (ScanBuffer or Array): The buffer passed to the scan function.
+        get_scan_status (function): The scan status method of the subsystem
+            running the scan, such as :func:`AiDevice.get_scan_status`.
+        segment_size (int): The number of scans acquired per trigger; the
+            retrigger_sample_count passed to set_trigger.
+        number_of_channels (Optional[int]): The number of channels, counters
+            or ports in the scan; may be omitted when data is a
+            :class:`ScanBuffer`.
+        average (Optional[bool]): If True, the segments returned are
+            averaged. The default is False.
+        timeout (Optional[float]): If set, an iteration that waits longer
+            than this many seconds for a segment to complete raises a
+            :class:`ULException` with the :class:`~ULError.TIMEDOUT` error
+            code, for instance when the triggers stop.
+
+    Raises:
+        :class:`ULException`: The buffer does not hold a whole number of
+        segments.
+    """
+    def __init__(self, data, get_scan_status, segment_size,
+                 number_of_channels=None, average=False, timeout=None):
+        if isinstance(data, ScanBuffer):
+            array = data.array
+            if number_of_channels is None:
+                number_of_channels = data.number_of_channels
+        else:
+            from numpy.ctypeslib import as_array
+            array = as_array(data)
+
+        if (not number_of_channels or number_of_channels < 0
+                or len(array) % number_of_channels != 0):
+            raise ULException(ULError.BAD_NUM_CHANS)
+        capacity = len(array) // number_of_channels
+        if segment_size < 1 or capacity % segment_size:
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+
+        self.__data = data
+        self.__segments = array.reshape(-1, segment_size, number_of_channels)
+        self.__get_scan_status = get_scan_status
+        self.__segment_size = segment_size
+        self.__number_of_channels = number_of_channels
+        self.__timeout = timeout
+        self.__segment_index = 0
+        self.__sum = None
+        self.__average_count = 0
+        self.__average = average
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> tuple[int, ndarray]
+        self.__wait_for_segment()
+        trigger_number = self.__segment_index
+        self.__segment_index += 1
+        segment = self.__segments[trigger_number % len(self.__segments)]
+        if self.__average:
+            self.__accumulate(segment)
+        return trigger_number, segment
+
+    next = __next__
+
+    @property
+    def segment_size(self):
+        """The number of scans in each segment."""
+        return self.__segment_size
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return self.__number_of_channels
+
+    @property
+    def segments_read(self):
+        """The number of segments returned so far."""
+        return self.__segment_index
+
+    @property
+    def average_count(self):
+        """The number of segments in the running average."""
+        return self.__average_count
+
+    def get_segments_available(self):
+        # type: () -> int
+        """
+        Gets the number of complete segments not yet returned.
+
+        Returns:
+            int:
+
+            The number of segments; larger than the number of segments the
+            buffer holds if the buffer has been overrun.
+
+        Raises:
+            :class:`ULException`
+        """
+        transfer_status = self.__get_scan_status()[1]
+        return self.__complete_segments(transfer_status) - self.__segment_index
+
+    def get_average(self):
+        # type: () -> ndarray
+        """
+        Gets the mean of the segments averaged so far.
+
+        Returns:
+            ndarray:
+
+            A new (segment_size, number_of_channels) float64 array, or None if
+            no segment has been averaged.
+        """
+        if not self.__average_count:
+            return None
+        return self.__sum / self.__average_count
+
+    def reset_average(self):
+        # type: () -> None
+        """Discards the running average; the following segments start a new
+        one."""
+        self.__sum = None
+        self.__average_count = 0
+
+    def average_segments(self, count=None):
+        # type: (int) -> ndarray
+        """
+        Consumes segments, adding each one to the running average, and
+        returns the mean.
+
+        Args:
+            count (Optional[int]): The number of segments to consume; by
+                default segments are consumed until the scan ends.
+
+        Returns:
+            ndarray:
+
+            The mean of all segments averaged since the last reset, as
+            returned by :func:`get_average`.
+
+        Raises:
+            :class:`ULException`
+        """
+        consumed = 0
+        while count is None or consumed < count:
+            try:
+                _, segment = next(self)
+            except StopIteration:
+                break
+            if not self.__average:
+                self.__accumulate(segment)
+            consumed += 1
+        return self.get_average()
+
+    def __accumulate(self, segment):
+        if self.__sum is None:
+            self.__sum = segment.astype(float)
+        else:
+            self.__sum += segment
+        self.__average_count += 1
+
+    def __complete_segments(self, transfer_status):
+        total_scans = (transfer_status.current_total_count
+                       // self.__number_of_channels)
+        return total_scans // self.__segment_size
+
+    def __wait_for_segment(self):
+        # The previous segment stays in use until this call
+        in_use = 1 if self.__segment_index else 0
+        started = monotonic()
+        while True:
+            status, transfer_status = self.__get_scan_status()
+            available = (self.__complete_segments(transfer_status)
+                         - self.__segment_index)
+            # A partly written segment may already be overwriting the oldest
+            written = (transfer_status.current_total_count
+                       // self.__number_of_channels
+                       - self.__segment_index * self.__segment_size)
+            if (written + in_use * self.__segment_size
+                    > len(self.__segments) * self.__segment_size):
+                raise ULException(ULError.OVERRUN)
+            if available > 0:
+                return
+            if status == ScanStatus.IDLE:
+                raise StopIteration
+            if (self.__timeout is not None
+                    and monotonic() - started > self.__timeout):
+                raise ULException(ULError.TIMEDOUT)
+            sleep(_POLL_INTERVAL)
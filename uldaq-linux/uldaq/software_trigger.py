@@ -0,0 +1,317 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+"""
+from collections import namedtuple
+from .ul_enums import TriggerType, ULError
+from .ul_exception import ULException
+
+"""A named tuple containing one capture of a :class:`SoftwareTrigger`. The
+trigger_index is the index of the trigger scan since the start of the scan,
+and data is a (pre_trigger_samples + post_trigger_samples,
+number_of_channels) ndarray whose row pre_trigger_samples is the trigger
+scan."""
+TriggerCapture = namedtuple('TriggerCapture',
+                            'trigger_number trigger_index data')
+
+_TRIGGER_TYPES = (TriggerType.RISING, TriggerType.FALLING,
+                  TriggerType.GATE_IN_WINDOW, TriggerType.GATE_OUT_WINDOW)
+
+
+class SoftwareTrigger:
+    """
+    Detects analog trigger conditions in the data of a CONTINUOUS input scan
+    and captures a window of scans around each trigger, for devices whose
+    hardware trigger only supports digital conditions.
+
+    Blocks of scans are passed to :func:`process`, or the blocks of a
+    :class:`ScanStream` to :func:`captures`. The trigger conditions of a
+    whole block are evaluated at once; the scans preceding the block are kept
+    in a ring buffer of pre_trigger_samples scans, so a capture can start
+    before the block holding its trigger.
+
+    ===============  ========================================================
+    **Trigger type** **Condition**
+    ---------------  --------------------------------------------------------
+    RISING           The input rises from below level - hysteresis to level
+                     or above.
+    FALLING          The input falls from above level + hysteresis to level or
+                     below.
+    GATE_IN_WINDOW   The input enters the window from level to high_level
+                     after having been more than hysteresis outside of it.
+    GATE_OUT_WINDOW  The input leaves the window from level to high_level
+                     after having been more than hysteresis inside of it.
+    ===============  ========================================================
+
+    After a trigger, the trigger re-arms once holdoff_samples scans have
+    passed and the input has met the arming condition again, so noise on a
+    slow edge does not cause repeated triggers. Captures may overlap when the
+    holdoff is shorter than the capture. Requires NumPy.
+
+    Args:
+        number_of_channels (int): The number of channels in each scan.
+        trigger_channel (int): The index of the trigger channel in the scan,
+            from 0 to number_of_channels - 1.
+        trigger_type (TriggerType): RISING, FALLING, GATE_IN_WINDOW or
+            GATE_OUT_WINDOW.
+        level (float): The trigger level, or the lower limit of the window.
+        pre_trigger_samples (int): The number of scans captured before the
+            trigger scan.
+        post_trigger_samples (int): The number of scans captured from the
+            trigger scan on, including the trigger scan.
+        hysteresis (Optional[float]): The distance from the level the input
+            must reach to arm the trigger; the default is 0.
+        high_level (Optional[float]): The upper limit of the window; required
+            for the window trigger types.
+        holdoff_samples (Optional[int]): The minimum number of scans from a
+            trigger to the next one; the default is 0.
+
+    Raises:
+        :class:`ULException`: An argument is invalid.
+    """
+    def __init__(self, number_of_channels, trigger_channel, trigger_type,
+                 level, pre_trigger_samples, post_trigger_samples,
+                 hysteresis=0.0, high_level=None, holdoff_samples=0):
+        import numpy as np
+
+        if number_of_channels < 1:
+            raise ULException(ULError.BAD_NUM_CHANS)
+        if not 0 <= trigger_channel < number_of_channels:
+            raise ULException(ULError.BAD_TRIG_CHANNEL)
+        if trigger_type not in _TRIGGER_TYPES:
+            raise ULException(ULError.BAD_TRIG_TYPE)
+        window = trigger_type in (TriggerType.GATE_IN_WINDOW,
+                                  TriggerType.GATE_OUT_WINDOW)
+        if window and (high_level is None or high_level < level):
+            raise ULException(ULError.BAD_TRIG_LEVEL)
+        if hysteresis < 0:
+            raise ULException(ULError.BAD_TRIG_LEVEL)
+        if (pre_trigger_samples < 0 or post_trigger_samples < 1
+                or holdoff_samples < 0):
+            raise ULException(ULError.BAD_ARG)
+
+        self.__number_of_channels = number_of_channels
+        self.__trigger_channel = trigger_channel
+        self.__trigger_type = trigger_type
+        self.__level = level
+        self.__high_level = high_level
+        self.__hysteresis = hysteresis
+        self.__pre = pre_trigger_samples
+        self.__post = post_trigger_samples
+        self.__holdoff = holdoff_samples
+        self.__history = np.full((max(pre_trigger_samples, 1),
+                                  number_of_channels), np.nan)
+        self.reset()
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return self.__number_of_channels
+
+    @property
+    def pre_trigger_samples(self):
+        """The number of scans captured before the trigger scan."""
+        return self.__pre
+
+    @property
+    def post_trigger_samples(self):
+        """The number of scans captured from the trigger scan on."""
+        return self.__post
+
+    @property
+    def trigger_count(self):
+        """The number of triggers detected since the last reset."""
+        return self.__trigger_count
+
+    @property
+    def pending_count(self):
+        """The number of triggers whose capture still waits for
+        post-trigger scans."""
+        return len(self.__pending)
+
+    def reset(self):
+        # type: () -> None
+        """
+        Disarms the trigger, discards the pre-trigger history and pending
+        captures, and restarts the trigger numbering.
+        """
+        self.__armed = False
+        self.__holdoff_end = 0
+        self.__next_index = None
+        self.__history_start = 0
+        self.__pending = []
+        self.__trigger_count = 0
+
+    def process(self, data, first_sample_index=None):
+        # type: (ndarray, int) -> list[TriggerCapture]
+        """
+        Evaluates the trigger conditions of a block of scans and returns the
+        captures completed by it.
+
+        Args:
+            data (ndarray): The block, as a (scans, channels) array or as
+                interleaved samples, such as the blocks of
+                :func:`AiDevice.stream`. The block is not kept after the call.
+            first_sample_index (Optional[int]): The index of the first scan in
+                the block since the start of the scan; by default the block
+                follows the previous one. If scans are missing between two
+                blocks, the trigger is disarmed and the missing scans of the
+                captures are NaN.
+
+        Returns:
+            list[TriggerCapture]:
+
+            The completed captures, in trigger order.
+
+        Raises:
+            :class:`ULException`: The block size is not a multiple of the
+            number of channels.
+        """
+        import numpy as np
+
+        data = np.asarray(data)
+        number_of_channels = self.__number_of_channels
+        if data.size % number_of_channels:
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        scans = data.reshape(-1, number_of_channels)
+        count = len(scans)
+
+        start = first_sample_index
+        if start is None:
+            start = self.__next_index if self.__next_index is not None else 0
+        if start != self.__next_index:
+            # Discontinuous data; nothing before the block can be used
+            self.__armed = False
+            self.__history_start = start
+        self.__next_index = start + count
+
+        values = scans[:, self.__trigger_channel]
+        for trigger_index in self.__find_triggers(values, start):
+            self.__start_capture(trigger_index, start)
+
+        completed = []
+        end = start + count
+        pending = []
+        for capture in self.__pending:
+            capture_start = capture.trigger_index - self.__pre
+            self.__copy(capture.data, capture_start, scans, start)
+            if capture_start + len(capture.data) <= end:
+                completed.append(capture)
+            else:
+                pending.append(capture)
+        self.__pending = pending
+        self.__store_history(scans, start)
+        return completed
+
+    def captures(self, blocks):
+        # type: (Iterable) -> Iterator[TriggerCapture]
+        """
+        Processes a sequence of blocks and yields each capture as soon as it
+        is complete.
+
+        Args:
+            blocks (Iterable): A :class:`ScanStream`, or any iterable of
+                (block_index, ndarray, first_sample_index) tuples or of
+                ndarray blocks.
+
+        Yields:
+            TriggerCapture:
+
+            The completed captures, in trigger order.
+
+        Raises:
+            :class:`ULException`
+        """
+        for block in blocks:
+            if isinstance(block, tuple):
+                _, data, first_sample_index = block
+            else:
+                data, first_sample_index = block, None
+            for capture in self.process(data, first_sample_index):
+                yield capture
+
+    def __conditions(self, values):
+        # Returns the masks of the scans that arm and that fire the trigger
+        level = self.__level
+        hysteresis = self.__hysteresis
+        trigger_type = self.__trigger_type
+        if trigger_type == TriggerType.RISING:
+            return values < level - hysteresis, values >= level
+        if trigger_type == TriggerType.FALLING:
+            return values > level + hysteresis, values <= level
+        high_level = self.__high_level
+        outside = ((values < level - hysteresis)
+                   | (values > high_level + hysteresis))
+        inside = (values >= level) & (values <= high_level)
+        if trigger_type == TriggerType.GATE_IN_WINDOW:
+            return outside, inside
+        inner = ((values >= level + hysteresis)
+                 & (values <= high_level - hysteresis))
+        return inner, ~inside
+
+    def __find_triggers(self, values, start):
+        # Returns the indexes of the triggers in a block starting at scan
+        # index start, carrying the arming state over to the next block
+        import numpy as np
+
+        arm, fire = self.__conditions(values)
+        arm_at = np.flatnonzero(arm)
+        fire_at = np.flatnonzero(fire)
+        count = len(values)
+        triggers = []
+        position = max(self.__holdoff_end - start, 0)
+        while position < count:
+            if not self.__armed:
+                i = np.searchsorted(arm_at, position)
+                if i == len(arm_at):
+                    break
+                position = arm_at[i]
+                self.__armed = True
+            i = np.searchsorted(fire_at, position)
+            if i == len(fire_at):
+                break
+            position = fire_at[i]
+            trigger_index = start + int(position)
+            triggers.append(trigger_index)
+            self.__armed = False
+            self.__holdoff_end = trigger_index + max(self.__holdoff, 1)
+            position = self.__holdoff_end - start
+        return triggers
+
+    def __start_capture(self, trigger_index, start):
+        # Creates the capture of a trigger and fills it with the scans of the
+        # ring buffer that precede the block
+        import numpy as np
+
+        data = np.full((self.__pre + self.__post, self.__number_of_channels),
+                       np.nan)
+        capture_start = trigger_index - self.__pre
+        first = max(capture_start, self.__history_start, start - self.__pre)
+        if first < start:
+            rows = np.arange(first, start)
+            data[rows - capture_start] = self.__history[rows
+                                                        % len(self.__history)]
+        self.__pending.append(TriggerCapture(self.__trigger_count,
+                                             trigger_index, data))
+        self.__trigger_count += 1
+
+    @staticmethod
+    def __copy(out, out_start, scans, start):
+        # Copies the scans of a block that fall within a capture
+        first = max(out_start, start)
+        end = min(out_start + len(out), start + len(scans))
+        if first < end:
+            out[first - out_start:end - out_start] = scans[first - start:
+                                                           end - start]
+
+    def __store_history(self, scans, start):
+        # Keeps the last pre_trigger_samples scans in the ring buffer, each
+        # at its scan index modulo the buffer length
+        import numpy as np
+
+        if not self.__pre:
+            return
+        count = min(len(scans), self.__pre)
+        rows = np.arange(start + len(scans) - count, start + len(scans))
+        self.__history[rows % self.__pre] = scans[len(scans) - count:]
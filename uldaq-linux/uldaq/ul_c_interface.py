@@ -6,22 +6,80 @@ Created on Mar 7 2018
 from ctypes import (CDLL, CFUNCTYPE, Structure, c_uint, c_int, c_longlong,
                     POINTER, c_double, c_char, py_object, c_ulonglong, cast,
                     c_char_p, c_byte)
-from ctypes.util import find_library
 from enum import IntEnum
 from .ul_structs import DaqDeviceDescriptor, AiQueueElement, TransferStatus
 from .ul_structs import DaqInChanDescriptor, MemDescriptor, DaqOutChanDescriptor, EventCallbackArgs
 from .ul_enums import DaqEventType
+from os import environ
 from sys import platform
+from threading import Lock
 
 if platform.startswith('darwin'):
     lib_file_name = 'libuldaq.dylib'
 else:
     lib_file_name = 'libuldaq.so'
 
-lib_file_path = find_library('uldaq')
-if lib_file_path is None:
-    lib_file_path = lib_file_name
-lib = CDLL(lib_file_path)
+
+class _Library:
+    """
+    Forwards the ul* functions to the selected backend, so modules that
+    imported lib see a backend change made with :func:`set_backend`.
+
+    The backend is only loaded when the first function is called, and the
+    prototypes of the C library are bound one subsystem at a time, when a
+    function of that subsystem is first used. Each resolved function is
+    cached on the instance so later calls do not go through __getattr__.
+    """
+    def __init__(self, backend):
+        self._lock = Lock()
+        self._select(backend)
+
+    def _select(self, backend):
+        with self._lock:
+            for name in [name for name in self.__dict__
+                         if name.startswith('ul')]:
+                del self.__dict__[name]
+            self._backend_spec = backend
+            self._backend = None
+            self._bound = set()
+
+    def _load(self):
+        with self._lock:
+            if self._backend is None:
+                backend = self._backend_spec
+                if backend == 'c':
+                    from ctypes.util import find_library
+                    lib_file_path = find_library('uldaq')
+                    if lib_file_path is None:
+                        lib_file_path = lib_file_name
+                    backend = CDLL(lib_file_path)
+                elif backend == 'sim':
+                    from .ul_sim import SimLibrary
+                    backend = SimLibrary()
+                elif isinstance(backend, str):
+                    raise ValueError('Invalid backend: ' + backend)
+                self._backend = backend
+            return self._backend
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        backend = self._backend
+        if backend is None:
+            backend = self._load()
+        function = getattr(backend, name)
+        if isinstance(backend, CDLL):
+            subsystem = _PROTOTYPE_SUBSYSTEMS.get(name)
+            if subsystem is not None and subsystem not in self._bound:
+                with self._lock:
+                    for function_name, argtypes in _PROTOTYPES[subsystem]:
+                        getattr(backend, function_name).argtypes = argtypes
+                    self._bound.add(subsystem)
+        setattr(self, name, function)
+        return function
+
+
+lib = _Library(environ.get('ULDAQ_BACKEND', 'c'))
 
 
 #
@@ -283,125 +341,215 @@ def interface_event_callback_function(handle, event_type, event_data, event_para
     return
 
 
-# Prototypes for DAQ Device
-lib.ulDevGetConfigStr.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_char), POINTER(c_uint))
-lib.ulDevGetConfig.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulGetDaqDeviceDescriptor.argtypes = (c_longlong, POINTER(DaqDeviceDescriptor))
-lib.ulDevGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulGetDaqDeviceInventory.argtypes = (c_uint, POINTER(DaqDeviceDescriptor), POINTER(c_uint))
-lib.ulConnectDaqDevice.argtypes = (c_longlong,)
-lib.ulEnableEvent.argtypes = (c_longlong, c_uint, c_ulonglong, InterfaceCallbackProcType, POINTER(EventParams))
-lib.ulDisableEvent.argtypes = (c_longlong, c_uint)
-lib.ulMemRead.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_byte), c_uint)
-lib.ulMemWrite.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_byte), c_uint)
-lib.ulCreateDaqDevice.argtypes = (DaqDeviceDescriptor,)
-lib.ulReleaseDaqDevice.argtypes = (c_longlong,)
-lib.ulIsDaqDeviceConnected.argtypes = (c_longlong, POINTER(c_int))
-lib.ulDisconnectDaqDevice.argtypes = (c_longlong,)
-lib.ulFlashLed.argtypes = (c_longlong, c_int)
-lib.ulGetInfoStr.argtypes = (c_uint, c_uint, POINTER(c_char), POINTER(c_uint))
-lib.ulSetConfig.argtypes = (c_uint, c_uint, c_longlong)
-lib.ulGetConfig.argtypes = (c_uint, c_uint, POINTER(c_longlong))
-lib.ulGetNetDaqDeviceDescriptor.argtypes = (c_char_p, c_uint, c_char_p,
-                                            POINTER(DaqDeviceDescriptor),
-                                            c_double)
-lib.ulDaqDeviceConnectionCode.argtypes = (c_longlong, c_longlong)
-# Prototypes for the analog input subsystem
-lib.ulAIn.argtypes = (c_longlong, c_int, c_uint, c_uint, c_uint, POINTER(c_double))
-lib.ulAInScan.argtypes = (c_longlong, c_int, c_int, c_uint, c_uint, c_int, POINTER(c_double), c_uint, c_uint,
-                          POINTER(c_double))
-lib.ulAInScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulAInLoadQueue.argtypes = (c_longlong, POINTER(AiQueueElement), c_uint)
-lib.ulAInSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulAInScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulAISetConfig.argtypes = (c_longlong, c_uint, c_uint, c_longlong)
-lib.ulAIGetConfig.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulAISetConfigDbl.argtypes = (c_longlong, c_uint, c_uint, c_double)
-lib.ulAIGetConfigDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-lib.ulAIGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulAIGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-lib.ulAInScanStop.argtypes = (c_longlong,)
-lib.ulAIGetConfigStr.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_char), POINTER(c_uint))
-lib.ulTIn.argtypes = (c_longlong, c_int, c_uint, c_uint, POINTER(c_double))
-lib.ulTInArray.argtypes = (c_longlong, c_int, c_int, c_uint, c_uint,
-                           POINTER(c_double))
-# Prototypes for the analog output subsystem
-lib.ulAOut.argtypes = (c_longlong, c_int, c_uint, c_uint, c_double)
-lib.ulAOutScan.argtypes = (c_longlong, c_int, c_int, c_uint, c_int, POINTER(c_double), c_uint, c_uint,
-                           POINTER(c_double))
-lib.ulAOutScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulAOutScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulAOutScanStop.argtypes = (c_longlong,)
-lib.ulAOutSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulAOGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulAOGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-lib.ulAOutArray.argtypes = (c_longlong, c_int, c_int, POINTER(c_uint), c_uint,
-                            POINTER(c_double))
-# Prototypes for the DAQ input subsystem
-lib.ulDaqInSetTrigger.argtypes = (c_longlong, c_uint, DaqInChanDescriptor, c_double, c_double, c_uint)
-lib.ulDaqInScan.argtypes = (c_longlong, POINTER(DaqInChanDescriptor), c_int, c_int, POINTER(c_double), c_uint, c_uint,
-                            POINTER(c_double))
-lib.ulDaqInScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulDaqInScanStop.argtypes = (c_longlong,)
-lib.ulDaqInScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulDaqIGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulDaqIGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-# Prototypes for DIO subsystem
-lib.ulDIn.argtypes = (c_longlong, c_uint, POINTER(c_ulonglong))
-lib.ulDOut.argtypes = (c_longlong, c_uint, c_ulonglong)
-lib.ulDBitIn.argtypes = (c_longlong, c_uint, c_int, POINTER(c_uint))
-lib.ulDBitOut.argtypes = (c_longlong, c_uint, c_int, c_uint)
-lib.ulDInScan.argtypes = (c_longlong, c_uint, c_uint, c_int, POINTER(c_double), c_uint, c_uint, POINTER(c_ulonglong))
-lib.ulDOutScan.argtypes = (c_longlong, c_uint, c_uint, c_int, POINTER(c_double), c_uint, c_uint, POINTER(c_ulonglong))
-lib.ulDInScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulDOutScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulDOutScanStop.argtypes = (c_longlong,)
-lib.ulDInScanStop.argtypes = (c_longlong,)
-lib.ulDInScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulDOutScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulDInSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulDOutSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulDConfigPort.argtypes = (c_longlong, c_uint, c_uint)
-lib.ulDConfigBit.argtypes = (c_longlong, c_uint, c_int, c_uint)
-lib.ulDIOGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulDIOGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-lib.ulDIOGetConfig.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulDIOSetConfig.argtypes = (c_longlong, c_uint, c_uint, c_longlong)
-lib.ulDInArray.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_ulonglong))
-lib.ulDOutArray.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_ulonglong))
-# prototypes for DAQ output subsystem
-lib.ulDaqOutScan.argtypes = (c_longlong, POINTER(DaqOutChanDescriptor), c_int, c_int, POINTER(c_double), c_uint,
-                             c_uint, POINTER(c_double))
-lib.ulDaqOutScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulDaqOutScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulDaqOutScanStop.argtypes = (c_longlong,)
-lib.ulDaqOutSetTrigger.argtypes = (c_longlong, c_uint, DaqInChanDescriptor, c_double, c_double, c_uint)
-lib.ulDaqOGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulDaqOGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-# prototypes for counter subsystem
-lib.ulCIn.argtypes = (c_longlong, c_int, POINTER(c_ulonglong))
-lib.ulCRead.argtypes = (c_longlong, c_int, c_uint, POINTER(c_ulonglong))
-lib.ulCLoad.argtypes = (c_longlong, c_int, c_uint, c_ulonglong)
-lib.ulCClear.argtypes = (c_longlong, c_int)
-lib.ulCConfigScan.argtypes = (c_longlong, c_int, c_uint, c_uint, c_uint, c_uint, c_uint, c_uint, c_uint)
-lib.ulCInScan.argtypes = (c_longlong, c_int, c_int, c_int, POINTER(c_double), c_uint, c_uint, POINTER(c_ulonglong))
-lib.ulCInSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulCInScanStatus.argtypes = (c_longlong, POINTER(c_uint), POINTER(TransferStatus))
-lib.ulCInScanStop.argtypes = (c_longlong,)
-lib.ulCInScanWait.argtypes = (c_longlong, c_uint, c_longlong, c_double)
-lib.ulCtrGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulCtrGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-lib.ulCtrSetConfig.argtypes = (c_longlong, c_uint, c_uint, c_longlong)
-lib.ulCtrGetConfig.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-# Prototypes for the timer subsystem
-lib.ulTmrPulseOutStart.argtypes = (c_longlong, c_int, POINTER(c_double), POINTER(c_double), c_ulonglong,
-                                   POINTER(c_double), c_uint, c_uint)
-lib.ulTmrPulseOutStop.argtypes = (c_longlong, c_int)
-lib.ulTmrPulseOutStatus.argtypes = (c_longlong, c_int, POINTER(c_uint))
-lib.ulTmrSetTrigger.argtypes = (c_longlong, c_uint, c_int, c_double, c_double, c_uint)
-lib.ulTmrGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulTmrGetInfoDbl.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_double))
-# Other Prototypes
-lib.ulGetErrMsg.argtypes = (c_uint, POINTER(c_char))
-lib.ulDevGetInfo.argtypes = (c_longlong, c_uint, c_uint, POINTER(c_longlong))
-lib.ulMemGetInfo.argtypes = (c_longlong, c_uint, POINTER(MemDescriptor))
+def interface_event_dispatch_function(handle, event_type, event_data, event_params):
+    # type: (int, DaqEventType, py_object, py_object) -> None
+    """Internal function used for queuing events on an EventDispatcher."""
+
+    event_parameters = cast(event_params, POINTER(EventParams)).contents
+    event_parameters.user_callback(event_type, event_data, handle)
+
+    return
+
+
+# Prototypes of the libuldaq functions, bound on first use of each subsystem
+_PROTOTYPES = {
+    'device': (
+        ('ulDevGetConfigStr', (c_longlong, c_uint, c_uint, POINTER(c_char),
+                               POINTER(c_uint))),
+        ('ulDevGetConfig', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulGetDaqDeviceDescriptor', (c_longlong,
+                                      POINTER(DaqDeviceDescriptor))),
+        ('ulDevGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulGetDaqDeviceInventory', (c_uint, POINTER(DaqDeviceDescriptor),
+                                     POINTER(c_uint))),
+        ('ulConnectDaqDevice', (c_longlong,)),
+        ('ulEnableEvent', (c_longlong, c_uint, c_ulonglong,
+                           InterfaceCallbackProcType, POINTER(EventParams))),
+        ('ulDisableEvent', (c_longlong, c_uint)),
+        ('ulMemRead', (c_longlong, c_uint, c_uint, POINTER(c_byte), c_uint)),
+        ('ulMemWrite', (c_longlong, c_uint, c_uint, POINTER(c_byte), c_uint)),
+        ('ulCreateDaqDevice', (DaqDeviceDescriptor,)),
+        ('ulReleaseDaqDevice', (c_longlong,)),
+        ('ulIsDaqDeviceConnected', (c_longlong, POINTER(c_int))),
+        ('ulDisconnectDaqDevice', (c_longlong,)),
+        ('ulFlashLed', (c_longlong, c_int)),
+        ('ulGetInfoStr', (c_uint, c_uint, POINTER(c_char), POINTER(c_uint))),
+        ('ulSetConfig', (c_uint, c_uint, c_longlong)),
+        ('ulGetConfig', (c_uint, c_uint, POINTER(c_longlong))),
+        ('ulGetNetDaqDeviceDescriptor', (c_char_p, c_uint, c_char_p,
+                                         POINTER(DaqDeviceDescriptor),
+                                         c_double)),
+        ('ulDaqDeviceConnectionCode', (c_longlong, c_longlong)),
+        ('ulGetErrMsg', (c_uint, POINTER(c_char))),
+        ('ulMemGetInfo', (c_longlong, c_uint, POINTER(MemDescriptor))),
+    ),
+    'ai': (
+        ('ulAIn', (c_longlong, c_int, c_uint, c_uint, c_uint,
+                   POINTER(c_double))),
+        ('ulAInScan', (c_longlong, c_int, c_int, c_uint, c_uint, c_int,
+                       POINTER(c_double), c_uint, c_uint, POINTER(c_double))),
+        ('ulAInScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulAInLoadQueue', (c_longlong, POINTER(AiQueueElement), c_uint)),
+        ('ulAInSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                             c_uint)),
+        ('ulAInScanStatus', (c_longlong, POINTER(c_uint),
+                             POINTER(TransferStatus))),
+        ('ulAISetConfig', (c_longlong, c_uint, c_uint, c_longlong)),
+        ('ulAIGetConfig', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulAISetConfigDbl', (c_longlong, c_uint, c_uint, c_double)),
+        ('ulAIGetConfigDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+        ('ulAIGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulAIGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+        ('ulAInScanStop', (c_longlong,)),
+        ('ulAIGetConfigStr', (c_longlong, c_uint, c_uint, POINTER(c_char),
+                              POINTER(c_uint))),
+        ('ulTIn', (c_longlong, c_int, c_uint, c_uint, POINTER(c_double))),
+        ('ulTInArray', (c_longlong, c_int, c_int, c_uint, c_uint,
+                        POINTER(c_double))),
+    ),
+    'ao': (
+        ('ulAOut', (c_longlong, c_int, c_uint, c_uint, c_double)),
+        ('ulAOutScan', (c_longlong, c_int, c_int, c_uint, c_int,
+                        POINTER(c_double), c_uint, c_uint, POINTER(c_double))),
+        ('ulAOutScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulAOutScanStatus', (c_longlong, POINTER(c_uint),
+                              POINTER(TransferStatus))),
+        ('ulAOutScanStop', (c_longlong,)),
+        ('ulAOutSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                              c_uint)),
+        ('ulAOGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulAOGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+        ('ulAOutArray', (c_longlong, c_int, c_int, POINTER(c_uint), c_uint,
+                         POINTER(c_double))),
+    ),
+    'daqi': (
+        ('ulDaqInSetTrigger', (c_longlong, c_uint, DaqInChanDescriptor,
+                               c_double, c_double, c_uint)),
+        ('ulDaqInScan', (c_longlong, POINTER(DaqInChanDescriptor), c_int,
+                         c_int, POINTER(c_double), c_uint, c_uint,
+                         POINTER(c_double))),
+        ('ulDaqInScanStatus', (c_longlong, POINTER(c_uint),
+                               POINTER(TransferStatus))),
+        ('ulDaqInScanStop', (c_longlong,)),
+        ('ulDaqInScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulDaqIGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulDaqIGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+    ),
+    'dio': (
+        ('ulDIn', (c_longlong, c_uint, POINTER(c_ulonglong))),
+        ('ulDOut', (c_longlong, c_uint, c_ulonglong)),
+        ('ulDBitIn', (c_longlong, c_uint, c_int, POINTER(c_uint))),
+        ('ulDBitOut', (c_longlong, c_uint, c_int, c_uint)),
+        ('ulDInScan', (c_longlong, c_uint, c_uint, c_int, POINTER(c_double),
+                       c_uint, c_uint, POINTER(c_ulonglong))),
+        ('ulDOutScan', (c_longlong, c_uint, c_uint, c_int, POINTER(c_double),
+                        c_uint, c_uint, POINTER(c_ulonglong))),
+        ('ulDInScanStatus', (c_longlong, POINTER(c_uint),
+                             POINTER(TransferStatus))),
+        ('ulDOutScanStatus', (c_longlong, POINTER(c_uint),
+                              POINTER(TransferStatus))),
+        ('ulDOutScanStop', (c_longlong,)),
+        ('ulDInScanStop', (c_longlong,)),
+        ('ulDInScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulDOutScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulDInSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                             c_uint)),
+        ('ulDOutSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                              c_uint)),
+        ('ulDConfigPort', (c_longlong, c_uint, c_uint)),
+        ('ulDConfigBit', (c_longlong, c_uint, c_int, c_uint)),
+        ('ulDIOGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulDIOGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+        ('ulDIOGetConfig', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulDIOSetConfig', (c_longlong, c_uint, c_uint, c_longlong)),
+        ('ulDInArray', (c_longlong, c_uint, c_uint, POINTER(c_ulonglong))),
+        ('ulDOutArray', (c_longlong, c_uint, c_uint, POINTER(c_ulonglong))),
+    ),
+    'daqo': (
+        ('ulDaqOutScan', (c_longlong, POINTER(DaqOutChanDescriptor), c_int,
+                          c_int, POINTER(c_double), c_uint, c_uint,
+                          POINTER(c_double))),
+        ('ulDaqOutScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulDaqOutScanStatus', (c_longlong, POINTER(c_uint),
+                                POINTER(TransferStatus))),
+        ('ulDaqOutScanStop', (c_longlong,)),
+        ('ulDaqOutSetTrigger', (c_longlong, c_uint, DaqInChanDescriptor,
+                                c_double, c_double, c_uint)),
+        ('ulDaqOGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulDaqOGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+    ),
+    'ctr': (
+        ('ulCIn', (c_longlong, c_int, POINTER(c_ulonglong))),
+        ('ulCRead', (c_longlong, c_int, c_uint, POINTER(c_ulonglong))),
+        ('ulCLoad', (c_longlong, c_int, c_uint, c_ulonglong)),
+        ('ulCClear', (c_longlong, c_int)),
+        ('ulCConfigScan', (c_longlong, c_int, c_uint, c_uint, c_uint, c_uint,
+                           c_uint, c_uint, c_uint)),
+        ('ulCInScan', (c_longlong, c_int, c_int, c_int, POINTER(c_double),
+                       c_uint, c_uint, POINTER(c_ulonglong))),
+        ('ulCInSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                             c_uint)),
+        ('ulCInScanStatus', (c_longlong, POINTER(c_uint),
+                             POINTER(TransferStatus))),
+        ('ulCInScanStop', (c_longlong,)),
+        ('ulCInScanWait', (c_longlong, c_uint, c_longlong, c_double)),
+        ('ulCtrGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulCtrGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+        ('ulCtrSetConfig', (c_longlong, c_uint, c_uint, c_longlong)),
+        ('ulCtrGetConfig', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+    ),
+    'tmr': (
+        ('ulTmrPulseOutStart', (c_longlong, c_int, POINTER(c_double),
+                                POINTER(c_double), c_ulonglong,
+                                POINTER(c_double), c_uint, c_uint)),
+        ('ulTmrPulseOutStop', (c_longlong, c_int)),
+        ('ulTmrPulseOutStatus', (c_longlong, c_int, POINTER(c_uint))),
+        ('ulTmrSetTrigger', (c_longlong, c_uint, c_int, c_double, c_double,
+                             c_uint)),
+        ('ulTmrGetInfo', (c_longlong, c_uint, c_uint, POINTER(c_longlong))),
+        ('ulTmrGetInfoDbl', (c_longlong, c_uint, c_uint, POINTER(c_double))),
+    ),
+}
+_PROTOTYPE_SUBSYSTEMS = dict((function_name, subsystem)
+                             for subsystem, prototypes in _PROTOTYPES.items()
+                             for function_name, _ in prototypes)
+
+
+def set_backend(backend):
+    # type: (str or object) -> None
+    """
+    Selects the library that implements the UL functions. The initial
+    backend is taken from the ULDAQ_BACKEND environment variable, and is the
+    C library if it is not set.
+
+    The backend is loaded when the first UL function is called, so importing
+    uldaq does not require libuldaq to be installed. Call this function
+    before creating any :class:`DaqDevice`; devices created with one backend
+    cannot be used with another.
+
+    Args:
+        backend (str or object): 'c' for libuldaq, 'sim' for a new
+            :class:`SimLibrary` simulating one device, or an object
+            implementing the ul* functions, such as a :class:`SimLibrary`
+            created with custom devices.
+
+    Raises:
+        ValueError: The backend name is not valid.
+    """
+    if isinstance(backend, str) and backend not in ('c', 'sim'):
+        raise ValueError('Invalid backend: ' + backend)
+    lib._select(backend)
+
+
+def get_backend():
+    # type: () -> object
+    """
+    Gets the library that implements the UL functions, loading it if no
+    function has been called yet.
+
+    Returns:
+        object:
+
+        The CDLL of libuldaq, or the :class:`SimLibrary` in use.
+    """
+    return lib._load()
@@ -0,0 +1,1701 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+A simulated libuldaq. Selected with ``ULDAQ_BACKEND=sim`` or
+``uldaq.set_backend('sim')``, it stands in for the C library behind the
+``lib`` object of the ul_c_interface module, so the rest of the package runs
+unchanged without hardware or libuldaq installed. Simulated devices require
+NumPy, which is only imported when they are used.
+"""
+from ctypes import c_void_p, c_double, c_ulonglong, cast
+from threading import Event, Lock, Thread, current_thread
+from .ul_enums import (ULError, InterfaceType, DaqEventType, ScanOption,
+                       ScanStatus, TriggerType, AiInputMode, AiChanType,
+                       AiQueueType, AInFlag, AInScanFlag, AOutFlag,
+                       DaqInChanType, DaqOutChanType, DigitalPortType,
+                       DigitalPortIoType, DigitalDirection,
+                       CounterMeasurementType, CounterMeasurementMode,
+                       CounterRegisterType, TimerType, TmrStatus, MemRegion,
+                       MemAccessType, Range, WaitType)
+from .ul_c_interface import (UlInfoItem, DevItemInfo, DevConfigItem,
+                             AiInfoItem, AiInfoItemDbl, DioInfoItem,
+                             DioInfoItemDbl, DioConfigItem, DaqIInfoItem,
+                             DaqIInfoItemDbl, AoInfoItem, AoInfoItemDbl,
+                             DaqoInfoItem, DaqoInfoItemDbl, CtrInfoItem,
+                             CtrInfoItemDbl, TmrInfoItem, TmrInfoItemDbl)
+from .utils import monotonic, range_limits
+
+_error_messages = {
+    ULError.NO_ERROR: 'No error has occurred',
+    ULError.BAD_DEV_HANDLE: 'Invalid device handle',
+    ULError.BAD_DEV_TYPE: 'This function cannot be used with this device',
+    ULError.DEV_NOT_CONNECTED: 'Device not connected or connection lost',
+    ULError.DEAD_DEV: 'Device no longer responding',
+    ULError.BAD_BUFFER_SIZE: 'Buffer too small for operation',
+    ULError.BAD_BUFFER: 'Invalid buffer',
+    ULError.BAD_MEM_REGION: 'Invalid memory region',
+    ULError.BAD_RANGE: 'Invalid range',
+    ULError.BAD_AI_CHAN: 'Invalid analog input channel specified',
+    ULError.BAD_INPUT_MODE: 'Invalid input mode specified',
+    ULError.ALREADY_ACTIVE: 'A background process is already in progress',
+    ULError.BAD_TRIG_TYPE: 'Invalid trigger type specified',
+    ULError.OVERRUN: 'FIFO overrun, data was not transferred from device '
+                     'fast enough',
+    ULError.UNDERRUN: 'FIFO underrun, data was not transferred to device '
+                      'fast enough',
+    ULError.TIMEDOUT: 'Operation timed out',
+    ULError.BAD_OPTION: 'Invalid option specified',
+    ULError.BAD_RATE: 'Invalid sampling rate specified',
+    ULError.CONFIG_NOT_SUPPORTED: 'Configuration not supported',
+    ULError.BAD_CONFIG_ITEM: 'Invalid config item specified',
+    ULError.BAD_INFO_ITEM: 'Invalid info item specified',
+    ULError.BAD_SAMPLE_COUNT: 'Invalid sample count specified',
+    ULError.BAD_QUEUE_SIZE: 'Invalid queue size',
+    ULError.BAD_ARG: 'Invalid argument',
+    ULError.BAD_PORT_TYPE: 'Invalid port type specified',
+    ULError.BAD_BIT_NUM: 'Invalid bit number',
+    ULError.BAD_PORT_VAL: 'Invalid port value specified',
+    ULError.WRONG_DIG_CONFIG: 'Digital I/O is configured incorrectly',
+    ULError.BAD_AO_CHAN: 'Invalid analog output channel specified',
+    ULError.BAD_TMR: 'Invalid timer specified',
+    ULError.BAD_FREQUENCY: 'Invalid frequency specified',
+    ULError.BAD_DUTY_CYCLE: 'Invalid duty cycle specified',
+    ULError.BAD_CTR: 'Invalid counter specified',
+    ULError.BAD_CTR_REG: 'Invalid counter register specified',
+    ULError.BAD_DAQI_CHAN_TYPE: 'Invalid DAQ input channel type specified',
+    ULError.BAD_DAQO_CHAN_TYPE: 'Invalid DAQ output channel type specified',
+    ULError.BAD_NUM_CHANS: 'Invalid number of channels specified',
+    ULError.NO_CONNECTION_ESTABLISHED: 'No connection established',
+    ULError.BAD_EVENT_TYPE: 'Invalid event type specified',
+    ULError.EVENT_ALREADY_ENABLED: 'An event handler has already been '
+                                   'enabled for this event type',
+    ULError.BAD_EVENT_SIZE: 'Invalid event count specified',
+    ULError.BAD_MEM_ADDRESS: 'Invalid memory address',
+}
+
+_INPUT_EVENTS = (DaqEventType.ON_DATA_AVAILABLE
+                 | DaqEventType.ON_INPUT_SCAN_ERROR
+                 | DaqEventType.ON_END_OF_INPUT_SCAN)
+_OUTPUT_EVENTS = (DaqEventType.ON_OUTPUT_SCAN_ERROR
+                  | DaqEventType.ON_END_OF_OUTPUT_SCAN)
+_SCAN_OPTIONS = (ScanOption.SINGLEIO | ScanOption.BLOCKIO | ScanOption.BURSTIO
+                 | ScanOption.CONTINUOUS | ScanOption.EXTCLOCK
+                 | ScanOption.EXTTRIGGER | ScanOption.RETRIGGER)
+_TRIGGER_TYPES = (TriggerType.POS_EDGE | TriggerType.NEG_EDGE
+                  | TriggerType.HIGH | TriggerType.LOW)
+_PACER_CLOCK = 10e6
+_SCAN_TICK = 0.005
+
+
+#
+# Waveform generators; any function of uldaq.waveforms can be used as well
+#
+
+
+def sine_wave(frequency, amplitude=1.0, offset=0.0, phase=0.0):
+    # type: (float, float, float, float) -> function
+    """
+    Returns a waveform for :func:`SimDevice.set_ai_waveform` generating a
+    sine wave; see :func:`uldaq.waveforms.sine`.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    from .waveforms import sine
+    return sine(frequency, amplitude, offset, phase)
+
+
+def square_wave(frequency, amplitude=1.0, offset=0.0, duty_cycle=0.5):
+    # type: (float, float, float, float) -> function
+    """
+    Returns a waveform for :func:`SimDevice.set_ai_waveform` generating a
+    square wave; see :func:`uldaq.waveforms.square`.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        duty_cycle (Optional[float]): The fraction of each period spent high;
+            the default is 0.5.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    from .waveforms import square
+    return square(frequency, amplitude, offset, duty_cycle=duty_cycle)
+
+
+def ramp_wave(frequency, amplitude=1.0, offset=0.0):
+    # type: (float, float, float) -> function
+    """
+    Returns a waveform for :func:`SimDevice.set_ai_waveform` generating a
+    sawtooth rising from -amplitude to amplitude once per period; see
+    :func:`uldaq.waveforms.sawtooth`.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    from .waveforms import sawtooth
+    return sawtooth(frequency, amplitude, offset)
+
+
+def noise(amplitude=1.0, offset=0.0, seed=None):
+    # type: (float, float, int) -> function
+    """
+    Returns a waveform for :func:`SimDevice.set_ai_waveform` generating
+    Gaussian noise; see :func:`uldaq.waveforms.noise`.
+
+    Args:
+        amplitude (Optional[float]): The standard deviation in volts; the
+            default is 1.0.
+        offset (Optional[float]): The mean in volts; the default is 0.0.
+        seed (Optional[int]): The seed of the random generator.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    from .waveforms import noise as _noise
+    return _noise(amplitude, offset, seed)
+
+
+#
+# Simulated hardware
+#
+
+
+class SimDevice:
+    """
+    A simulated DAQ device with analog input and output, digital I/O,
+    counter, timer, DAQ input and DAQ output subsystems.
+
+    The analog inputs sample the waveform set for each channel, by default a
+    1 V sine wave of (channel + 1) Hz. Digital input bits read back the
+    output latch unless an input function is set, and counters count at a
+    fixed rate. All signals are functions of the time elapsed since the
+    device was created, so the channels of a scan stay phase coherent.
+
+    Args:
+        product_name (Optional[str]): The product name reported in the
+            device descriptor.
+        unique_id (Optional[str]): The unique id reported in the device
+            descriptor.
+        product_id (Optional[int]): The product id reported in the device
+            descriptor.
+    """
+    def __init__(self, product_name='SIM-DAQ', unique_id='SIM00001',
+                 product_id=0x7F00):
+        self.product_name = product_name
+        """The product name reported in the device descriptor."""
+        self.unique_id = unique_id
+        """The unique id reported in the device descriptor."""
+        self.product_id = product_id
+        """The product id reported in the device descriptor."""
+        self.dev_interface = InterfaceType.USB
+        """The :class:`InterfaceType` of the device."""
+        self.firmware_version = '1.00'
+        """The firmware version returned by
+        :func:`DaqDeviceConfig.get_version`."""
+        self.max_latency = 0.5
+        """The time in seconds a scan may fall behind its pacer before it
+        stops with an OVERRUN (input) or UNDERRUN (output) error."""
+
+        self.ai_ranges = [Range.BIP10VOLTS, Range.BIP5VOLTS, Range.BIP2VOLTS,
+                          Range.BIP1VOLTS]
+        self.ao_ranges = [Range.BIP10VOLTS, Range.UNI10VOLTS]
+        self.dio_ports = [DigitalPortType.FIRSTPORTA,
+                          DigitalPortType.FIRSTPORTB]
+        self.ctr_resolution = 32
+        self.ai_max_rate = 200000.0
+        self.ao_max_rate = 500000.0
+        self.dio_max_rate = 1000000.0
+        self.ctr_max_rate = 1000000.0
+
+        self._lock = Lock()
+        self._epoch = monotonic()
+        self._handle = 0
+        self._connected = False
+        self._fault = None
+        self._events = {}
+        self._scans = {}
+        self._ai_waveforms = [sine_wave(channel + 1) for channel in range(8)]
+        self._ai_queue = []
+        self._ai_config = {}
+        self._ao_values = [0.0, 0.0]
+        self._ao_config = {}
+        self._dio_latch = [0] * len(self.dio_ports)
+        self._dio_direction = [0] * len(self.dio_ports)
+        self._dio_inputs = [None] * len(self.dio_ports)
+        self._dio_config = {}
+        self._ctr_rates = [1000.0, 100.0]
+        self._ctr_offsets = [0.0, 0.0]
+        self._ctr_config = {}
+        self._tmr_running = [False]
+        self._memory = bytearray(256)
+        self._dev_config = {}
+
+        ai_num_chans = {AiInputMode.SINGLE_ENDED: 8,
+                        AiInputMode.DIFFERENTIAL: 4}
+
+        def ai_num_chans_by_mode(input_mode):
+            return ai_num_chans.get(input_mode, 0)
+
+        self._info = {
+            'dev': {DevItemInfo.HAS_AI_DEV: 1, DevItemInfo.HAS_AO_DEV: 1,
+                    DevItemInfo.HAS_DIO_DEV: 1, DevItemInfo.HAS_CTR_DEV: 1,
+                    DevItemInfo.HAS_TMR_DEV: 1, DevItemInfo.HAS_DAQI_DEV: 1,
+                    DevItemInfo.HAS_DAQO_DEV: 1,
+                    DevItemInfo.DAQ_EVENT_TYPES: _INPUT_EVENTS | _OUTPUT_EVENTS,
+                    DevItemInfo.MEM_REGIONS: MemRegion.USER},
+            'ai': {AiInfoItem.RESOLUTION: 16,
+                   AiInfoItem.NUM_CHANS: 8,
+                   AiInfoItem.NUM_CHANS_BY_MODE: ai_num_chans_by_mode,
+                   AiInfoItem.NUM_CHANS_BY_TYPE: lambda chan_type: (
+                       8 if chan_type == AiChanType.VOLTAGE else 0),
+                   AiInfoItem.CHAN_TYPES: AiChanType.VOLTAGE,
+                   AiInfoItem.SCAN_OPTIONS: _SCAN_OPTIONS,
+                   AiInfoItem.HAS_PACER: 1,
+                   AiInfoItem.NUM_DIFF_RANGES: len(self.ai_ranges),
+                   AiInfoItem.NUM_SE_RANGES: len(self.ai_ranges),
+                   AiInfoItem.DIFF_RANGE: self.ai_ranges,
+                   AiInfoItem.SE_RANGE: self.ai_ranges,
+                   AiInfoItem.TRIG_TYPES: _TRIGGER_TYPES,
+                   AiInfoItem.MAX_QUEUE_LENGTH_BY_MODE: ai_num_chans_by_mode,
+                   AiInfoItem.QUEUE_TYPES: (AiQueueType.CHAN | AiQueueType.GAIN
+                                            | AiQueueType.MODE),
+                   AiInfoItem.QUEUE_LIMITS: 0,
+                   AiInfoItem.FIFO_SIZE: 8192,
+                   AiInfoItem.IEPE_SUPPORTED: 0,
+                   AiInfoItemDbl.MIN_SCAN_RATE: 0.01,
+                   AiInfoItemDbl.MAX_SCAN_RATE: self.ai_max_rate,
+                   AiInfoItemDbl.MAX_THROUGHPUT: 2 * self.ai_max_rate,
+                   AiInfoItemDbl.MAX_BURST_RATE: 0.0,
+                   AiInfoItemDbl.MAX_BURST_THROUGHPUT: 0.0},
+            'ao': {AoInfoItem.RESOLUTION: 16,
+                   AoInfoItem.NUM_CHANS: len(self._ao_values),
+                   AoInfoItem.SCAN_OPTIONS: _SCAN_OPTIONS,
+                   AoInfoItem.HAS_PACER: 1,
+                   AoInfoItem.NUM_RANGES: len(self.ao_ranges),
+                   AoInfoItem.RANGE: self.ao_ranges,
+                   AoInfoItem.TRIG_TYPES: _TRIGGER_TYPES,
+                   AoInfoItem.FIFO_SIZE: 8192,
+                   AoInfoItemDbl.MIN_SCAN_RATE: 0.01,
+                   AoInfoItemDbl.MAX_SCAN_RATE: self.ao_max_rate,
+                   AoInfoItemDbl.MAX_THROUGHPUT: 2 * self.ao_max_rate},
+            'dio': {DioInfoItem.NUM_PORTS: len(self.dio_ports),
+                    DioInfoItem.PORT_TYPE: self.dio_ports,
+                    DioInfoItem.PORT_IO_TYPE: [DigitalPortIoType.BITIO]
+                    * len(self.dio_ports),
+                    DioInfoItem.NUM_BITS: [8] * len(self.dio_ports),
+                    DioInfoItem.HAS_PACER: lambda direction: 1,
+                    DioInfoItem.SCAN_OPTIONS: lambda direction: _SCAN_OPTIONS,
+                    DioInfoItem.TRIG_TYPES: lambda direction: _TRIGGER_TYPES,
+                    DioInfoItem.FIFO_SIZE: lambda direction: 4096,
+                    DioInfoItemDbl.MIN_SCAN_RATE: lambda direction: 0.01,
+                    DioInfoItemDbl.MAX_SCAN_RATE:
+                        lambda direction: self.dio_max_rate,
+                    DioInfoItemDbl.MAX_THROUGHPUT:
+                        lambda direction: 2 * self.dio_max_rate},
+            'ctr': {CtrInfoItem.NUM_CTRS: len(self._ctr_rates),
+                    CtrInfoItem.MEASUREMENT_TYPES: lambda counter: (
+                        CounterMeasurementType.COUNT),
+                    CtrInfoItem.MEASUREMENT_MODES: lambda measurement_type: (
+                        CounterMeasurementMode.CLEAR_ON_READ
+                        | CounterMeasurementMode.COUNT_DOWN),
+                    CtrInfoItem.REGISTER_TYPES: (CounterRegisterType.COUNT
+                                                 | CounterRegisterType.LOAD),
+                    CtrInfoItem.RESOLUTION: lambda counter: (
+                        self.ctr_resolution),
+                    CtrInfoItem.HAS_PACER: 1,
+                    CtrInfoItem.SCAN_OPTIONS: _SCAN_OPTIONS,
+                    CtrInfoItem.TRIG_TYPES: _TRIGGER_TYPES,
+                    CtrInfoItem.FIFO_SIZE: 4096,
+                    CtrInfoItemDbl.MIN_SCAN_RATE: 0.01,
+                    CtrInfoItemDbl.MAX_SCAN_RATE: self.ctr_max_rate,
+                    CtrInfoItemDbl.MAX_THROUGHPUT: 2 * self.ctr_max_rate},
+            'tmr': {TmrInfoItem.NUM_TMRS: len(self._tmr_running),
+                    TmrInfoItem.TYPE: lambda timer: TimerType.STANDARD,
+                    TmrInfoItemDbl.MIN_FREQ: 0.0149,
+                    TmrInfoItemDbl.MAX_FREQ: 32e6},
+            'daqi': {DaqIInfoItem.CHAN_TYPES: (
+                         DaqInChanType.ANALOG_DIFF | DaqInChanType.ANALOG_SE
+                         | DaqInChanType.DIGITAL | DaqInChanType.CTR16
+                         | DaqInChanType.CTR32 | DaqInChanType.CTR48),
+                     DaqIInfoItem.SCAN_OPTIONS: _SCAN_OPTIONS,
+                     DaqIInfoItem.TRIG_TYPES: _TRIGGER_TYPES,
+                     DaqIInfoItem.FIFO_SIZE: 8192,
+                     DaqIInfoItemDbl.MIN_SCAN_RATE: 0.01,
+                     DaqIInfoItemDbl.MAX_SCAN_RATE: self.ai_max_rate,
+                     DaqIInfoItemDbl.MAX_THROUGHPUT: 2 * self.ai_max_rate},
+            'daqo': {DaqoInfoItem.CHAN_TYPES: (DaqOutChanType.ANALOG
+                                               | DaqOutChanType.DIGITAL),
+                     DaqoInfoItem.SCAN_OPTIONS: _SCAN_OPTIONS,
+                     DaqoInfoItem.TRIG_TYPES: _TRIGGER_TYPES,
+                     DaqoInfoItem.FIFO_SIZE: 8192,
+                     DaqoInfoItemDbl.MIN_SCAN_RATE: 0.01,
+                     DaqoInfoItemDbl.MAX_SCAN_RATE: self.ao_max_rate,
+                     DaqoInfoItemDbl.MAX_THROUGHPUT: 2 * self.ao_max_rate},
+        }
+
+    def set_ai_waveform(self, channel, waveform):
+        # type: (int, function) -> None
+        """
+        Sets the signal applied to an analog input channel.
+
+        Args:
+            channel (int): The A/D channel number.
+            waveform (function): A function of an array of times in seconds
+                since the device was created, returning an array of voltages;
+                see :func:`sine_wave`, :func:`square_wave`, :func:`ramp_wave`
+                and :func:`noise`. Values outside the range of a scan are
+                clipped.
+        """
+        self._ai_waveforms[channel] = waveform
+
+    def set_dio_input(self, port_type, waveform):
+        # type: (DigitalPortType, function) -> None
+        """
+        Sets the signal applied to the input bits of a digital port.
+
+        Args:
+            port_type (DigitalPortType): The digital port.
+            waveform (function or None): A function of an array of times in
+                seconds returning an array of port values, or None to read
+                back the output latch.
+        """
+        self._dio_inputs[self.dio_ports.index(port_type)] = waveform
+
+    def set_ctr_rate(self, counter_number, counts_per_second):
+        # type: (int, float) -> None
+        """
+        Sets the rate at which a counter counts.
+
+        Args:
+            counter_number (int): The counter.
+            counts_per_second (float): The count rate.
+        """
+        with self._lock:
+            now = self._now()
+            self._ctr_offsets[counter_number] += (
+                (self._ctr_rates[counter_number] - counts_per_second) * now)
+            self._ctr_rates[counter_number] = counts_per_second
+
+    def inject_scan_error(self, error_code=ULError.OVERRUN):
+        # type: (ULError) -> None
+        """
+        Makes the next running scan to transfer data stop with an error, as
+        if the device had reported it.
+
+        Args:
+            error_code (Optional[ULError]): The error reported by the scan;
+                the default is OVERRUN.
+        """
+        self._fault = error_code
+
+    def set_connected(self, connected):
+        # type: (bool) -> None
+        """
+        Simulates unplugging (False) or plugging in (True) the device. While
+        unplugged, running scans stop with a DEAD_DEV error, operations fail
+        and :func:`DaqDevice.is_connected` returns False until
+        :func:`DaqDevice.connect` is called again.
+
+        Args:
+            connected (bool): The new state of the cable.
+        """
+        if connected:
+            self._fault = None
+            return
+        self._fault = ULError.DEAD_DEV
+        self._connected = False
+
+    @property
+    def output_values(self):
+        """The voltages last written to each analog output channel."""
+        return list(self._ao_values)
+
+    def _now(self):
+        return monotonic() - self._epoch
+
+    def _fire(self, event_type, event_data):
+        event = self._events.get(event_type)
+        if event is not None:
+            callback, event_params = event[:2]
+            callback(self._handle, event_type, event_data, event_params)
+
+    def _ai_values(self, channels, ranges, t):
+        import numpy as np
+        t = np.asarray(t, dtype=np.float64)
+        block = np.empty((len(t), len(channels)))
+        for column, (channel, analog_range) in enumerate(zip(channels,
+                                                             ranges)):
+            low, high = range_limits(analog_range)
+            block[:, column] = np.clip(self._ai_waveforms[channel](t),
+                                       low, high)
+        return block
+
+    def _port_values(self, port_index, t):
+        import numpy as np
+        t = np.asarray(t, dtype=np.float64)
+        latch = self._dio_latch[port_index]
+        waveform = self._dio_inputs[port_index]
+        if waveform is None:
+            return np.full(len(t), latch, dtype=np.uint64)
+        outputs = self._dio_direction[port_index]
+        values = np.asarray(waveform(t), dtype=np.uint64)
+        return (values & np.uint64(~outputs & 0xFF)) | np.uint64(
+            latch & outputs)
+
+    def _ctr_values(self, counter, bits, t):
+        import numpy as np
+        t = np.asarray(t, dtype=np.float64)
+        counts = (self._ctr_rates[counter] * t
+                  + self._ctr_offsets[counter]).astype(np.int64)
+        return counts.astype(np.uint64) & np.uint64((1 << bits) - 1)
+
+
+#
+# Scans
+#
+
+
+class _SimScan:
+    """A paced transfer between a scan buffer and a simulated device."""
+    def __init__(self, device, is_input, data, c_type, number_of_channels,
+                 samples_per_channel, rate, options, transfer):
+        from numpy.ctypeslib import as_array
+        count = number_of_channels * samples_per_channel
+        address = cast(getattr(data, '_as_parameter_', data), c_void_p).value
+        self.data = data
+        self.buffer = as_array((c_type * count).from_address(address)).reshape(
+            samples_per_channel, number_of_channels)
+        self.device = device
+        self.is_input = is_input
+        self.rate = rate
+        self.continuous = bool(options & ScanOption.CONTINUOUS)
+        self.samples_per_channel = samples_per_channel
+        self.number_of_channels = number_of_channels
+        self.transfer = transfer
+        self.scan_count = 0
+        self.error = ULError.NO_ERROR
+        self.running = True
+        self.done = Event()
+        self.stop_requested = Event()
+        self.start_time = device._now()
+        self.thread = Thread(target=self.run, name='uldaq-sim-scan')
+        self.thread.daemon = True
+
+    def get_status(self, transfer_status):
+        transfer_status = getattr(transfer_status, '_obj', transfer_status)
+        with self.device._lock:
+            scan_count = self.scan_count
+            running = self.running
+        transfer_status._current_scan_count = scan_count
+        transfer_status._current_total_count = (scan_count
+                                                * self.number_of_channels)
+        transfer_status._current_index = (
+            ((scan_count - 1) % self.samples_per_channel)
+            * self.number_of_channels if scan_count else -1)
+        return ScanStatus.RUNNING if running else ScanStatus.IDLE
+
+    def stop(self):
+        self.stop_requested.set()
+        # Event callbacks run on the scan thread and may stop the scan
+        if self.thread.is_alive() and self.thread is not current_thread():
+            self.thread.join()
+
+    def run(self):
+        device = self.device
+        events = DaqEventType
+        next_event = 0
+        max_lag = int(device.max_latency * self.rate) + 1
+        t0 = monotonic()
+        # Short finite scans end as soon as their last sample is due
+        end = (None if self.continuous
+               else t0 + self.samples_per_channel / self.rate)
+        error = ULError.NO_ERROR
+        while not self.stop_requested.wait(
+                _SCAN_TICK if end is None
+                else min(_SCAN_TICK, max(end - monotonic(), 0.0))):
+            if device._fault is not None:
+                error = device._fault
+                if error != ULError.DEAD_DEV:
+                    device._fault = None
+                break
+            due = int((monotonic() - t0) * self.rate + 1e-9)
+            if not self.continuous:
+                due = min(due, self.samples_per_channel)
+            if due - self.scan_count > max_lag:
+                error = ULError.OVERRUN if self.is_input else ULError.UNDERRUN
+                break
+            self.__transfer(self.scan_count, due)
+            with device._lock:
+                self.scan_count = due
+
+            data_event = device._events.get(events.ON_DATA_AVAILABLE)
+            if data_event is not None and self.is_input:
+                next_event = max(next_event, data_event[2])
+                if due >= next_event:
+                    device._fire(events.ON_DATA_AVAILABLE, due)
+                    next_event = due + data_event[2]
+            if not self.continuous and due == self.samples_per_channel:
+                break
+
+        with device._lock:
+            self.running = False
+            self.error = error
+        if error:
+            device._fire(events.ON_INPUT_SCAN_ERROR if self.is_input
+                         else events.ON_OUTPUT_SCAN_ERROR, error)
+        else:
+            device._fire(events.ON_END_OF_INPUT_SCAN if self.is_input
+                         else events.ON_END_OF_OUTPUT_SCAN, self.scan_count)
+        self.done.set()
+
+    def __transfer(self, first_scan, end_scan):
+        import numpy as np
+        samples = self.samples_per_channel
+        while first_scan < end_scan:
+            start = first_scan % samples
+            count = min(end_scan - first_scan, samples - start)
+            t = self.start_time + np.arange(first_scan,
+                                            first_scan + count) / self.rate
+            self.transfer(self.buffer[start:start + count], t)
+            first_scan += count
+
+
+#
+# Library
+#
+
+
+def _value(arg):
+    return getattr(arg, 'value', arg)
+
+
+def _set(out, value):
+    getattr(out, '_obj', out).value = value
+
+
+class SimLibrary:
+    """
+    Implements the ul* functions of libuldaq used by this package on top of
+    :class:`SimDevice` objects. Every function returns a :class:`ULError`
+    code and writes its results through the pointer arguments, exactly like
+    the C library.
+
+    Args:
+        devices (Optional[list[SimDevice]]): The devices returned by the
+            inventory; by default a single :class:`SimDevice`.
+    """
+    def __init__(self, devices=None):
+        self.devices = list(devices) if devices else [SimDevice()]
+        """The simulated devices."""
+        self.__handles = {}
+        self.__next_handle = 1
+
+    def get_device(self, unique_id=None):
+        # type: (str) -> SimDevice
+        """
+        Gets a simulated device.
+
+        Args:
+            unique_id (Optional[str]): The unique id of the device; by default
+                the first device is returned.
+
+        Returns:
+            SimDevice:
+
+            The device, or None if there is no device with that id.
+        """
+        for device in self.devices:
+            if unique_id is None or device.unique_id == unique_id:
+                return device
+        return None
+
+    def __device(self, handle, connected=True):
+        device = self.__handles.get(_value(handle))
+        if device is None:
+            return None, ULError.BAD_DEV_HANDLE
+        if device._fault == ULError.DEAD_DEV:
+            return device, ULError.DEAD_DEV
+        if connected and not device._connected:
+            return device, ULError.NO_CONNECTION_ESTABLISHED
+        return device, ULError.NO_ERROR
+
+    @staticmethod
+    def __get_info(device, table, item, index, out):
+        value = device._info[table].get(item)
+        if value is None:
+            return ULError.BAD_INFO_ITEM
+        index = _value(index)
+        if callable(value):
+            value = value(index)
+        elif isinstance(value, list):
+            if not 0 <= index < len(value):
+                return ULError.BAD_ARG
+            value = value[index]
+        if value is None:
+            return ULError.BAD_ARG
+        _set(out, value)
+        return ULError.NO_ERROR
+
+    def __info(self, table, handle, item, index, out):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        return self.__get_info(device, table, item, index, out)
+
+    # Library and device management
+
+    def ulGetErrMsg(self, error_code, err_msg):
+        error_code = _value(error_code)
+        message = _error_messages.get(error_code)
+        if message is None:
+            try:
+                message = ULError(error_code).name.replace('_', ' ').capitalize()
+            except ValueError:
+                message = 'Unknown error'
+        err_msg.value = message.encode('utf-8')
+        return ULError.NO_ERROR
+
+    def ulGetDaqDeviceInventory(self, interface_type, descriptors,
+                                number_of_devices):
+        devices = [device for device in self.devices
+                   if device.dev_interface & _value(interface_type)]
+        size = _value(getattr(number_of_devices, '_obj', number_of_devices))
+        _set(number_of_devices, len(devices))
+        if len(devices) > size:
+            return ULError.BAD_BUFFER_SIZE
+        for i, device in enumerate(devices):
+            self.__fill_descriptor(device, descriptors[i])
+        return ULError.NO_ERROR
+
+    def ulGetNetDaqDeviceDescriptor(self, host, port, ifc_name, descriptor,
+                                    timeout):
+        return ULError.BAD_NET_HOST
+
+    @staticmethod
+    def __fill_descriptor(device, descriptor):
+        descriptor = getattr(descriptor, '_obj', descriptor)
+        descriptor._product_name = device.product_name.encode('utf8')
+        descriptor._product_id = device.product_id
+        descriptor._dev_interface = device.dev_interface
+        descriptor._dev_string = device.product_name.encode('utf8')
+        descriptor._unique_id = device.unique_id.encode('utf8')
+
+    def ulCreateDaqDevice(self, descriptor):
+        device = self.get_device(descriptor._unique_id.decode('utf8'))
+        if device is None:
+            return 0
+        if not device._handle:
+            device._handle = self.__next_handle
+            self.__next_handle += 1
+            self.__handles[device._handle] = device
+        return device._handle
+
+    def ulReleaseDaqDevice(self, handle):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        self.__stop_scans(device)
+        device._connected = False
+        device._events.clear()
+        del self.__handles[device._handle]
+        device._handle = 0
+        return ULError.NO_ERROR
+
+    def ulGetDaqDeviceDescriptor(self, handle, descriptor):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        self.__fill_descriptor(device, descriptor)
+        return ULError.NO_ERROR
+
+    def ulConnectDaqDevice(self, handle):
+        device = self.__handles.get(_value(handle))
+        if device is None:
+            return ULError.BAD_DEV_HANDLE
+        if device._fault == ULError.DEAD_DEV:
+            return ULError.DEV_NOT_FOUND
+        device._connected = True
+        return ULError.NO_ERROR
+
+    def ulDaqDeviceConnectionCode(self, handle, code):
+        return ULError.BAD_DEV_TYPE
+
+    def ulIsDaqDeviceConnected(self, handle, connected):
+        device = self.__handles.get(_value(handle))
+        if device is None:
+            return ULError.BAD_DEV_HANDLE
+        _set(connected, int(device._connected
+                            and device._fault != ULError.DEAD_DEV))
+        return ULError.NO_ERROR
+
+    def ulDisconnectDaqDevice(self, handle):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        self.__stop_scans(device)
+        device._connected = False
+        return ULError.NO_ERROR
+
+    def ulFlashLed(self, handle, flash_count):
+        return self.__device(handle)[1]
+
+    def ulDevGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('dev', handle, info_item, index, info_value)
+
+    def ulDevGetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        if config_item == DevConfigItem.HAS_EXP:
+            _set(config_value, 0)
+            return ULError.NO_ERROR
+        return ULError.CONFIG_NOT_SUPPORTED
+
+    def ulDevSetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        if config_item == DevConfigItem.MEM_UNLOCK_CODE:
+            device._dev_config[config_item] = _value(config_value)
+            return ULError.NO_ERROR
+        if config_item == DevConfigItem.RESET:
+            self.__stop_scans(device)
+            device._connected = False
+            return ULError.NO_ERROR
+        return ULError.BAD_DEV_TYPE
+
+    def ulDevGetConfigStr(self, handle, config_item, index, config_str,
+                          max_config_len):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        if config_item != UlInfoItem.VER_STR:
+            return ULError.BAD_DEV_TYPE
+        value = device.firmware_version.encode('utf-8')
+        config_str.value = value
+        _set(max_config_len, len(value) + 1)
+        return ULError.NO_ERROR
+
+    def ulEnableEvent(self, handle, event_types, event_parameter, callback,
+                      user_data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        event_types = _value(event_types)
+        event_parameter = _value(event_parameter)
+        supported = device._info['dev'][DevItemInfo.DAQ_EVENT_TYPES]
+        if not event_types or event_types & ~supported:
+            return ULError.BAD_EVENT_TYPE
+        if (event_types & DaqEventType.ON_DATA_AVAILABLE
+                and event_parameter < 1):
+            return ULError.BAD_EVENT_SIZE
+        events = [event for event in DaqEventType if event & event_types]
+        if any(event in device._events for event in events):
+            return ULError.EVENT_ALREADY_ENABLED
+        for event in events:
+            device._events[event] = (callback, user_data, event_parameter)
+        return ULError.NO_ERROR
+
+    def ulDisableEvent(self, handle, event_types):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        for event in DaqEventType:
+            if event & _value(event_types):
+                device._events.pop(event, None)
+        return ULError.NO_ERROR
+
+    def ulMemGetInfo(self, handle, mem_region, mem_descriptor):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        if mem_region != MemRegion.USER:
+            return ULError.BAD_MEM_REGION
+        descriptor = getattr(mem_descriptor, '_obj', mem_descriptor)
+        descriptor._region = MemRegion.USER
+        descriptor._address = 0
+        descriptor._size = len(device._memory)
+        descriptor._access_types = MemAccessType.READ | MemAccessType.WRITE
+        return ULError.NO_ERROR
+
+    def ulMemRead(self, handle, mem_region, address, buffer, count):
+        device, err = self.__memory(handle, mem_region, address, count)
+        if err:
+            return err
+        for i in range(count):
+            buffer[i] = device._memory[address + i] - 256 * (
+                device._memory[address + i] > 127)
+        return ULError.NO_ERROR
+
+    def ulMemWrite(self, handle, mem_region, address, buffer, count):
+        device, err = self.__memory(handle, mem_region, address, count)
+        if err:
+            return err
+        for i in range(count):
+            device._memory[address + i] = buffer[i] & 0xFF
+        return ULError.NO_ERROR
+
+    def __memory(self, handle, mem_region, address, count):
+        device, err = self.__device(handle)
+        if err:
+            return device, err
+        if mem_region != MemRegion.USER:
+            return device, ULError.BAD_MEM_REGION
+        if address < 0 or address + count > len(device._memory):
+            return device, ULError.BAD_MEM_ADDRESS
+        return device, ULError.NO_ERROR
+
+    # Scan helpers
+
+    def __start_scan(self, handle, name, is_input, data, c_type,
+                     number_of_channels, samples_per_channel, rate, options,
+                     max_rate, transfer):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        scan = device._scans.get(name)
+        if scan is not None and scan.running:
+            return ULError.ALREADY_ACTIVE
+        if data is None:
+            return ULError.BAD_BUFFER
+        samples_per_channel = _value(samples_per_channel)
+        if samples_per_channel < 1:
+            return ULError.BAD_SAMPLE_COUNT
+        requested_rate = _value(getattr(rate, '_obj', rate))
+        if (requested_rate <= 0 or requested_rate > max_rate
+                or requested_rate * number_of_channels > 2 * max_rate):
+            return ULError.BAD_RATE
+        actual_rate = _PACER_CLOCK / max(round(_PACER_CLOCK / requested_rate),
+                                         1)
+        _set(rate, actual_rate)
+
+        scan = _SimScan(device, is_input, data, c_type, number_of_channels,
+                        samples_per_channel, actual_rate, _value(options),
+                        transfer)
+        device._scans[name] = scan
+        scan.thread.start()
+        return ULError.NO_ERROR
+
+    def __scan_status(self, handle, name, status, transfer_status):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        scan = device._scans.get(name)
+        if scan is None:
+            _set(status, ScanStatus.IDLE)
+            return ULError.NO_ERROR
+        _set(status, scan.get_status(transfer_status))
+        return scan.error
+
+    def __scan_stop(self, handle, name):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        scan = device._scans.get(name)
+        if scan is not None:
+            scan.stop()
+        return ULError.NO_ERROR
+
+    def __scan_wait(self, handle, name, wait_type, timeout):
+        device, err = self.__device(handle, False)
+        if device is None:
+            return err
+        if wait_type != WaitType.WAIT_UNTIL_DONE:
+            return ULError.BAD_ARG
+        scan = device._scans.get(name)
+        if scan is None:
+            return ULError.NO_ERROR
+        timeout = _value(timeout)
+        if not scan.done.wait(None if timeout < 0 else timeout):
+            return ULError.TIMEDOUT
+        return ULError.NO_ERROR
+
+    def __stop_scans(self, device):
+        for scan in list(device._scans.values()):
+            scan.stop()
+
+    def __set_trigger(self, handle, trig_type):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        if not _value(trig_type) & _TRIGGER_TYPES:
+            return ULError.BAD_TRIG_TYPE
+        # The simulated trigger input is always asserted; scans with the
+        # EXTTRIGGER option start immediately.
+        return ULError.NO_ERROR
+
+    # Analog input
+
+    def ulAIGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('ai', handle, info_item, index, info_value)
+
+    def ulAIGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('ai', handle, info_item, index, info_value)
+
+    def ulAIGetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        key = (_value(config_item), _value(index))
+        if key not in device._ai_config:
+            return ULError.CONFIG_NOT_SUPPORTED
+        _set(config_value, device._ai_config[key])
+        return ULError.NO_ERROR
+
+    def ulAISetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        device._ai_config[(_value(config_item), _value(index))] = _value(
+            config_value)
+        return ULError.NO_ERROR
+
+    ulAIGetConfigDbl = ulAIGetConfig
+    ulAISetConfigDbl = ulAISetConfig
+
+    def ulAIGetConfigStr(self, handle, config_item, index, config_str,
+                         max_config_len):
+        return self.__device(handle, False)[1] or ULError.CONFIG_NOT_SUPPORTED
+
+    def __check_ai(self, device, channel, input_mode, analog_range):
+        num_chans = device._info['ai'][AiInfoItem.NUM_CHANS_BY_MODE](
+            _value(input_mode))
+        if not num_chans:
+            return ULError.BAD_INPUT_MODE
+        if not 0 <= channel < num_chans:
+            return ULError.BAD_AI_CHAN
+        if _value(analog_range) not in device.ai_ranges:
+            return ULError.BAD_RANGE
+        return ULError.NO_ERROR
+
+    def ulAIn(self, handle, channel, input_mode, analog_range, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        channel = _value(channel)
+        err = self.__check_ai(device, channel, input_mode, analog_range)
+        if err:
+            return err
+        analog_range = Range(_value(analog_range))
+        value = device._ai_values([channel], [analog_range],
+                                  [device._now()])[0, 0]
+        if _value(flags) & AInFlag.NOSCALEDATA:
+            value = self.__to_counts(value, analog_range,
+                                     device._info['ai'][AiInfoItem.RESOLUTION])
+        _set(data, float(value))
+        return ULError.NO_ERROR
+
+    @staticmethod
+    def __to_counts(values, analog_range, resolution):
+        low, high = range_limits(analog_range)
+        import numpy as np
+        full_scale = (1 << resolution) - 1
+        return np.round((values - low) / (high - low) * full_scale)
+
+    def ulAInLoadQueue(self, handle, queue, num_elements):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        elements = [queue[i] for i in range(_value(num_elements))]
+        for element in elements:
+            err = self.__check_ai(device, element._channel,
+                                  element._input_mode, element._range)
+            if err:
+                return err
+        device._ai_queue = [(element._channel, Range(element._range))
+                            for element in elements]
+        return ULError.NO_ERROR
+
+    def ulAInScan(self, handle, low_chan, high_chan, input_mode,
+                  analog_range, samples_per_chan, rate, options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        if device._ai_queue:
+            channels = [channel for channel, _ in device._ai_queue]
+            ranges = [queue_range for _, queue_range in device._ai_queue]
+        else:
+            low_chan, high_chan = _value(low_chan), _value(high_chan)
+            if high_chan < low_chan:
+                return ULError.BAD_AI_CHAN
+            for channel in (low_chan, high_chan):
+                err = self.__check_ai(device, channel, input_mode,
+                                      analog_range)
+                if err:
+                    return err
+            channels = list(range(low_chan, high_chan + 1))
+            ranges = [Range(_value(analog_range))] * len(channels)
+        no_scale = _value(flags) & AInScanFlag.NOSCALEDATA
+        resolution = device._info['ai'][AiInfoItem.RESOLUTION]
+
+        def transfer(block, t):
+            values = device._ai_values(channels, ranges, t)
+            if no_scale:
+                for column, column_range in enumerate(ranges):
+                    values[:, column] = self.__to_counts(
+                        values[:, column], column_range, resolution)
+            block[:] = values
+
+        return self.__start_scan(handle, 'ai', True, data, c_double,
+                                 len(channels), samples_per_chan, rate,
+                                 options, device.ai_max_rate, transfer)
+
+    def ulAInScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'ai', status, xfer_status)
+
+    def ulAInScanStop(self, handle):
+        return self.__scan_stop(handle, 'ai')
+
+    def ulAInScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'ai', wait_type, timeout)
+
+    def ulAInSetTrigger(self, handle, trig_type, trig_chan, level, variance,
+                        retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    def ulTIn(self, handle, channel, scale, flags, data):
+        return self.__device(handle)[1] or ULError.BAD_DEV_TYPE
+
+    def ulTInArray(self, handle, low_chan, high_chan, scale, flags, data):
+        return self.__device(handle)[1] or ULError.BAD_DEV_TYPE
+
+    # Analog output
+
+    def ulAOGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('ao', handle, info_item, index, info_value)
+
+    def ulAOGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('ao', handle, info_item, index, info_value)
+
+    def ulAOGetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        key = (_value(config_item), _value(index))
+        if key not in device._ao_config:
+            return ULError.CONFIG_NOT_SUPPORTED
+        _set(config_value, device._ao_config[key])
+        return ULError.NO_ERROR
+
+    def ulAOSetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        device._ao_config[(_value(config_item), _value(index))] = _value(
+            config_value)
+        return ULError.NO_ERROR
+
+    def __check_ao(self, device, channel, analog_range):
+        if not 0 <= channel < len(device._ao_values):
+            return ULError.BAD_AO_CHAN
+        if _value(analog_range) not in device.ao_ranges:
+            return ULError.BAD_RANGE
+        return ULError.NO_ERROR
+
+    def __ao_volts(self, device, value, analog_range, no_scale):
+        low, high = range_limits(Range(analog_range))
+        if no_scale:
+            full_scale = (1 << device._info['ao'][AoInfoItem.RESOLUTION]) - 1
+            value = low + value / full_scale * (high - low)
+        return float(min(max(value, low), high))
+
+    def ulAOut(self, handle, channel, analog_range, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        channel = _value(channel)
+        err = self.__check_ao(device, channel, analog_range)
+        if err:
+            return err
+        device._ao_values[channel] = self.__ao_volts(
+            device, _value(data), _value(analog_range),
+            _value(flags) & AOutFlag.NOSCALEDATA)
+        return ULError.NO_ERROR
+
+    def ulAOutArray(self, handle, low_chan, high_chan, ranges, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        low_chan, high_chan = _value(low_chan), _value(high_chan)
+        if high_chan < low_chan:
+            return ULError.BAD_AO_CHAN
+        for i, channel in enumerate(range(low_chan, high_chan + 1)):
+            err = self.__check_ao(device, channel, ranges[i])
+            if err:
+                return err
+        for i, channel in enumerate(range(low_chan, high_chan + 1)):
+            device._ao_values[channel] = self.__ao_volts(
+                device, data[i], ranges[i],
+                _value(flags) & AOutFlag.NOSCALEDATA)
+        return ULError.NO_ERROR
+
+    def ulAOutScan(self, handle, low_chan, high_chan, analog_range,
+                   samples_per_chan, rate, options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        low_chan, high_chan = _value(low_chan), _value(high_chan)
+        if high_chan < low_chan:
+            return ULError.BAD_AO_CHAN
+        for channel in (low_chan, high_chan):
+            err = self.__check_ao(device, channel, analog_range)
+            if err:
+                return err
+        channels = range(low_chan, high_chan + 1)
+        analog_range = _value(analog_range)
+        no_scale = _value(flags) & AOutFlag.NOSCALEDATA
+
+        def transfer(block, t):
+            last = block[-1]
+            for column, channel in enumerate(channels):
+                device._ao_values[channel] = self.__ao_volts(
+                    device, last[column], analog_range, no_scale)
+
+        return self.__start_scan(handle, 'ao', False, data, c_double,
+                                 len(channels), samples_per_chan, rate,
+                                 options, device.ao_max_rate, transfer)
+
+    def ulAOutScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'ao', status, xfer_status)
+
+    def ulAOutScanStop(self, handle):
+        return self.__scan_stop(handle, 'ao')
+
+    def ulAOutScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'ao', wait_type, timeout)
+
+    def ulAOutSetTrigger(self, handle, trig_type, trig_chan, level, variance,
+                         retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    # Digital I/O
+
+    def ulDIOGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('dio', handle, info_item, index, info_value)
+
+    def ulDIOGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('dio', handle, info_item, index, info_value)
+
+    def __port_index(self, device, port_type):
+        port_type = _value(port_type)
+        if port_type in device.dio_ports:
+            return device.dio_ports.index(port_type), ULError.NO_ERROR
+        return None, ULError.BAD_PORT_TYPE
+
+    def ulDIOGetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        config_item, index = _value(config_item), _value(index)
+        if config_item == DioConfigItem.PORT_DIRECTION_MASK:
+            # Indexed by port index rather than port type
+            if not 0 <= index < len(device.dio_ports):
+                return ULError.BAD_PORT_INDEX
+            _set(config_value, device._dio_direction[index])
+            return ULError.NO_ERROR
+        port_index, err = self.__port_index(device, index)
+        if err:
+            return err
+        if config_item == DioConfigItem.PORT_LOGIC:
+            _set(config_value, 0)
+            return ULError.NO_ERROR
+        key = (config_item, port_index)
+        if key not in device._dio_config:
+            return ULError.CONFIG_NOT_SUPPORTED
+        _set(config_value, device._dio_config[key])
+        return ULError.NO_ERROR
+
+    def ulDIOSetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, index)
+        if err:
+            return err
+        device._dio_config[(_value(config_item), port_index)] = _value(
+            config_value)
+        return ULError.NO_ERROR
+
+    def ulDConfigPort(self, handle, port_type, direction):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, port_type)
+        if err:
+            return err
+        device._dio_direction[port_index] = (
+            0xFF if _value(direction) == DigitalDirection.OUTPUT else 0)
+        return ULError.NO_ERROR
+
+    def ulDConfigBit(self, handle, port_type, bit_num, direction):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, port_type)
+        if err:
+            return err
+        bit_num = _value(bit_num)
+        if not 0 <= bit_num < 8:
+            return ULError.BAD_BIT_NUM
+        if _value(direction) == DigitalDirection.OUTPUT:
+            device._dio_direction[port_index] |= 1 << bit_num
+        else:
+            device._dio_direction[port_index] &= ~(1 << bit_num) & 0xFF
+        return ULError.NO_ERROR
+
+    def ulDIn(self, handle, port_type, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, port_type)
+        if err:
+            return err
+        _set(data, int(device._port_values(port_index,
+                                           [device._now()])[0]))
+        return ULError.NO_ERROR
+
+    def ulDOut(self, handle, port_type, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, port_type)
+        if err:
+            return err
+        data = _value(data)
+        if not 0 <= data <= 0xFF:
+            return ULError.BAD_PORT_VAL
+        if device._dio_direction[port_index] != 0xFF:
+            return ULError.WRONG_DIG_CONFIG
+        device._dio_latch[port_index] = data
+        return ULError.NO_ERROR
+
+    def ulDBitIn(self, handle, port_type, bit_num, bit_value):
+        data = c_ulonglong()
+        err = self.ulDIn(handle, port_type, data)
+        if err:
+            return err
+        bit_num = _value(bit_num)
+        if not 0 <= bit_num < 8:
+            return ULError.BAD_BIT_NUM
+        _set(bit_value, (data.value >> bit_num) & 1)
+        return ULError.NO_ERROR
+
+    def ulDBitOut(self, handle, port_type, bit_num, bit_value):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        port_index, err = self.__port_index(device, port_type)
+        if err:
+            return err
+        bit_num = _value(bit_num)
+        if not 0 <= bit_num < 8:
+            return ULError.BAD_BIT_NUM
+        if not device._dio_direction[port_index] & (1 << bit_num):
+            return ULError.WRONG_DIG_CONFIG
+        if _value(bit_value):
+            device._dio_latch[port_index] |= 1 << bit_num
+        else:
+            device._dio_latch[port_index] &= ~(1 << bit_num) & 0xFF
+        return ULError.NO_ERROR
+
+    def __port_range(self, device, low_port, high_port):
+        low_index, err = self.__port_index(device, low_port)
+        if err:
+            return None, err
+        high_index, err = self.__port_index(device, high_port)
+        if err:
+            return None, err
+        if high_index < low_index:
+            return None, ULError.BAD_PORT_TYPE
+        return range(low_index, high_index + 1), ULError.NO_ERROR
+
+    def ulDInArray(self, handle, low_port, high_port, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        ports, err = self.__port_range(device, low_port, high_port)
+        if err:
+            return err
+        t = [device._now()]
+        for i, port_index in enumerate(ports):
+            data[i] = int(device._port_values(port_index, t)[0])
+        return ULError.NO_ERROR
+
+    def ulDOutArray(self, handle, low_port, high_port, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        ports, err = self.__port_range(device, low_port, high_port)
+        if err:
+            return err
+        for i, port_index in enumerate(ports):
+            if device._dio_direction[port_index] != 0xFF:
+                return ULError.WRONG_DIG_CONFIG
+        for i, port_index in enumerate(ports):
+            device._dio_latch[port_index] = data[i] & 0xFF
+        return ULError.NO_ERROR
+
+    def ulDClearAlarm(self, handle, port_type, mask):
+        return self.__device(handle)[1] or ULError.BAD_DEV_TYPE
+
+    def ulDInScan(self, handle, low_port, high_port, samples_per_port, rate,
+                  options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        ports, err = self.__port_range(device, low_port, high_port)
+        if err:
+            return err
+
+        def transfer(block, t):
+            for column, port_index in enumerate(ports):
+                block[:, column] = device._port_values(port_index, t)
+
+        return self.__start_scan(handle, 'di', True, data, c_ulonglong,
+                                 len(ports), samples_per_port, rate, options,
+                                 device.dio_max_rate, transfer)
+
+    def ulDOutScan(self, handle, low_port, high_port, samples_per_port, rate,
+                   options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        ports, err = self.__port_range(device, low_port, high_port)
+        if err:
+            return err
+
+        def transfer(block, t):
+            for column, port_index in enumerate(ports):
+                device._dio_latch[port_index] = int(block[-1, column]) & 0xFF
+
+        return self.__start_scan(handle, 'do', False, data, c_ulonglong,
+                                 len(ports), samples_per_port, rate, options,
+                                 device.dio_max_rate, transfer)
+
+    def ulDInScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'di', status, xfer_status)
+
+    def ulDOutScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'do', status, xfer_status)
+
+    def ulDInScanStop(self, handle):
+        return self.__scan_stop(handle, 'di')
+
+    def ulDOutScanStop(self, handle):
+        return self.__scan_stop(handle, 'do')
+
+    def ulDInScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'di', wait_type, timeout)
+
+    def ulDOutScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'do', wait_type, timeout)
+
+    def ulDInSetTrigger(self, handle, trig_type, trig_chan, level, variance,
+                        retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    def ulDOutSetTrigger(self, handle, trig_type, trig_chan, level, variance,
+                         retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    # Counters
+
+    def ulCtrGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('ctr', handle, info_item, index, info_value)
+
+    def ulCtrGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('ctr', handle, info_item, index, info_value)
+
+    def ulCtrSetConfig(self, handle, config_item, index, config_value):
+        device, err = self.__device(handle, False)
+        if err:
+            return err
+        device._ctr_config[(_value(config_item), _value(index))] = _value(
+            config_value)
+        return ULError.NO_ERROR
+
+    def __counter(self, handle, counter_num):
+        device, err = self.__device(handle)
+        if err:
+            return device, None, err
+        counter_num = _value(counter_num)
+        if not 0 <= counter_num < len(device._ctr_rates):
+            return device, None, ULError.BAD_CTR
+        return device, counter_num, ULError.NO_ERROR
+
+    def ulCIn(self, handle, counter_num, data):
+        device, counter_num, err = self.__counter(handle, counter_num)
+        if err:
+            return err
+        _set(data, int(device._ctr_values(counter_num, device.ctr_resolution,
+                                          [device._now()])[0]))
+        return ULError.NO_ERROR
+
+    def ulCRead(self, handle, counter_num, register_type, data):
+        if _value(register_type) != CounterRegisterType.COUNT:
+            return self.__counter(handle, counter_num)[2] or \
+                ULError.BAD_CTR_REG
+        return self.ulCIn(handle, counter_num, data)
+
+    def ulCLoad(self, handle, counter_num, register_type, load_value):
+        device, counter_num, err = self.__counter(handle, counter_num)
+        if err:
+            return err
+        register_type = _value(register_type)
+        if register_type not in (CounterRegisterType.COUNT,
+                                 CounterRegisterType.LOAD):
+            return ULError.BAD_CTR_REG
+        with device._lock:
+            device._ctr_offsets[counter_num] = (
+                _value(load_value)
+                - device._ctr_rates[counter_num] * device._now())
+        return ULError.NO_ERROR
+
+    def ulCClear(self, handle, counter_num):
+        return self.ulCLoad(handle, counter_num, CounterRegisterType.COUNT, 0)
+
+    def ulCConfigScan(self, handle, counter_num, measurement_type,
+                      measurement_mode, edge_detection, tick_size,
+                      debounce_mode, debounce_time, flags):
+        device, counter_num, err = self.__counter(handle, counter_num)
+        if err:
+            return err
+        if _value(measurement_type) != CounterMeasurementType.COUNT:
+            return ULError.BAD_CTR_MEASURE_TYPE
+        return ULError.NO_ERROR
+
+    def ulCInScan(self, handle, low_ctr, high_ctr, samples_per_ctr, rate,
+                  options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        low_ctr, high_ctr = _value(low_ctr), _value(high_ctr)
+        if (high_ctr < low_ctr or low_ctr < 0
+                or high_ctr >= len(device._ctr_rates)):
+            return ULError.BAD_CTR
+        counters = range(low_ctr, high_ctr + 1)
+
+        def transfer(block, t):
+            for column, counter in enumerate(counters):
+                block[:, column] = device._ctr_values(
+                    counter, device.ctr_resolution, t)
+
+        return self.__start_scan(handle, 'ctr', True, data, c_ulonglong,
+                                 len(counters), samples_per_ctr, rate, options,
+                                 device.ctr_max_rate, transfer)
+
+    def ulCInScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'ctr', status, xfer_status)
+
+    def ulCInScanStop(self, handle):
+        return self.__scan_stop(handle, 'ctr')
+
+    def ulCInScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'ctr', wait_type, timeout)
+
+    def ulCInSetTrigger(self, handle, trig_type, trig_chan, level, variance,
+                        retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    # Timers
+
+    def ulTmrGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('tmr', handle, info_item, index, info_value)
+
+    def ulTmrGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('tmr', handle, info_item, index, info_value)
+
+    def __timer(self, handle, timer_num):
+        device, err = self.__device(handle)
+        if err:
+            return device, None, err
+        timer_num = _value(timer_num)
+        if not 0 <= timer_num < len(device._tmr_running):
+            return device, None, ULError.BAD_TMR
+        return device, timer_num, ULError.NO_ERROR
+
+    def ulTmrPulseOutStart(self, handle, timer_num, frequency, duty_cycle,
+                           pulse_count, initial_delay, idle_state, options):
+        device, timer_num, err = self.__timer(handle, timer_num)
+        if err:
+            return err
+        info = device._info['tmr']
+        requested = _value(getattr(frequency, '_obj', frequency))
+        if not (info[TmrInfoItemDbl.MIN_FREQ] <= requested
+                <= info[TmrInfoItemDbl.MAX_FREQ]):
+            return ULError.BAD_FREQUENCY
+        if not 0 < _value(getattr(duty_cycle, '_obj', duty_cycle)) < 1:
+            return ULError.BAD_DUTY_CYCLE
+        _set(frequency, _PACER_CLOCK / max(round(_PACER_CLOCK / requested),
+                                           1))
+        device._tmr_running[timer_num] = True
+        return ULError.NO_ERROR
+
+    def ulTmrPulseOutStop(self, handle, timer_num):
+        device, timer_num, err = self.__timer(handle, timer_num)
+        if err:
+            return err
+        device._tmr_running[timer_num] = False
+        return ULError.NO_ERROR
+
+    def ulTmrPulseOutStatus(self, handle, timer_num, status):
+        device, timer_num, err = self.__timer(handle, timer_num)
+        if err:
+            return err
+        _set(status, TmrStatus.RUNNING if device._tmr_running[timer_num]
+             else TmrStatus.IDLE)
+        return ULError.NO_ERROR
+
+    # DAQ input
+
+    def ulDaqIGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('daqi', handle, info_item, index, info_value)
+
+    def ulDaqIGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('daqi', handle, info_item, index, info_value)
+
+    def __daqi_reader(self, device, descriptor):
+        chan_type = descriptor._type
+        channel = descriptor._channel
+        if chan_type in (DaqInChanType.ANALOG_DIFF, DaqInChanType.ANALOG_SE):
+            input_mode = (AiInputMode.DIFFERENTIAL
+                          if chan_type == DaqInChanType.ANALOG_DIFF
+                          else AiInputMode.SINGLE_ENDED)
+            if self.__check_ai(device, channel, input_mode, descriptor._range):
+                return None
+            analog_range = Range(descriptor._range)
+            return lambda t: device._ai_values([channel], [analog_range],
+                                               t)[:, 0]
+        if chan_type == DaqInChanType.DIGITAL:
+            port_index = self.__port_index(device, channel)[0]
+            if port_index is None:
+                return None
+            return lambda t: device._port_values(port_index, t)
+        bits = {DaqInChanType.CTR16: 16, DaqInChanType.CTR32: 32,
+                DaqInChanType.CTR48: 48}.get(chan_type)
+        if bits is None or not 0 <= channel < len(device._ctr_rates):
+            return None
+        return lambda t: device._ctr_values(channel, bits, t)
+
+    def ulDaqInScan(self, handle, chan_descriptors, num_chans,
+                    samples_per_chan, rate, options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        num_chans = _value(num_chans)
+        if num_chans < 1:
+            return ULError.BAD_NUM_CHANS
+        readers = []
+        for i in range(num_chans):
+            reader = self.__daqi_reader(device, chan_descriptors[i])
+            if reader is None:
+                return ULError.BAD_DAQI_CHAN_TYPE
+            readers.append(reader)
+
+        def transfer(block, t):
+            for column, reader in enumerate(readers):
+                block[:, column] = reader(t)
+
+        return self.__start_scan(handle, 'daqi', True, data, c_double,
+                                 num_chans, samples_per_chan, rate, options,
+                                 device.ai_max_rate, transfer)
+
+    def ulDaqInScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'daqi', status, xfer_status)
+
+    def ulDaqInScanStop(self, handle):
+        return self.__scan_stop(handle, 'daqi')
+
+    def ulDaqInScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'daqi', wait_type, timeout)
+
+    def ulDaqInSetTrigger(self, handle, trig_type, trig_chan_descriptor,
+                          level, variance, retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
+
+    # DAQ output
+
+    def ulDaqOGetInfo(self, handle, info_item, index, info_value):
+        return self.__info('daqo', handle, info_item, index, info_value)
+
+    def ulDaqOGetInfoDbl(self, handle, info_item, index, info_value):
+        return self.__info('daqo', handle, info_item, index, info_value)
+
+    def ulDaqOutScan(self, handle, chan_descriptors, num_chans,
+                     samples_per_chan, rate, options, flags, data):
+        device, err = self.__device(handle)
+        if err:
+            return err
+        num_chans = _value(num_chans)
+        if num_chans < 1:
+            return ULError.BAD_NUM_CHANS
+        writers = []
+        for i in range(num_chans):
+            descriptor = chan_descriptors[i]
+            channel = descriptor._channel
+            if descriptor._type == DaqOutChanType.ANALOG:
+                if self.__check_ao(device, channel, descriptor._range):
+                    return ULError.BAD_DAQO_CHAN_TYPE
+                writers.append((channel, descriptor._range, None))
+            elif descriptor._type == DaqOutChanType.DIGITAL:
+                port_index = self.__port_index(device, channel)[0]
+                if port_index is None:
+                    return ULError.BAD_DAQO_CHAN_TYPE
+                writers.append((None, None, port_index))
+            else:
+                return ULError.BAD_DAQO_CHAN_TYPE
+
+        def transfer(block, t):
+            for column, (channel, analog_range, port_index) in enumerate(
+                    writers):
+                value = block[-1, column]
+                if port_index is None:
+                    device._ao_values[channel] = self.__ao_volts(
+                        device, value, analog_range, False)
+                else:
+                    device._dio_latch[port_index] = int(value) & 0xFF
+
+        return self.__start_scan(handle, 'daqo', False, data, c_double,
+                                 num_chans, samples_per_chan, rate, options,
+                                 device.ao_max_rate, transfer)
+
+    def ulDaqOutScanStatus(self, handle, status, xfer_status):
+        return self.__scan_status(handle, 'daqo', status, xfer_status)
+
+    def ulDaqOutScanStop(self, handle):
+        return self.__scan_stop(handle, 'daqo')
+
+    def ulDaqOutScanWait(self, handle, wait_type, wait_param, timeout):
+        return self.__scan_wait(handle, 'daqo', wait_type, timeout)
+
+    def ulDaqOutSetTrigger(self, handle, trig_type, trig_chan_descriptor,
+                           level, variance, retrigger_sample_count):
+        return self.__set_trigger(handle, trig_type)
@@ -3,6 +3,11 @@ Created on Feb 12 2018
 
 @author: MCC
 """
+try:
+    from time import monotonic
+except ImportError:
+    # Python 2; not monotonic, but only used for timeouts and ages
+    from time import time as monotonic
 
 
 def enum_mask_to_list(enum_type, mask):
@@ -11,3 +16,14 @@ def enum_mask_to_list(enum_type, mask):
         if opt & mask:
             enum_value_list.append(opt)
     return enum_value_list
+
+
+def range_limits(analog_range):
+    # Range names encode the span, e.g. BIP10VOLTS, UNIPT5VOLTS, BIP1PT25VOLTS
+    name = analog_range.name
+    if name == 'MA0TO20':
+        return 0.0, 20.0
+    full_scale = float(name[3:-5].replace('PT', '.'))
+    if name.startswith('BIP'):
+        return -full_scale, full_scale
+    return 0.0, full_scale
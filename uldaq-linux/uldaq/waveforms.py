@@ -0,0 +1,488 @@
+"""
+Created on Oct 17 2026
+
+@author: MCC
+
+Vectorized waveform synthesis for analog and DAQ output scans. The waveform
+functions return functions of an array of times in seconds, which also
+drive the inputs of the simulated backend; a :class:`WaveformGenerator` evaluates
+one waveform per channel and writes the interleaved samples into an output
+buffer. Requires NumPy.
+"""
+from ctypes import Array
+import numpy as np
+from .ul_enums import Range, ULError
+from .ul_exception import ULException
+from .buffer_management import ScanBuffer
+from .utils import range_limits
+
+# Feedback taps (n, m) of the maximal length sequences x^n + x^m + 1
+_PRBS_TAPS = {7: (7, 6), 9: (9, 5), 11: (11, 9), 15: (15, 14), 20: (20, 3),
+              23: (23, 18)}
+
+
+def sine(frequency, amplitude=1.0, offset=0.0, phase=0.0):
+    # type: (float, float, float, float) -> function
+    """
+    Returns a sine waveform.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    def waveform(t):
+        return offset + amplitude * np.sin(2 * np.pi * frequency * t + phase)
+    return waveform
+
+
+def square(frequency, amplitude=1.0, offset=0.0, phase=0.0, duty_cycle=0.5):
+    # type: (float, float, float, float, float) -> function
+    """
+    Returns a square waveform, high for the first part of each period.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+        duty_cycle (Optional[float]): The fraction of each period spent high;
+            the default is 0.5.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    def waveform(t):
+        high = _cycle_position(t, frequency, phase) < duty_cycle
+        return offset + np.where(high, amplitude, -amplitude)
+    return waveform
+
+
+def triangle(frequency, amplitude=1.0, offset=0.0, phase=0.0):
+    # type: (float, float, float, float) -> function
+    """
+    Returns a triangle waveform, rising through the offset at phase 0 like
+    :func:`sine`.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    def waveform(t):
+        position = _cycle_position(t, frequency, phase + np.pi / 2)
+        return offset + amplitude * (1 - 4 * np.abs(position - 0.5))
+    return waveform
+
+
+def sawtooth(frequency, amplitude=1.0, offset=0.0, phase=0.0):
+    # type: (float, float, float, float) -> function
+    """
+    Returns a sawtooth waveform, rising from offset - amplitude to offset +
+    amplitude once per period.
+
+    Args:
+        frequency (float): The frequency in Hz.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    def waveform(t):
+        position = _cycle_position(t, frequency, phase)
+        return offset + amplitude * (2 * position - 1)
+    return waveform
+
+
+def chirp(start_frequency, end_frequency, duration, amplitude=1.0,
+          offset=0.0, phase=0.0, logarithmic=False):
+    # type: (float, float, float, float, float, float, bool) -> function
+    """
+    Returns a sine waveform whose frequency sweeps from start_frequency to
+    end_frequency in duration seconds. The sweep repeats every duration
+    seconds.
+
+    Args:
+        start_frequency (float): The frequency in Hz at the start of each
+            sweep.
+        end_frequency (float): The frequency in Hz at the end of each sweep.
+        duration (float): The duration of a sweep in seconds.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        phase (Optional[float]): The phase in radians at the start of each
+            sweep; the default is 0.0.
+        logarithmic (Optional[bool]): If True the frequency changes by the
+            same factor in equal times, otherwise it changes linearly. The
+            default is False.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+
+    Raises:
+        :class:`ULException`: The frequencies or duration are invalid.
+    """
+    if duration <= 0 or start_frequency < 0 or end_frequency < 0:
+        raise ULException(ULError.BAD_ARG)
+    if logarithmic and (start_frequency <= 0 or end_frequency <= 0):
+        raise ULException(ULError.BAD_ARG)
+
+    def waveform(t):
+        elapsed = np.mod(t, duration)
+        if logarithmic and start_frequency != end_frequency:
+            ratio = end_frequency / float(start_frequency)
+            cycles = (start_frequency * duration / np.log(ratio)
+                      * (np.power(ratio, elapsed / duration) - 1))
+        else:
+            cycles = (start_frequency * elapsed
+                      + (end_frequency - start_frequency) * elapsed ** 2
+                      / (2.0 * duration))
+        return offset + amplitude * np.sin(2 * np.pi * cycles + phase)
+    return waveform
+
+
+def prbs(bit_rate, order=7, amplitude=1.0, offset=0.0, seed=1):
+    # type: (float, int, float, float, int) -> function
+    """
+    Returns a pseudo-random binary sequence: a maximal length sequence of
+    2**order - 1 bits, output at -amplitude and amplitude around the offset,
+    that repeats once the sequence is exhausted.
+
+    Args:
+        bit_rate (float): The number of bits per second.
+        order (Optional[int]): The order of the generator polynomial; one of
+            7, 9, 11, 15, 20 or 23. The default is 7.
+        amplitude (Optional[float]): The peak amplitude in volts; the default
+            is 1.0.
+        offset (Optional[float]): The DC offset in volts; the default is 0.0.
+        seed (Optional[int]): The non-zero initial state of the generator;
+            the default is 1.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+
+    Raises:
+        :class:`ULException`: The order or seed is invalid.
+    """
+    bits = prbs_sequence(order, seed)
+    levels = np.where(bits, amplitude, -amplitude) + offset
+
+    def waveform(t):
+        # The epsilon keeps sample times on bit boundaries in the new bit
+        index = np.floor(np.asarray(t) * bit_rate + 1e-9).astype(np.int64)
+        return levels[np.mod(index, len(levels))]
+    return waveform
+
+
+def prbs_sequence(order=7, seed=1):
+    # type: (int, int) -> ndarray
+    """
+    Returns one period of the maximal length sequence generated by the
+    polynomial of the specified order, as used by :func:`prbs`.
+
+    Args:
+        order (Optional[int]): The order of the generator polynomial; one of
+            7, 9, 11, 15, 20 or 23. The default is 7.
+        seed (Optional[int]): The non-zero initial state of the generator;
+            the default is 1.
+
+    Returns:
+        ndarray:
+
+        A bool array of 2**order - 1 bits.
+
+    Raises:
+        :class:`ULException`: The order or seed is invalid.
+    """
+    if order not in _PRBS_TAPS:
+        raise ULException(ULError.BAD_ARG)
+    n, m = _PRBS_TAPS[order]
+    if not 0 < seed < 1 << n:
+        raise ULException(ULError.BAD_ARG)
+
+    length = (1 << n) - 1
+    bits = np.empty(length + n, dtype=bool)
+    bits[:n] = [(seed >> i) & 1 for i in range(n)]
+    # bits[i] = bits[i - n] ^ bits[i - lag]; the recurrence of the reciprocal
+    # polynomial generates a maximal length sequence too, so the longer lag
+    # is used to compute the most bits at once
+    lag = max(m, n - m)
+    i = n
+    while i < length:
+        end = min(i + lag, length)
+        bits[i:end] = bits[i - n:end - n] ^ bits[i - lag:end - lag]
+        i = end
+    return bits[:length]
+
+
+def table(values, frequency, amplitude=1.0, offset=0.0, phase=0.0,
+          interpolate=True):
+    # type: (list[float], float, float, float, float, bool) -> function
+    """
+    Returns an arbitrary waveform that plays a table of values once per
+    period.
+
+    Args:
+        values (list[float]): The values of one period, evenly spaced in
+            time.
+        frequency (float): The number of periods per second.
+        amplitude (Optional[float]): The factor applied to the values; the
+            default is 1.0.
+        offset (Optional[float]): The DC offset in volts added to the scaled
+            values; the default is 0.0.
+        phase (Optional[float]): The phase in radians at time 0; the default
+            is 0.0.
+        interpolate (Optional[bool]): If True values between table entries
+            are interpolated linearly, wrapping from the last entry to the
+            first; otherwise each entry is held. The default is True.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+
+    Raises:
+        :class:`ULException`: The table is empty.
+    """
+    values = offset + amplitude * np.asarray(values, dtype=np.float64)
+    if values.ndim != 1 or not len(values):
+        raise ULException(ULError.BAD_ARG)
+    length = len(values)
+    wrapped = np.append(values, values[0])
+
+    def waveform(t):
+        position = _cycle_position(t, frequency, phase) * length
+        if interpolate:
+            return np.interp(position, np.arange(length + 1), wrapped)
+        return values[np.minimum(position.astype(np.int64), length - 1)]
+    return waveform
+
+
+def noise(amplitude=1.0, offset=0.0, seed=None):
+    # type: (float, float, int) -> function
+    """
+    Returns a Gaussian noise waveform. The values do not depend on the
+    times, so they are not repeated after :func:`WaveformGenerator.seek`.
+
+    Args:
+        amplitude (Optional[float]): The standard deviation in volts; the
+            default is 1.0.
+        offset (Optional[float]): The mean in volts; the default is 0.0.
+        seed (Optional[int]): The seed of the random generator.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    generator = np.random.RandomState(seed)
+
+    def waveform(t):
+        return offset + amplitude * generator.standard_normal(np.shape(t))
+    return waveform
+
+
+def constant(value):
+    # type: (float) -> function
+    """
+    Returns a waveform holding a constant value.
+
+    Args:
+        value (float): The value in volts.
+
+    Returns:
+        function:
+
+        A function of an array of times in seconds returning the voltages.
+    """
+    def waveform(t):
+        return np.full(np.shape(t), value, dtype=np.float64)
+    return waveform
+
+
+class WaveformGenerator:
+    """
+    Evaluates one waveform per channel at a fixed sample rate and writes the
+    samples, interleaved by channel, into output scan buffers.
+
+    The generator keeps the index of the next sample, so consecutive calls
+    to :func:`fill` or :func:`generate` continue each waveform without a
+    phase jump. This allows the halves of a CONTINUOUS output buffer to be
+    regenerated while the other half is being output.
+
+    Values are clipped to the limits of each channel's range.
+
+    Args:
+        waveforms (list[function]): The waveform of each channel in the
+            scan, in channel order; each is a function of an array of times in
+            seconds, such as the functions of this module.
+        rate (float): The sample rate in samples per channel per second,
+            normally the actual rate returned by the scan function.
+        analog_range (Optional[Range or list[Range]]): The output range of all
+            channels, or a list with the range of each channel. Values are
+            clipped to the limits of the range. By default values are not
+            clipped.
+        ao_info (Optional[AoInfo]): If specified, the ranges are checked
+            against :func:`AoInfo.get_ranges`.
+
+    Raises:
+        :class:`ULException`: A range is not supported.
+    """
+    def __init__(self, waveforms, rate, analog_range=None, ao_info=None):
+        self.__waveforms = list(waveforms)
+        number_of_channels = len(self.__waveforms)
+        if not number_of_channels:
+            raise ULException(ULError.BAD_NUM_CHANS)
+        if rate <= 0:
+            raise ULException(ULError.BAD_RATE)
+        self.__rate = float(rate)
+        self.__position = 0
+
+        self.__low = self.__high = None
+        if analog_range is not None:
+            if isinstance(analog_range, (list, tuple)):
+                ranges = list(analog_range)
+                if len(ranges) != number_of_channels:
+                    raise ULException(ULError.BAD_ARG)
+            else:
+                ranges = [analog_range] * number_of_channels
+            if ao_info is not None:
+                supported = ao_info.get_ranges()
+                if any(channel_range not in supported
+                       for channel_range in ranges):
+                    raise ULException(ULError.BAD_RANGE)
+            limits = [range_limits(Range(channel_range))
+                      for channel_range in ranges]
+            self.__low = np.array([low for low, _ in limits])
+            self.__high = np.array([high for _, high in limits])
+
+    @property
+    def number_of_channels(self):
+        """The number of channels in each scan."""
+        return len(self.__waveforms)
+
+    @property
+    def rate(self):
+        """The sample rate in samples per channel per second."""
+        return self.__rate
+
+    @property
+    def position(self):
+        """The index of the next sample to be generated for each channel."""
+        return self.__position
+
+    def seek(self, position):
+        # type: (int) -> None
+        """
+        Sets the index of the next sample to be generated for each channel;
+        seek(0) restarts the waveforms.
+
+        Args:
+            position (int): The sample index.
+        """
+        self.__position = position
+
+    def generate(self, samples_per_channel):
+        # type: (int) -> ndarray
+        """
+        Returns the next samples of every channel.
+
+        Args:
+            samples_per_channel (int): The number of samples per channel.
+
+        Returns:
+            ndarray:
+
+            A (samples_per_channel, number_of_channels) float64 array, whose
+            flattened form is the interleaved layout of a scan buffer.
+        """
+        out = np.empty((samples_per_channel, len(self.__waveforms)))
+        self.__evaluate(out)
+        return out
+
+    def fill(self, data, first_sample=0, samples_per_channel=None):
+        # type: (Array[float], int, int) -> int
+        """
+        Writes the next samples of every channel into a scan buffer.
+
+        Args:
+            data (Array[float] or ScanBuffer or ndarray): The output buffer,
+                created with :func:`create_float_buffer` or
+                :func:`create_float_ndarray_buffer`, holding interleaved
+                samples of number_of_channels channels.
+            first_sample (Optional[int]): The index in the buffer of the first
+                scan (one sample per channel) to write; the default is 0.
+            samples_per_channel (Optional[int]): The number of samples per
+                channel to write; by default the buffer is filled to its end.
+
+        Returns:
+            int:
+
+            The number of samples per channel written.
+
+        Raises:
+            :class:`ULException`: The buffer size is not a multiple of the
+            number of channels, or the samples do not fit in the buffer.
+        """
+        number_of_channels = len(self.__waveforms)
+        if isinstance(data, ScanBuffer):
+            array = data.array
+        elif isinstance(data, Array):
+            from numpy.ctypeslib import as_array
+            array = as_array(data)
+        else:
+            array = np.asarray(data)
+        if array.size % number_of_channels:
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        scans = array.reshape(-1, number_of_channels)
+        if samples_per_channel is None:
+            samples_per_channel = len(scans) - first_sample
+        if (first_sample < 0 or samples_per_channel < 0
+                or first_sample + samples_per_channel > len(scans)):
+            raise ULException(ULError.BAD_BUFFER_SIZE)
+        self.__evaluate(scans[first_sample:first_sample + samples_per_channel])
+        return samples_per_channel
+
+    def __evaluate(self, out):
+        count = len(out)
+        t = np.arange(self.__position, self.__position + count) / self.__rate
+        for channel, waveform in enumerate(self.__waveforms):
+            out[:, channel] = waveform(t)
+        if self.__low is not None:
+            np.clip(out, self.__low, self.__high, out=out)
+        self.__position += count
+
+
+def _cycle_position(t, frequency, phase):
+    # The position within the period, from 0 to 1
+    return np.mod(np.asarray(t) * frequency + phase / (2 * np.pi), 1.0)